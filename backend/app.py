@@ -2,15 +2,31 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from config import Config
 from extensions import db, migrate, bcrypt, jwt
+from utils.upload_stream import InMemoryUploadRequest
+from utils.db_engine import register_sqlite_pragmas
+from utils.json_provider import install_json_provider
+from utils.compression import init_compression
+from utils.instrumentation import init_instrumentation
+from utils.metrics import init_metrics
+from utils.schema import check_ready, init_db, register_schema_commands
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    # Keep multipart uploads in memory (bounded by MAX_CONTENT_LENGTH) instead of temp files
+    app.request_class = InMemoryUploadRequest
+    install_json_provider(app)
     
     # Initialize extensions with app
+    register_sqlite_pragmas()
     db.init_app(app)
     migrate.init_app(app, db)
+    # Registered first so its after_request hook runs last and times the whole request
+    init_instrumentation(app)
+    init_metrics(app)
+    register_schema_commands(app)
     CORS(app, origins=app.config['CORS_ORIGINS'])
+    init_compression(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
     
@@ -38,6 +54,7 @@ def create_app(config_class=Config):
     from routes.chat import chat_bp
     from routes.resume_ai import resume_ai_bp
     from routes.internship_recommendations import internship_recommendations_bp
+    from routes.jobs import jobs_bp
     from supabase_auth import supabase_auth_bp
 
     # Optional blueprint: resume_enhancer (skip if heavy deps missing)
@@ -61,6 +78,7 @@ def create_app(config_class=Config):
     app.register_blueprint(chat_bp, url_prefix='/api/chat')
     app.register_blueprint(internship_recommendations_bp, url_prefix='/api/internship-recommendations')
     app.register_blueprint(supabase_auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
     
     # API root endpoint
     @app.route('/api')
@@ -72,14 +90,28 @@ def create_app(config_class=Config):
     @app.route('/api/health')
     def health_check():
         from utils.supabase_client import supabase_client
+        from utils.user_cache import get_user_cache
         
         return jsonify({
             'status': 'OK',
             'message': 'Prime Minister Internship Portal API is running',
             'supabase_configured': supabase_client.is_configured(),
+            'supabase_latency': supabase_client.latency_stats(),
+            'user_cache': get_user_cache().stats(),
             'environment': app.config.get('ENV', 'production')
         })
     
+    # Liveness: the process serves requests; touches nothing else
+    @app.route('/health/live')
+    def liveness():
+        return jsonify({'status': 'alive'})
+    
+    # Readiness: the database answers and its schema is migrated (see `flask init-db`)
+    @app.route('/health/ready')
+    def readiness():
+        ready, checks = check_ready()
+        return jsonify({'status': 'ready' if ready else 'not ready', **checks}), 200 if ready else 503
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -90,14 +122,6 @@ def create_app(config_class=Config):
         db.session.rollback()
         return jsonify({'error': 'Internal server error'}), 500
     
-    # Initialize database tables
-    with app.app_context():
-        try:
-            db.create_all()
-            print("✅ Database tables created successfully")
-        except Exception as e:
-            print(f"❌ Database initialization error: {e}")
-    
     return app
 
 # Create app instance
@@ -107,4 +131,7 @@ if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 8000))
     debug = os.environ.get('FLASK_ENV') != 'production'
+    # Development convenience; deployments run `flask --app app init-db` once before starting workers
+    with app.app_context():
+        print(f"✅ Database schema {init_db()}")
     app.run(debug=debug, host='0.0.0.0', port=port, use_reloader=False)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Join table key layout benchmark
+
+Builds the user_skills / internship_skills join tables twice in SQLite:
+
+- before: a String(50) UUID primary key plus a unique (parent, child) index
+- after:  the (parent, child) pair as a clustered WITHOUT ROWID primary key
+
+and reports database size, insert time and join throughput for the two hot
+lookups (a user's skills, internships requiring a skill).
+
+Usage:
+    python bench_join_keys.py
+    python bench_join_keys.py --users 20000 --internships 5000 --skills 300 --lookups 5000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+
+PARENTS = """
+CREATE TABLE users (id VARCHAR(50) PRIMARY KEY, email VARCHAR(120));
+CREATE TABLE skills (id VARCHAR(50) PRIMARY KEY, name VARCHAR(100));
+CREATE TABLE internships (id VARCHAR(50) PRIMARY KEY, title VARCHAR(200));
+"""
+
+LAYOUTS = {
+    'before (UUID id + unique pair)': """
+CREATE TABLE user_skills (
+    id VARCHAR(50) PRIMARY KEY, user_id VARCHAR(50) NOT NULL REFERENCES users (id),
+    skill_id VARCHAR(50) NOT NULL REFERENCES skills (id), level VARCHAR(20), UNIQUE (user_id, skill_id));
+CREATE TABLE internship_skills (
+    id VARCHAR(50) PRIMARY KEY, internship_id VARCHAR(50) NOT NULL REFERENCES internships (id),
+    skill_id VARCHAR(50) NOT NULL REFERENCES skills (id), required BOOLEAN, UNIQUE (internship_id, skill_id));
+CREATE INDEX ix_internship_skills_skill_id ON internship_skills (skill_id);
+""",
+    'after (composite primary key)': """
+CREATE TABLE user_skills (
+    user_id VARCHAR(50) NOT NULL REFERENCES users (id), skill_id VARCHAR(50) NOT NULL REFERENCES skills (id),
+    level VARCHAR(20), PRIMARY KEY (user_id, skill_id)) WITHOUT ROWID;
+CREATE TABLE internship_skills (
+    internship_id VARCHAR(50) NOT NULL REFERENCES internships (id),
+    skill_id VARCHAR(50) NOT NULL REFERENCES skills (id), required BOOLEAN,
+    PRIMARY KEY (internship_id, skill_id)) WITHOUT ROWID;
+CREATE INDEX ix_internship_skills_skill_id ON internship_skills (skill_id);
+""",
+}
+
+USER_SKILLS = """
+SELECT s.name, us.level FROM user_skills us JOIN skills s ON s.id = us.skill_id WHERE us.user_id = ?
+"""
+
+INTERNSHIPS_BY_SKILL = """
+SELECT i.id, i.title FROM internship_skills isk JOIN internships i ON i.id = isk.internship_id
+WHERE isk.skill_id = ?
+"""
+
+
+def _dataset(args):
+    rng = random.Random(42)
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    skills = [str(uuid.uuid4()) for _ in range(args.skills)]
+    internships = [str(uuid.uuid4()) for _ in range(args.internships)]
+    user_skills = [(u, s) for u in users for s in rng.sample(skills, args.per_user)]
+    internship_skills = [(i, s) for i in internships for s in rng.sample(skills, args.per_internship)]
+    return users, skills, internships, user_skills, internship_skills
+
+
+def run(name, layout, data, args, directory):
+    users, skills, internships, user_skills, internship_skills = data
+    path = os.path.join(directory, f"{len(os.listdir(directory))}.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(PARENTS + layout)
+    conn.executemany('INSERT INTO users VALUES (?, ?)', [(u, f'{u[:8]}@example.com') for u in users])
+    conn.executemany('INSERT INTO skills VALUES (?, ?)', [(s, f'skill-{s[:8]}') for s in skills])
+    conn.executemany('INSERT INTO internships VALUES (?, ?)', [(i, f'Internship {i[:8]}') for i in internships])
+    conn.commit()
+
+    with_id = 'before' in name
+    started = time.perf_counter()
+    if with_id:
+        conn.executemany('INSERT INTO user_skills VALUES (?, ?, ?, ?)',
+                         [(str(uuid.uuid4()), u, s, 'beginner') for u, s in user_skills])
+        conn.executemany('INSERT INTO internship_skills VALUES (?, ?, ?, ?)',
+                         [(str(uuid.uuid4()), i, s, 1) for i, s in internship_skills])
+    else:
+        conn.executemany('INSERT INTO user_skills VALUES (?, ?, ?)', [(u, s, 'beginner') for u, s in user_skills])
+        conn.executemany('INSERT INTO internship_skills VALUES (?, ?, ?)', [(i, s, 1) for i, s in internship_skills])
+    conn.commit()
+    insert_seconds = time.perf_counter() - started
+    conn.execute('VACUUM')
+    conn.execute('ANALYZE')
+
+    rng = random.Random(7)
+    user_sample = [rng.choice(users) for _ in range(args.lookups)]
+    skill_sample = [rng.choice(skills) for _ in range(args.lookups)]
+
+    started = time.perf_counter()
+    for user_id in user_sample:
+        conn.execute(USER_SKILLS, (user_id,)).fetchall()
+    user_rate = args.lookups / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for skill_id in skill_sample:
+        conn.execute(INTERNSHIPS_BY_SKILL, (skill_id,)).fetchall()
+    skill_rate = args.lookups / (time.perf_counter() - started)
+    conn.close()
+
+    print(f"\n🧮 {name}")
+    print(f"   DB size:             {os.path.getsize(path) / 1024 / 1024:.2f} MB")
+    print(f"   Join-row inserts:    {insert_seconds:.2f}s")
+    print(f"   User skills:         {user_rate:,.0f} lookups/sec")
+    print(f"   Internships/skill:   {skill_rate:,.0f} lookups/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare join table key layouts')
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--internships', type=int, default=2000)
+    parser.add_argument('--skills', type=int, default=200)
+    parser.add_argument('--per-user', type=int, default=8, help='Skills per user')
+    parser.add_argument('--per-internship', type=int, default=6, help='Skills per internship')
+    parser.add_argument('--lookups', type=int, default=2000, help='Lookups per query type')
+    args = parser.parse_args()
+
+    data = _dataset(args)
+    print(f"🚀 {len(data[3]):,} user_skills rows, {len(data[4]):,} internship_skills rows")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, layout in LAYOUTS.items():
+            run(name, layout, data, args, directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+HTTP load test
+
+Hits one or more endpoints of a running server from a growing number of
+concurrent clients (one keep-alive connection each) and reports requests/sec,
+latency percentiles and errors at each concurrency level, e.g. to compare
+``python app.py`` with ``gunicorn -c gunicorn.conf.py wsgi:app`` or different
+worker/thread counts.
+
+Usage:
+    python bench_load.py
+    python bench_load.py --url http://localhost:8000 --path /health/live --path /api/internships/?view=compact
+    python bench_load.py --concurrency 1,8,32,128 --duration 15 --token <jwt>
+"""
+
+import argparse
+import http.client
+import itertools
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def _client(url, paths, headers, deadline, results, lock):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.netloc, timeout=30)
+    latencies, errors = [], 0
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            break
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = connection_class(parts.netloc, timeout=30)
+    connection.close()
+    with lock:
+        results['latencies'].extend(latencies)
+        results['errors'] += errors
+
+
+def run_level(url, paths, headers, concurrency, duration):
+    results = {'latencies': [], 'errors': 0}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(_client, url, paths, headers, deadline, results, lock)
+    elapsed = time.perf_counter() - started
+    latencies = results['latencies']
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': results['errors'],
+        'rps': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p95_ms': _percentile(latencies, 0.95) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--path', action='append', help='Endpoint to request (repeatable); default /health/live')
+    parser.add_argument('--concurrency', default='1,4,16,64', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+    parser.add_argument('--token', help='JWT sent as a Bearer token')
+    args = parser.parse_args()
+
+    paths = args.path or ['/health/live']
+    headers = {'Accept-Encoding': 'gzip'}
+    if args.token:
+        headers['Authorization'] = f'Bearer {args.token}'
+
+    print(f"Load test: {args.url} {', '.join(paths)} ({args.duration:.0f}s per level)")
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for concurrency in (int(level) for level in args.concurrency.split(',')):
+        level = run_level(args.url, paths, headers, concurrency, args.duration)
+        print(f"{level['concurrency']:>8} {level['requests']:>9} {level['errors']:>7} {level['rps']:>9.1f} "
+              f"{level['p50_ms']:>8.1f} {level['p95_ms']:>8.1f} {level['p99_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark
+
+Simulates a burst of concurrent logins (one bcrypt verify each) and reports
+logins/sec and latency percentiles, first with bcrypt run inline on every
+request thread and then through the bounded PasswordHasher pool. While each
+burst runs, a probe thread times a small unrelated task to show how much the
+burst slows down the rest of the server.
+
+Usage:
+    python bench_login.py
+    python bench_login.py --logins 400 --concurrency 64 --rounds 12 --workers 2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import bcrypt
+
+from utils.password_hasher import HasherBusy, PasswordHasher
+
+PASSWORD = 'correct horse battery staple'
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def _probe(stop, samples):
+    """Time a small JSON round trip, standing in for an unrelated request"""
+    payload = {'internships': [{'id': i, 'title': f'Intern {i}'} for i in range(200)]}
+    while not stop.is_set():
+        started = time.perf_counter()
+        json.loads(json.dumps(payload))
+        samples.append(time.perf_counter() - started)
+        time.sleep(0.005)
+
+
+def run_burst(name, login, logins, concurrency):
+    latencies, probe_samples = [], []
+    busy = 0
+    stop = threading.Event()
+    probe = threading.Thread(target=_probe, args=(stop, probe_samples), daemon=True)
+    probe.start()
+
+    def one_login(_):
+        started = time.perf_counter()
+        try:
+            assert login()
+        except HasherBusy:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for latency in executor.map(one_login, range(logins)):
+            if latency is None:
+                busy += 1
+            else:
+                latencies.append(latency)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe.join()
+
+    print(f"\n🔐 {name}")
+    print(f"   Logins/sec:   {len(latencies) / elapsed:.1f} ({len(latencies)} ok, {busy} rejected busy)")
+    if latencies:
+        print(f"   Latency:      p50 {statistics.median(latencies) * 1000:.0f} ms, "
+              f"p95 {_percentile(latencies, 0.95) * 1000:.0f} ms")
+    if probe_samples:
+        print(f"   Other work:   p50 {statistics.median(probe_samples) * 1000:.2f} ms, "
+              f"p95 {_percentile(probe_samples, 0.95) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bcrypt login throughput')
+    parser.add_argument('--logins', type=int, default=200, help='Logins in the burst')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent request threads')
+    parser.add_argument('--rounds', type=int, default=int(os.environ.get('BCRYPT_LOG_ROUNDS', 12)),
+                        help='bcrypt work factor')
+    parser.add_argument('--workers', type=int, default=None, help='Hashing threads (default: CPU count / 2)')
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(rounds=args.rounds, workers=args.workers, max_pending=args.logins)
+    hashed = hasher.hash(PASSWORD)
+    encoded = hashed.encode('utf-8')
+    print(f"🚀 {args.logins} logins, {args.concurrency} concurrent, bcrypt cost {args.rounds}, "
+          f"{hasher.workers} hashing threads, {os.cpu_count()} CPUs")
+
+    run_burst('Inline bcrypt on request threads',
+              lambda: bcrypt.checkpw(PASSWORD.encode('utf-8'), encoded), args.logins, args.concurrency)
+    run_burst('PasswordHasher pool',
+              lambda: hasher.verify(PASSWORD, hashed), args.logins, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
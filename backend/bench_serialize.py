@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Internship list serialization benchmark
+
+Builds a page of internships (with companies, skills and interests shared
+between them, as in a real listing) as transient ORM objects and times
+turning it into a JSON response body two ways:
+
+- before: the hand-written per-object to_dict chain plus stdlib json, as the
+  list endpoints used to do
+- after:  compiled serializer specs with per-request memoization plus the
+  orjson provider
+
+Usage:
+    python bench_serialize.py
+    python bench_serialize.py --internships 1000 --companies 50 --skills 100 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+
+from extensions import db
+from models import Company, Interest, Internship, InternshipInterest, InternshipSkill, Skill
+from utils.json_provider import OrjsonProvider
+from utils.serializers import SerializationContext
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _legacy_skill(skill):
+    return {'id': skill.id, 'name': skill.name, 'description': skill.description,
+            'created_at': _iso(skill.created_at)}
+
+
+def _legacy_company(company):
+    return {'id': company.id, 'name': company.name, 'description': company.description,
+            'website': company.website, 'logo': company.logo, 'location': company.location,
+            'size': company.size, 'industry': company.industry,
+            'created_at': _iso(company.created_at), 'updated_at': _iso(company.updated_at)}
+
+
+def _legacy_internship(internship):
+    data = {
+        'id': internship.id, 'title': internship.title, 'description': internship.description,
+        'company_id': internship.company_id, 'location': internship.location,
+        'duration': internship.duration, 'salary': internship.salary,
+        'requirements': internship.requirements, 'team_size': internship.team_size,
+        'rating': internship.rating, 'applicants': internship.applicants,
+        'posted_date': _iso(internship.posted_date), 'deadline': _iso(internship.deadline),
+        'remote': internship.remote, 'active': internship.active,
+        'created_at': _iso(internship.created_at), 'updated_at': _iso(internship.updated_at)
+    }
+    data['company'] = _legacy_company(internship.company)
+    data['skills'] = [{'internship_id': link.internship_id, 'skill_id': link.skill_id,
+                       'required': link.required, 'skill': _legacy_skill(link.skill)}
+                      for link in internship.skills]
+    data['interests'] = [{'internship_id': link.internship_id, 'interest_id': link.interest_id,
+                          'interest': _legacy_skill(link.interest)}
+                         for link in internship.interests]
+    return data
+
+
+def _dataset(args):
+    rng = random.Random(42)
+    now = datetime(2024, 6, 1)
+    companies = [Company(id=str(uuid.uuid4()), name=f'Company {i}', description='Builds things ' * 10,
+                         website=f'https://company{i}.example.com', logo=None, location='Bengaluru',
+                         size='medium', industry='Technology', created_at=now, updated_at=now)
+                 for i in range(args.companies)]
+    skills = [Skill(id=str(uuid.uuid4()), name=f'Skill {i}', description='A skill', created_at=now)
+              for i in range(args.skills)]
+    interests = [Interest(id=str(uuid.uuid4()), name=f'Interest {i}', description='An interest', created_at=now)
+                 for i in range(args.skills // 4 or 1)]
+    internships = []
+    for i in range(args.internships):
+        internship = Internship(
+            id=str(uuid.uuid4()), title=f'Software Intern {i}', description='Work on the platform ' * 20,
+            company=rng.choice(companies), location='Remote', duration='12 weeks', salary='₹20,000/month',
+            requirements=['Python', 'SQL', 'Git'], team_size='5-10', rating=4.2, applicants=i,
+            posted_date=now - timedelta(days=i % 30), deadline=now + timedelta(days=30),
+            remote=True, active=True, created_at=now, updated_at=now
+        )
+        internship.company_id = internship.company.id
+        for skill in rng.sample(skills, 6):
+            internship.skills.append(InternshipSkill(internship_id=internship.id, skill_id=skill.id,
+                                                     required=True, skill=skill))
+        for interest in rng.sample(interests, min(2, len(interests))):
+            internship.interests.append(InternshipInterest(internship_id=internship.id,
+                                                           interest_id=interest.id, interest=interest))
+        internships.append(internship)
+    return internships
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark internship list serialization')
+    parser.add_argument('--internships', type=int, default=1000)
+    parser.add_argument('--companies', type=int, default=50)
+    parser.add_argument('--skills', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per variant (median reported)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    provider = OrjsonProvider(app)
+
+    with app.app_context():
+        internships = _dataset(args)
+
+        def before():
+            payload = {'internships': [_legacy_internship(i) for i in internships]}
+            return json.dumps(payload, sort_keys=True, separators=(',', ':'))
+
+        def after():
+            context = SerializationContext()
+            payload = {'internships': [context.internship(i) for i in internships]}
+            return provider.dumps(payload, separators=(',', ':'))
+
+        assert json.loads(before()) == json.loads(after()), 'serializers disagree'
+
+        print(f"🚀 {args.internships} internships, {args.companies} companies, {args.skills} skills")
+        results = []
+        for name, fn in (('to_dict chain + json', before), ('compiled specs + memo + orjson', after)):
+            seconds, body = _time(fn, args.repeat)
+            results.append(seconds)
+            print(f"\n🧾 {name}")
+            print(f"   Serialize:   {seconds * 1000:.1f} ms per page")
+            print(f"   Body size:   {len(body.encode('utf-8')) / 1024:.0f} KB")
+        print(f"\n⚡ Speedup: {results[0] / results[1]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+App startup (cold import) benchmark
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter, which
+builds the app with every blueprint registered, and reports the total import
+time plus the slowest modules. The ML stacks (pandas, sklearn, NLTK, spaCy,
+sentence-transformers) are loaded on first use, so none of them should show
+up here; ``test_startup.py`` enforces that and a time budget.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --repeat 5 --top 25
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Top-level packages that must only be imported when a request needs them
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'nltk', 'spacy', 'fitz', 'sentence_transformers', 'torch',
+                 'google.generativeai')
+
+
+def measure_import(module: str = 'app') -> Tuple[float, Dict[str, float]]:
+    """Import ``module`` in a fresh interpreter: (total seconds, cumulative seconds per module)"""
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'startup.db')}",
+                   PYTHONDONTWRITEBYTECODE='1')
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative) / 1e6
+    return modules[module], modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    totals = [total for total, _ in runs]
+    _, modules = runs[-1]
+
+    print(f"import {args.module}: median {statistics.median(totals) * 1000:.0f} ms "
+          f"(min {min(totals) * 1000:.0f} ms, {args.repeat} runs, {len(modules)} modules)")
+    print(f"\nSlowest modules (cumulative):")
+    for name, seconds in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    heavy = sorted(name for name in modules if name.split('.')[0] in HEAVY_MODULES or name in HEAVY_MODULES)
+    print(f"\nHeavy modules imported at startup: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == '__main__':
+    main()
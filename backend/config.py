@@ -1,14 +1,15 @@
 import os
 from dotenv import load_dotenv
+from utils.db_engine import database_uri, engine_options
 
 load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here'
     
-    # Database Configuration for Replit
-    # Force SQLite for immediate functionality (PostgreSQL has connection issues)
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///app.db'
+    # Database Configuration: DATABASE_URL (Postgres in production), local SQLite otherwise
+    SQLALCHEMY_DATABASE_URI = database_uri()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     
     # Supabase Configuration (optional)
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
@@ -18,12 +19,47 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 604800))  # 7 days
+    
+    # Password hashing: bcrypt work factor, hashing threads and queued-hash limit
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ['PASSWORD_HASH_WORKERS']) if os.environ.get('PASSWORD_HASH_WORKERS') else None
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',') if os.environ.get('CORS_ORIGINS') else ['*']
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
     
+    # Response compression (brotli when installed, else gzip); smaller bodies are sent as-is
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    
+    # Per-request timing, SQL counts and N+1 warnings (Server-Timing header + JSON log lines)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    REQUEST_LOG_ENABLED = os.environ.get('REQUEST_LOG_ENABLED', 'true').lower() == 'true'
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+    # Fraction of requests to profile (0 disables), optionally only these endpoints, e.g. "internships.get_internships"
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_ENDPOINTS = os.environ.get('PROFILE_ENDPOINTS', '')
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    PROFILER = os.environ.get('PROFILER', 'cprofile')  # cprofile or pyinstrument
+    
+    # Prometheus metrics at /metrics; with several workers set METRICS_DIR (env) to a shared directory
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # when set, scrapes need "Authorization: Bearer <token>"
+    
     # Supabase Storage Configuration
     SUPABASE_STORAGE_BUCKET = os.environ.get('SUPABASE_STORAGE_BUCKET', 'internship-files')
+    # Public buckets get URLs derived locally; private buckets get batch-signed URLs
+    SUPABASE_STORAGE_PUBLIC = os.environ.get('SUPABASE_STORAGE_PUBLIC', 'true').lower() == 'true'
+    SUPABASE_SIGNED_URL_EXPIRES = int(os.environ.get('SUPABASE_SIGNED_URL_EXPIRES', 3600))
+    STORAGE_LIST_CACHE_TTL = int(os.environ.get('STORAGE_LIST_CACHE_TTL', 60))
+    
+    # Per-process cache of Supabase user rows (seconds); unknown emails are remembered briefly
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_NEGATIVE_TTL = int(os.environ.get('USER_CACHE_NEGATIVE_TTL', 3))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 4096))
     
     # Use Supabase Auth (optional - can use custom JWT instead)
     USE_SUPABASE_AUTH = os.environ.get('USE_SUPABASE_AUTH', 'false').lower() == 'true'
@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from utils.db_engine import engine_options
 
 load_dotenv()
 
@@ -9,6 +10,7 @@ class LocalConfig:
     
     # Use SQLite for local development (easier setup)
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///pm_internship.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # JWT Configuration
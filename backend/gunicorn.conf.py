@@ -0,0 +1,76 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment (Render and similar
+hosts set ``PORT`` and ``WEB_CONCURRENCY``):
+
+- ``WEB_CONCURRENCY``: worker processes, default ``2 * CPUs + 1`` capped at
+  ``GUNICORN_MAX_WORKERS`` (8), since each worker holds its own DB pool and,
+  with preloading off, its own copy of the models
+- ``GUNICORN_THREADS``: threads per worker (gthread), default 4. Most request
+  time is spent waiting on Postgres, Supabase or Gemini, so threads keep a
+  worker busy while one request waits
+- ``GUNICORN_TIMEOUT``: seconds a worker may be silent before it is killed
+  (default 120, long enough for an AI resume analysis), and
+  ``GUNICORN_GRACEFUL_TIMEOUT`` to finish in-flight requests on restart
+- ``GUNICORN_MAX_REQUESTS`` (+ jitter): recycle workers after that many
+  requests, bounding slow leaks without restarting all workers at once
+- ``GUNICORN_PRELOAD``: import the app once in the master and fork workers
+  from it (default on). With ``PRELOAD_MODELS=true`` the embedding model and
+  resume parser are also loaded before forking, so workers share them
+  copy-on-write instead of each loading them on first use
+
+The schema is not touched here: run ``flask --app app init-db`` first.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+
+def _int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def default_workers(cpus=None):
+    cpus = cpus or multiprocessing.cpu_count()
+    return min(2 * cpus + 1, _int('GUNICORN_MAX_WORKERS', 8))
+
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+workers = _int('WEB_CONCURRENCY', default_workers())
+worker_class = 'gthread'
+threads = _int('GUNICORN_THREADS', 4)
+timeout = _int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = _int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _int('GUNICORN_KEEPALIVE', 5)
+max_requests = _int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+# Heartbeat files on tmpfs, so a slow disk cannot make healthy workers look hung
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# Workers publish metrics snapshots here, so /metrics sums all of them
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f'pmip-metrics-{os.getpid()}'))
+# Tokenizer thread pools do not survive fork
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before workers fork
+    if preload_app and os.environ.get('PRELOAD_MODELS', 'false').lower() == 'true':
+        import wsgi
+        wsgi.preload_models()
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared between processes
+    if preload_app:
+        import wsgi
+        wsgi.reset_connections()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Bulk resume ingestion CLI
+
+Parses every PDF/DOCX in a zip archive or directory across a process pool
+and prints one JSON line per file as it finishes, followed by a summary with
+files/sec and per-stage timings.
+
+Usage:
+    python ingest_resumes.py resumes.zip
+    python ingest_resumes.py ./resumes --workers 4 --output results.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.bulk_ingest import IngestStats, create_pool, default_workers, ingest, iter_sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse a batch of resumes in parallel')
+    parser.add_argument('path', help='Zip archive, directory or single PDF/DOCX')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Number of parser processes (default: CPU count - 1)')
+    parser.add_argument('--output', help='Write per-file results as NDJSON to this file')
+    parser.add_argument('--quiet', action='store_true', help='Only print the summary')
+    args = parser.parse_args()
+
+    try:
+        sources = iter_sources(args.path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    output = open(args.output, 'w') if args.output else None
+    stats = IngestStats()
+
+    print(f"🚀 Ingesting resumes from {args.path} with {args.workers} workers")
+    try:
+        with create_pool(args.workers) as pool:
+            for result in ingest(sources, pool, stats):
+                if output:
+                    output.write(json.dumps(result) + '\n')
+                if not args.quiet:
+                    status = '✅' if result['success'] else '❌'
+                    detail = f"{len(result['data']['skills'])} skills" if result['success'] else result['error']
+                    print(f"{status} {result['file']} ({result['timings']['total']:.2f}s) - {detail}")
+    finally:
+        if output:
+            output.close()
+
+    summary = stats.to_dict()
+    print("\n📊 Summary")
+    print(f"   Files:        {summary['files']} ({summary['succeeded']} ok, {summary['failed']} failed)")
+    print(f"   Elapsed:      {summary['elapsed_seconds']}s")
+    print(f"   Throughput:   {summary['files_per_second']} files/sec")
+    for stage, seconds in summary['stage_avg_seconds'].items():
+        print(f"   {stage:<13} {seconds * 1000:.1f} ms/file")
+
+
+if __name__ == '__main__':
+    main()
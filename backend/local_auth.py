@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from extensions import db, bcrypt
+from extensions import db
 from models import User
+from utils.password_hasher import HasherBusy
 import uuid
 import re
 from datetime import timedelta
@@ -68,6 +69,9 @@ def signup():
             'user': user.to_dict()
         }), 201
         
+    except HasherBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         print(f"Signup error: {str(e)}")
@@ -90,9 +94,12 @@ def login():
         if not user:
             return jsonify({'error': 'Invalid email or password'}), 401
         
-        # Check password
+        # Check password (an outdated hash is upgraded in place)
+        previous_hash = user.password_hash
         if not user.check_password(password):
             return jsonify({'error': 'Invalid email or password'}), 401
+        if user.password_hash != previous_hash:
+            db.session.commit()
         
         # Create access token
         access_token = create_access_token(
@@ -106,6 +113,9 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except HasherBusy:
+        return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
+        db.session.rollback()
         print(f"Login error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""Add indexes for hot foreign keys and filter columns
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns). user_skills(user_id) and user_interests(user_id)
+# are already served by their (user_id, ...) unique constraints.
+INDEXES = [
+    ('ix_internships_active_posted_date', 'internships', ['active', 'posted_date']),
+    ('ix_internships_location', 'internships', ['location']),
+    ('ix_internships_company_id', 'internships', ['company_id']),
+    ('ix_internship_skills_skill_id', 'internship_skills', ['skill_id']),
+    ('ix_internship_interests_interest_id', 'internship_interests', ['interest_id']),
+    ('ix_applications_user_id_applied_at', 'applications', ['user_id', 'applied_at']),
+    ('ix_applications_user_id_status', 'applications', ['user_id', 'status']),
+    ('ix_applications_internship_id', 'applications', ['internship_id']),
+    ('ix_saved_internships_user_id_saved_at', 'saved_internships', ['user_id', 'saved_at']),
+    ('ix_saved_internships_internship_id', 'saved_internships', ['internship_id']),
+]
+
+
+def upgrade():
+    # Databases created with db.create_all() after the models gained these
+    # indexes already have them
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
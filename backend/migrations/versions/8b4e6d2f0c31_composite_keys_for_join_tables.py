@@ -0,0 +1,87 @@
+"""Key join tables by their (parent, child) pair instead of a UUID column
+
+Revision ID: 8b4e6d2f0c31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d2f0c31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+# table -> (left key, left parent, right key, right parent, [(extra column, type)], secondary index)
+JOIN_TABLES = {
+    'user_skills': ('user_id', 'users', 'skill_id', 'skills',
+                    [('level', sa.String(length=20))], None),
+    'user_interests': ('user_id', 'users', 'interest_id', 'interests', [], None),
+    'internship_skills': ('internship_id', 'internships', 'skill_id', 'skills',
+                          [('required', sa.Boolean())], 'ix_internship_skills_skill_id'),
+    'internship_interests': ('internship_id', 'internships', 'interest_id', 'interests', [],
+                             'ix_internship_interests_interest_id'),
+}
+
+
+def _rebuild(table, composite_key):
+    """Copy ``table`` into a new layout and swap it in (SQLite cannot alter a primary key)"""
+    left, left_parent, right, right_parent, extra, index = JOIN_TABLES[table]
+    new_table = f'{table}_rebuild'
+    key_columns = [
+        sa.Column(left, sa.String(length=50), sa.ForeignKey(f'{left_parent}.id'), nullable=False),
+        sa.Column(right, sa.String(length=50), sa.ForeignKey(f'{right_parent}.id'), nullable=False),
+    ]
+    extra_columns = [sa.Column(name, type_, nullable=True) for name, type_ in extra]
+    columns = [left, right] + [name for name, _type in extra]
+    # Constraint names are schema-wide in PostgreSQL and the old table may still hold the
+    # final ones (e.g. pk_user_skills on downgrade), so build under temporary names
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    pk_name = f'pk_{table}'
+    uq_name = f'uq_{table}_{left}_{right}'
+    suffix = '_rebuild' if postgres else ''
+
+    if index:
+        op.drop_index(index, table_name=table, if_exists=True)
+
+    if composite_key:
+        op.create_table(
+            new_table, *key_columns, *extra_columns,
+            sa.PrimaryKeyConstraint(left, right, name=pk_name + suffix),
+            sqlite_with_rowid=False
+        )
+        # The old unique constraint guaranteed one row per pair already
+        op.execute(f'INSERT INTO {new_table} ({", ".join(columns)}) '
+                   f'SELECT {", ".join(columns)} FROM {table}')
+    else:
+        op.create_table(
+            new_table, sa.Column('id', sa.String(length=50), nullable=False),
+            *key_columns, *extra_columns,
+            sa.PrimaryKeyConstraint('id', name=pk_name + suffix),
+            sa.UniqueConstraint(left, right, name=uq_name + suffix)
+        )
+        new_id = 'gen_random_uuid()::text' if postgres else 'lower(hex(randomblob(16)))'
+        op.execute(f'INSERT INTO {new_table} (id, {", ".join(columns)}) '
+                   f'SELECT {new_id}, {", ".join(columns)} FROM {table}')
+
+    op.drop_table(table)
+    op.rename_table(new_table, table)
+    if postgres:
+        op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {pk_name + suffix} TO {pk_name}')
+        if not composite_key:
+            op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {uq_name + suffix} TO {uq_name}')
+    if index:
+        op.create_index(index, table, [right], unique=False)
+
+
+def upgrade():
+    for table in JOIN_TABLES:
+        _rebuild(table, composite_key=True)
+
+
+def downgrade():
+    for table in JOIN_TABLES:
+        _rebuild(table, composite_key=False)
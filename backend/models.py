@@ -1,5 +1,10 @@
 from datetime import datetime
-from extensions import db, bcrypt
+from extensions import db
+from utils.password_hasher import get_password_hasher
+from utils.serializers import (
+    APPLICATION, COMPANY, INTEREST, INTERNSHIP, INTERNSHIP_INTEREST, INTERNSHIP_SKILL, SAVED_INTERNSHIP,
+    SKILL, USER_INTEREST, USER_SKILL
+)
 from flask_sqlalchemy import SQLAlchemy
 
 class University(db.Model):
@@ -54,10 +59,14 @@ class User(db.Model):
     saved_internships = db.relationship('SavedInternship', back_populates='user', cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = get_password_hasher().hash(password)
     
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """Verify a password, upgrading the stored hash if its bcrypt cost is outdated (caller commits)"""
+        matched, new_hash = get_password_hasher().verify_and_update(password, self.password_hash)
+        if new_hash:
+            self.password_hash = new_hash
+        return matched
     
     def to_dict(self):
         return {
@@ -90,35 +99,26 @@ class Skill(db.Model):
     internships = db.relationship('InternshipSkill', back_populates='skill', cascade='all, delete-orphan')
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return SKILL.dump(self)
 
 class UserSkill(db.Model):
     __tablename__ = 'user_skills'
     
-    id = db.Column(db.String(50), primary_key=True)
-    user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    skill_id = db.Column(db.String(50), db.ForeignKey('skills.id'), nullable=False)
+    # Join rows are keyed by the pair itself (clustered on SQLite), no per-row UUID
+    user_id = db.Column(db.String(50), db.ForeignKey('users.id'), primary_key=True)
+    skill_id = db.Column(db.String(50), db.ForeignKey('skills.id'), primary_key=True)
     level = db.Column(db.String(20), default='beginner')
     
     # Relationships
     user = db.relationship('User', back_populates='skills')
     skill = db.relationship('Skill', back_populates='users')
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'skill_id'),)
+    __table_args__ = ({'sqlite_with_rowid': False},)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'skill_id': self.skill_id,
-            'level': self.level,
-            'skill': self.skill.to_dict() if self.skill else None
-        }
+        data = USER_SKILL.dump(self)
+        data['skill'] = self.skill.to_dict() if self.skill else None
+        return data
 
 class Interest(db.Model):
     __tablename__ = 'interests'
@@ -133,33 +133,24 @@ class Interest(db.Model):
     internships = db.relationship('InternshipInterest', back_populates='interest', cascade='all, delete-orphan')
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return INTEREST.dump(self)
 
 class UserInterest(db.Model):
     __tablename__ = 'user_interests'
     
-    id = db.Column(db.String(50), primary_key=True)
-    user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    interest_id = db.Column(db.String(50), db.ForeignKey('interests.id'), nullable=False)
+    user_id = db.Column(db.String(50), db.ForeignKey('users.id'), primary_key=True)
+    interest_id = db.Column(db.String(50), db.ForeignKey('interests.id'), primary_key=True)
     
     # Relationships
     user = db.relationship('User', back_populates='interests')
     interest = db.relationship('Interest', back_populates='users')
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'interest_id'),)
+    __table_args__ = ({'sqlite_with_rowid': False},)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'interest_id': self.interest_id,
-            'interest': self.interest.to_dict() if self.interest else None
-        }
+        data = USER_INTEREST.dump(self)
+        data['interest'] = self.interest.to_dict() if self.interest else None
+        return data
 
 class Company(db.Model):
     __tablename__ = 'companies'
@@ -179,18 +170,7 @@ class Company(db.Model):
     internships = db.relationship('Internship', back_populates='company', cascade='all, delete-orphan')
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'website': self.website,
-            'logo': self.logo,
-            'location': self.location,
-            'size': self.size,
-            'industry': self.industry,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return COMPANY.dump(self)
 
 class Internship(db.Model):
     __tablename__ = 'internships'
@@ -198,8 +178,8 @@ class Internship(db.Model):
     id = db.Column(db.String(50), primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    company_id = db.Column(db.String(50), db.ForeignKey('companies.id'), nullable=False)
-    location = db.Column(db.String(100), nullable=False)
+    company_id = db.Column(db.String(50), db.ForeignKey('companies.id'), nullable=False, index=True)
+    location = db.Column(db.String(100), nullable=False, index=True)
     duration = db.Column(db.String(50), nullable=False)  # e.g., "12 weeks", "6 months"
     salary = db.Column(db.String(100))
     requirements = db.Column(db.JSON)  # List of requirements
@@ -220,70 +200,52 @@ class Internship(db.Model):
     applications = db.relationship('Application', back_populates='internship', cascade='all, delete-orphan')
     saved_by = db.relationship('SavedInternship', back_populates='internship', cascade='all, delete-orphan')
     
+    # Listings filter on active and trending also ranges over posted_date
+    __table_args__ = (db.Index('ix_internships_active_posted_date', 'active', 'posted_date'),)
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'company_id': self.company_id,
-            'location': self.location,
-            'duration': self.duration,
-            'salary': self.salary,
-            'requirements': self.requirements,
-            'team_size': self.team_size,
-            'rating': self.rating,
-            'applicants': self.applicants,
-            'posted_date': self.posted_date.isoformat() if self.posted_date else None,
-            'deadline': self.deadline.isoformat() if self.deadline else None,
-            'remote': self.remote,
-            'active': self.active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return INTERNSHIP.dump(self)
 
 class InternshipSkill(db.Model):
     __tablename__ = 'internship_skills'
     
-    id = db.Column(db.String(50), primary_key=True)
-    internship_id = db.Column(db.String(50), db.ForeignKey('internships.id'), nullable=False)
-    skill_id = db.Column(db.String(50), db.ForeignKey('skills.id'), nullable=False)
+    internship_id = db.Column(db.String(50), db.ForeignKey('internships.id'), primary_key=True)
+    skill_id = db.Column(db.String(50), db.ForeignKey('skills.id'), primary_key=True)
     required = db.Column(db.Boolean, default=True)
     
     # Relationships
     internship = db.relationship('Internship', back_populates='skills')
     skill = db.relationship('Skill', back_populates='internships')
     
-    __table_args__ = (db.UniqueConstraint('internship_id', 'skill_id'),)
+    __table_args__ = (
+        db.Index('ix_internship_skills_skill_id', 'skill_id'),
+        {'sqlite_with_rowid': False},
+    )
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'internship_id': self.internship_id,
-            'skill_id': self.skill_id,
-            'required': self.required,
-            'skill': self.skill.to_dict() if self.skill else None
-        }
+        data = INTERNSHIP_SKILL.dump(self)
+        data['skill'] = self.skill.to_dict() if self.skill else None
+        return data
 
 class InternshipInterest(db.Model):
     __tablename__ = 'internship_interests'
     
-    id = db.Column(db.String(50), primary_key=True)
-    internship_id = db.Column(db.String(50), db.ForeignKey('internships.id'), nullable=False)
-    interest_id = db.Column(db.String(50), db.ForeignKey('interests.id'), nullable=False)
+    internship_id = db.Column(db.String(50), db.ForeignKey('internships.id'), primary_key=True)
+    interest_id = db.Column(db.String(50), db.ForeignKey('interests.id'), primary_key=True)
     
     # Relationships
     internship = db.relationship('Internship', back_populates='interests')
     interest = db.relationship('Interest', back_populates='internships')
     
-    __table_args__ = (db.UniqueConstraint('internship_id', 'interest_id'),)
+    __table_args__ = (
+        db.Index('ix_internship_interests_interest_id', 'interest_id'),
+        {'sqlite_with_rowid': False},
+    )
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'internship_id': self.internship_id,
-            'interest_id': self.interest_id,
-            'interest': self.interest.to_dict() if self.interest else None
-        }
+        data = INTERNSHIP_INTEREST.dump(self)
+        data['interest'] = self.interest.to_dict() if self.interest else None
+        return data
 
 class Application(db.Model):
     __tablename__ = 'applications'
@@ -301,19 +263,15 @@ class Application(db.Model):
     user = db.relationship('User', back_populates='applications')
     internship = db.relationship('Internship', back_populates='applications')
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'internship_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'internship_id'),
+        db.Index('ix_applications_user_id_applied_at', 'user_id', 'applied_at'),
+        db.Index('ix_applications_user_id_status', 'user_id', 'status'),
+        db.Index('ix_applications_internship_id', 'internship_id'),
+    )
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'internship_id': self.internship_id,
-            'status': self.status,
-            'applied_at': self.applied_at.isoformat() if self.applied_at else None,
-            'notes': self.notes,
-            'resume_url': self.resume_url,
-            'cover_letter': self.cover_letter
-        }
+        return APPLICATION.dump(self)
 
 class SavedInternship(db.Model):
     __tablename__ = 'saved_internships'
@@ -327,12 +285,11 @@ class SavedInternship(db.Model):
     user = db.relationship('User', back_populates='saved_internships')
     internship = db.relationship('Internship', back_populates='saved_by')
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'internship_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'internship_id'),
+        db.Index('ix_saved_internships_user_id_saved_at', 'user_id', 'saved_at'),
+        db.Index('ix_saved_internships_internship_id', 'internship_id'),
+    )
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'internship_id': self.internship_id,
-            'saved_at': self.saved_at.isoformat() if self.saved_at else None
-        }
+        return SAVED_INTERNSHIP.dump(self)
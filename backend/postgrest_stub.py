@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for Supabase (PostgREST tables + Storage objects).
+
+Used by the test scripts so the REST client can be exercised without network
+access. Tables are plain lists of dicts kept in memory. The server speaks
+HTTP/1.1 keep-alive and counts TCP connections, so tests can assert that
+calls reuse pooled connections.
+
+Usage:
+    stub = PostgrestStub(tables={'users': [...]})
+    stub.start()
+    client = SimpleSupabaseClient(stub.rest_url, {'Content-Type': 'application/json'})
+    ...
+    stub.stop()
+"""
+
+import fnmatch
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+def _coerce(value):
+    """Compare numbers as numbers and booleans as booleans, like Postgres would"""
+    if value in ('true', 'false'):
+        return value == 'true'
+    if value == 'null':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def _matches(row, column, expression):
+    operator, _, operand = expression.partition('.')
+    value = row.get(column)
+    if operator == 'eq':
+        return value == _coerce(operand) or str(value) == operand
+    if operator == 'neq':
+        return not (value == _coerce(operand) or str(value) == operand)
+    if operator == 'ilike':
+        pattern = operand.replace('*', '%').replace('%', '*').lower()
+        return value is not None and fnmatch.fnmatchcase(str(value).lower(), pattern)
+    if operator in ('gt', 'gte', 'lt', 'lte'):
+        if value is None:
+            return False
+        target = _coerce(operand)
+        if isinstance(target, (int, float)) and not isinstance(value, (int, float)):
+            value = _coerce(str(value))
+        return {
+            'gt': value > target, 'gte': value >= target,
+            'lt': value < target, 'lte': value <= target
+        }[operator]
+    if operator == 'in':
+        options = [option.strip().strip('"') for option in operand.strip('()').split(',')]
+        return str(value) in options
+    if operator == 'is':
+        return value is _coerce(operand)
+    raise ValueError(f"Unsupported operator: {operator}")
+
+
+class PostgrestStub:
+    RESERVED_PARAMS = {'select', 'limit', 'offset', 'order', 'on_conflict'}
+
+    def __init__(self, tables=None):
+        self.tables = {name: [dict(row) for row in rows] for name, rows in (tables or {}).items()}
+        self.objects = {}
+        self.requests = []
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def rest_url(self):
+        return f"{self.url}/rest/v1"
+
+    def fail_next(self, status, times=1):
+        """Make the next ``times`` requests fail with ``status``"""
+        with self._lock:
+            self._failures.extend([status] * times)
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_body(self):
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            return b''.join(chunks)
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                length = int(self.headers.get('Content-Length', 0))
+                return self.rfile.read(length) if length else b''
+
+            def _handle(self):
+                parsed = urlparse(self.path)
+                body = self._read_body()
+                with stub._lock:
+                    stub.requests.append((self.command, parsed.path, parsed.query))
+                    failure = stub._failures.pop(0) if stub._failures else None
+                if failure:
+                    return self._send(failure, {'message': 'injected failure'})
+
+                if parsed.path.startswith('/storage/v1/'):
+                    return self._send(*stub.handle_storage(self.command, parsed.path, body, self.headers))
+                if parsed.path.startswith('/rest/v1/'):
+                    table = parsed.path[len('/rest/v1/'):]
+                    params = parse_qsl(parsed.query, keep_blank_values=True)
+                    return self._send(*stub.handle_rest(self.command, table, params, body, self.headers))
+                return self._send(404, {'message': 'not found'})
+
+            do_GET = do_POST = do_PATCH = do_DELETE = do_HEAD = _handle
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle_rest(self, method, table, params, body, headers):
+        with self._lock:
+            rows = self.tables.setdefault(table, [])
+            filters = [(key, value) for key, value in params if key not in self.RESERVED_PARAMS]
+            options = {key: value for key, value in params if key in self.RESERVED_PARAMS}
+            selected = [row for row in rows if all(_matches(row, col, expr) for col, expr in filters)]
+
+            prefer = headers.get('Prefer', '') if headers is not None else ''
+
+            if method == 'POST':
+                records = json.loads(body or b'null')
+                records = records if isinstance(records, list) else [records]
+                key = options.get('on_conflict', 'id')
+                created = []
+                for record in records:
+                    existing = None
+                    if 'resolution=merge-duplicates' in prefer and key in record:
+                        existing = next((row for row in rows if row.get(key) == record[key]), None)
+                    if existing is not None:
+                        existing.update(record)
+                        created.append(dict(existing))
+                    else:
+                        rows.append(dict(record))
+                        created.append(dict(record))
+                return 201, created, None
+
+            if method == 'PATCH':
+                changes = json.loads(body or b'{}')
+                for row in selected:
+                    row.update(changes)
+                return 200, [dict(row) for row in selected], None
+
+            if method == 'DELETE':
+                for row in selected:
+                    rows.remove(row)
+                return 200, [dict(row) for row in selected], None
+
+            total = len(selected)
+            if 'order' in options:
+                column, _, direction = options['order'].partition('.')
+                selected = sorted(selected, key=lambda row: (row.get(column) is None, row.get(column)),
+                                  reverse=direction.startswith('desc'))
+            offset = int(options.get('offset', 0))
+            selected = selected[offset:]
+            if 'limit' in options:
+                selected = selected[:int(options['limit'])]
+            if options.get('select', '*') != '*':
+                columns = [column.strip() for column in options['select'].split(',')]
+                selected = [{column: row.get(column) for column in columns} for row in selected]
+
+            counted = 'count=' in prefer
+            span = f"{offset}-{offset + len(selected) - 1}" if selected else '*'
+            content_range = {'Content-Range': f"{span}/{total if counted else '*'}"}
+            if method == 'HEAD':
+                return 200, None, content_range
+            return 200, [dict(row) for row in selected], content_range
+
+    def handle_storage(self, method, path, body, headers):
+        prefix = '/storage/v1/object/'
+        if method == 'POST' and path.startswith(prefix + 'list/'):
+            bucket = path[len(prefix + 'list/'):]
+            folder = json.loads(body or b'{}').get('prefix', '').rstrip('/') + '/'
+            with self._lock:
+                names = [key[len(bucket) + 1 + len(folder):] for key in self.objects
+                         if key.startswith(f"{bucket}/{folder}")]
+                return 200, [{'name': name, 'metadata': {'size': len(self.objects[f"{bucket}/{folder}{name}"])},
+                              'created_at': None} for name in sorted(names)], None
+        if method == 'POST' and path.startswith(prefix + 'sign/'):
+            paths = json.loads(body or b'{}').get('paths', [])
+            return 200, [{'path': p, 'signedURL': f"/object/sign/{p}?token=stub"} for p in paths], None
+        if method == 'DELETE' and path.startswith(prefix):
+            bucket = path[len(prefix):]
+            with self._lock:
+                for name in json.loads(body or b'{}').get('prefixes', []):
+                    self.objects.pop(f"{bucket}/{name}", None)
+            return 200, [], None
+        if method == 'POST' and path.startswith(prefix):
+            key = path[len(prefix):]
+            with self._lock:
+                self.objects[key] = body
+            return 200, {'Key': key}, None
+        return 404, {'message': 'not found'}, None
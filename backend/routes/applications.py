@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
+from utils.serializers import get_serialization_context
+from utils.streaming import STREAM_BATCH_SIZE, stream_list
 from models import Application, Internship, Company, User, InternshipSkill, InternshipInterest
 import uuid
 from datetime import datetime
@@ -32,13 +34,10 @@ def get_applications():
             db.joinedload(Application.internship).joinedload(Internship.skills).joinedload(InternshipSkill.skill)
         ).offset(skip).limit(limit).order_by(Application.applied_at.desc()).all()
         
+        serializer = get_serialization_context()
         application_list = []
         for app in applications:
-            app_dict = app.to_dict()
-            app_dict['internship'] = app.internship.to_dict()
-            app_dict['internship']['company'] = app.internship.company.to_dict()
-            app_dict['internship']['skills'] = [is_obj.to_dict() for is_obj in app.internship.skills]
-            application_list.append(app_dict)
+            application_list.append(serializer.application(app, interests=False))
         
         return jsonify({
             'applications': application_list,
@@ -53,6 +52,37 @@ def get_applications():
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
+@applications_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_applications():
+    """All of the user's applications, streamed as JSON (or NDJSON with ?format=ndjson)"""
+    try:
+        user_id = get_jwt_identity()
+        status = request.args.get('status')
+        
+        query = Application.query.filter_by(user_id=user_id)
+        if status:
+            query = query.filter_by(status=status)
+        
+        # Server-side cursor: rows are fetched and serialized in batches while the response streams
+        applications = query.options(
+            db.joinedload(Application.internship).joinedload(Internship.company),
+            db.joinedload(Application.internship).selectinload(Internship.skills).joinedload(InternshipSkill.skill)
+        ).order_by(Application.applied_at.desc()).yield_per(STREAM_BATCH_SIZE)
+        
+        serializer = get_serialization_context()
+        streamed = {'total': 0}
+        
+        def application_list():
+            for app in applications:
+                streamed['total'] += 1
+                yield serializer.application(app, interests=False)
+        
+        return stream_list('applications', application_list(), extra=lambda: streamed)
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
 @applications_bp.route('/', methods=['POST'])
 @jwt_required()
 def apply_for_internship():
@@ -112,9 +142,7 @@ def apply_for_internship():
         db.session.commit()
         
         # Return created application with internship details
-        application_dict = application.to_dict()
-        application_dict['internship'] = internship.to_dict()
-        application_dict['internship']['company'] = internship.company.to_dict()
+        application_dict = get_serialization_context().application(application, skills=False, interests=False)
         
         return jsonify({
             'message': 'Application submitted successfully',
@@ -143,11 +171,7 @@ def get_application(application_id):
         if not application:
             return jsonify({'error': 'Application not found'}), 404
         
-        application_dict = application.to_dict()
-        application_dict['internship'] = application.internship.to_dict()
-        application_dict['internship']['company'] = application.internship.company.to_dict()
-        application_dict['internship']['skills'] = [is_obj.to_dict() for is_obj in application.internship.skills]
-        application_dict['internship']['interests'] = [ii_obj.to_dict() for ii_obj in application.internship.interests]
+        application_dict = get_serialization_context().application(application)
         
         return jsonify({'application': application_dict}), 200
         
@@ -190,9 +214,7 @@ def update_application(application_id):
         db.session.commit()
         
         # Return updated application
-        application_dict = application.to_dict()
-        application_dict['internship'] = application.internship.to_dict()
-        application_dict['internship']['company'] = application.internship.company.to_dict()
+        application_dict = get_serialization_context().application(application, skills=False, interests=False)
         
         return jsonify({
             'message': 'Application updated successfully',
@@ -1,26 +1,35 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import os
+from utils.llm_gateway import LLMBusy, LLMTimeout, get_llm_gateway, request_user_key
+from utils.streaming import event_stream, sse_event
 
 chat_bp = Blueprint('chat', __name__)
 
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except Exception:
-    GENAI_AVAILABLE = False
 
+NOT_CONFIGURED_REPLY = "AI is not configured. Add GEMINI_API_KEY to your environment to enable the assistant."
+EMPTY_REPLY = "Sorry, I couldn't generate a response. Please try again."
 
-def get_gemini_model():
-    api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
-    if not api_key or not GENAI_AVAILABLE:
-        return None
-    genai.configure(api_key=api_key)
-    model_name = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash')
-    try:
-        return genai.GenerativeModel(model_name)
-    except Exception:
-        return None
+SYSTEM_PROMPT = (
+    "You are InternMatch Assistant. Be concise and helpful. "
+    "Focus on internships, applications, resume tips, and career guidance. "
+    "If asked outside scope, steer back politely."
+)
+
+
+def build_prompt(message, context):
+    user_context = ''
+    if context:
+        try:
+            import json as _json
+            user_context = f"\nContext: {_json.dumps(context)[:2000]}"
+        except Exception:
+            user_context = ''
+
+    return f"{SYSTEM_PROMPT}\nUser: {message}{user_context}"
+
+
+def _busy_response():
+    return jsonify({'error': 'Too many requests in progress, please retry shortly'}), 429, {'Retry-After': '2'}
 
 
 @chat_bp.route('/ask', methods=['POST'])
@@ -33,39 +42,69 @@ def ask():
         if not message:
             return jsonify({'error': 'Message is required'}), 400
 
-        model = get_gemini_model()
-        if not model:
+        gateway = get_llm_gateway()
+        if not gateway:
             return jsonify({
-                'reply': "AI is not configured. Add GEMINI_API_KEY to your environment to enable the assistant.",
+                'reply': NOT_CONFIGURED_REPLY,
                 'provider': 'fallback'
             }), 200
 
-        system_prompt = (
-            "You are InternMatch Assistant. Be concise and helpful. "
-            "Focus on internships, applications, resume tips, and career guidance. "
-            "If asked outside scope, steer back politely."
-        )
-
-        user_context = ''
-        if context:
-            try:
-                import json as _json
-                user_context = f"\nContext: {_json.dumps(context)[:2000]}"
-            except Exception:
-                user_context = ''
-
-        prompt = f"{system_prompt}\nUser: {message}{user_context}"
-
-        result = model.generate_content(prompt)
-        text = getattr(result, 'text', None) or (result.candidates[0].content.parts[0].text if getattr(result, 'candidates', None) else '')
-        reply = text.strip() if text else "Sorry, I couldn't generate a response. Please try again."
+        text = gateway.generate(build_prompt(message, context), 'chat', user_key=request_user_key())
+        reply = text.strip() if text else EMPTY_REPLY
 
         return jsonify({
             'reply': reply,
-            'provider': 'gemini'
+            'provider': gateway.provider
         }), 200
 
+    except LLMBusy:
+        return _busy_response()
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@chat_bp.route('/ask/stream', methods=['POST'])
+def ask_stream():
+    """Same as /ask, but the reply is sent as server-sent events while it is generated:
+    ``token`` events (``{"text": ...}``), then ``done`` (``{"provider": ...}``) or ``error``.
+    """
+    try:
+        data = request.get_json() or {}
+        message = (data.get('message') or '').strip()
+        context = data.get('context') or {}
+
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+
+        gateway = get_llm_gateway()
+        if not gateway:
+            def not_configured():
+                yield sse_event('token', {'text': NOT_CONFIGURED_REPLY})
+                yield sse_event('done', {'provider': 'fallback'})
+            return event_stream(not_configured())
+
+        # Raises LLMBusy before the response starts
+        stream = gateway.stream(build_prompt(message, context), 'chat', user_key=request_user_key())
+
+        def events():
+            try:
+                sent = False
+                for chunk in stream:
+                    sent = True
+                    yield sse_event('token', {'text': chunk})
+                if not sent:
+                    yield sse_event('token', {'text': EMPTY_REPLY})
+                yield sse_event('done', {'provider': gateway.provider})
+            except LLMTimeout:
+                yield sse_event('error', {'error': 'The assistant took too long to respond, please try again'})
+            except Exception as e:
+                print(f"Error streaming chat reply: {e}")
+                yield sse_event('error', {'error': 'Internal server error'})
+
+        # Closing the response (reply sent or client gone) cancels the upstream call
+        return event_stream(events(), on_close=stream.close)
+
+    except LLMBusy:
+        return _busy_response()
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
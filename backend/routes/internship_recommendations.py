@@ -1,34 +1,66 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import pandas as pd
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.neighbors import NearestNeighbors
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 import re
 import os
-import pickle
+import threading
+
+from utils.metrics import model_load_duration
+
+# pandas, sklearn, NLTK and sentence-transformers are imported on first use,
+# so importing the blueprint (every app start, /health included) stays cheap
 
 internship_recommendations_bp = Blueprint('internship_recommendations', __name__)
 
-# Initialize NLTK downloads
-try:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('omw-1.4', quiet=True)
-except:
-    pass
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# (download name, nltk.data path) of the corpora clean_text needs
+NLTK_RESOURCES = [
+    ('stopwords', 'corpora/stopwords'),
+    ('wordnet', 'corpora/wordnet'),
+    ('omw-1.4', 'corpora/omw-1.4'),
+]
+
+_text_tools = None
+_model = None
+_lock = threading.Lock()
 
-# Text preprocessing setup
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+def _get_text_tools():
+    """Lemmatizer and stop words, downloading missing NLTK data on first use"""
+    global _text_tools
+    if _text_tools is None:
+        with _lock:
+            if _text_tools is None:
+                import nltk
+                from nltk.corpus import stopwords
+                from nltk.stem import WordNetLemmatizer
+                for name, path in NLTK_RESOURCES:
+                    try:
+                        nltk.data.find(path)
+                    except LookupError:
+                        try:
+                            nltk.download(name, quiet=True)
+                        except Exception:
+                            pass
+                _text_tools = (WordNetLemmatizer(), set(stopwords.words('english')))
+    return _text_tools
+
+def _get_embedding_model():
+    """SentenceTransformer shared by requests (loaded once per process)"""
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                with model_load_duration.time(model=EMBEDDING_MODEL):
+                    from sentence_transformers import SentenceTransformer
+                    _model = SentenceTransformer(EMBEDDING_MODEL)
+    return _model
 
 def clean_text(text):
     """Clean and preprocess text"""
+    import pandas as pd
     if pd.isna(text):
         return ""
+    lemmatizer, stop_words = _get_text_tools()
     text = str(text).lower()
     text = re.sub(r'[^a-zA-Z\s]', '', text)  # remove special chars
     tokens = [lemmatizer.lemmatize(word) for word in text.split() if word not in stop_words]
@@ -37,6 +69,8 @@ def clean_text(text):
 def load_internship_data():
     """Load and preprocess internship data"""
     try:
+        import pandas as pd
+        
         # Try to load the Excel file
         excel_path = "internship recommendation (2)/internship recommendation/Final Dataset PM Internship.csv.xlsx"
         if os.path.exists(excel_path):
@@ -108,7 +142,9 @@ def get_recommendations():
         
         # Generate embeddings
         try:
-            model = SentenceTransformer('all-MiniLM-L6-v2')
+            from sklearn.neighbors import NearestNeighbors
+            
+            model = _get_embedding_model()
             internship_embeddings = model.encode(df['cleaned_text'].tolist())
             candidate_embedding = model.encode([candidate_text])
             
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from extensions import db
+from utils.projections import InternshipProjection
+from utils.serializers import get_serialization_context
+from utils.streaming import STREAM_BATCH_SIZE, stream_list
 from models import Internship, Company, InternshipSkill, InternshipInterest, SavedInternship, Skill, Interest
 import uuid
 from datetime import datetime
@@ -18,6 +21,10 @@ def get_current_user_id():
 @internships_bp.route('/', methods=['GET'])
 def get_internships():
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 10))
         location = request.args.get('location')
@@ -65,22 +72,16 @@ def get_internships():
         total = query.count()
         
         # Get paginated results
-        internships = query.options(
-            db.joinedload(Internship.company),
-            db.joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-            db.joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-        ).offset(skip).limit(limit).all()
+        internships = query.options(*projection.loader_options()).offset(skip).limit(limit).all()
         
         # Get current user ID for saved status
         user_id = get_current_user_id()
         
         # Format results
+        serializer = get_serialization_context()
         internship_list = []
         for internship in internships:
-            internship_dict = internship.to_dict()
-            internship_dict['company'] = internship.company.to_dict()
-            internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-            internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+            internship_dict = projection.serialize(serializer, internship)
             
             # Check if saved by current user
             if user_id:
@@ -119,10 +120,7 @@ def get_internship(internship_id):
         if not internship:
             return jsonify({'error': 'Internship not found'}), 404
         
-        internship_dict = internship.to_dict()
-        internship_dict['company'] = internship.company.to_dict()
-        internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-        internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+        internship_dict = get_serialization_context().internship(internship)
         
         # Check if saved by current user
         user_id = get_current_user_id()
@@ -179,7 +177,6 @@ def create_internship():
         skill_ids = data.get('skill_ids', [])
         for skill_id in skill_ids:
             internship_skill = InternshipSkill(
-                id=str(uuid.uuid4()),
                 internship_id=internship.id,
                 skill_id=skill_id,
                 required=True
@@ -190,7 +187,6 @@ def create_internship():
         interest_ids = data.get('interest_ids', [])
         for interest_id in interest_ids:
             internship_interest = InternshipInterest(
-                id=str(uuid.uuid4()),
                 internship_id=internship.id,
                 interest_id=interest_id
             )
@@ -199,10 +195,7 @@ def create_internship():
         db.session.commit()
         
         # Return created internship
-        internship_dict = internship.to_dict()
-        internship_dict['company'] = company.to_dict()
-        internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-        internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+        internship_dict = get_serialization_context().internship(internship)
         
         return jsonify({
             'message': 'Internship created successfully',
@@ -238,10 +231,7 @@ def update_internship(internship_id):
         db.session.commit()
         
         # Return updated internship
-        internship_dict = internship.to_dict()
-        internship_dict['company'] = internship.company.to_dict()
-        internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-        internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+        internship_dict = get_serialization_context().internship(internship)
         
         return jsonify({
             'message': 'Internship updated successfully',
@@ -321,26 +311,26 @@ def save_internship(internship_id):
 @jwt_required()
 def get_saved_internships():
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         user_id = get_jwt_identity()
         
+        # Server-side cursor: rows are fetched and serialized in batches while the response streams
         saved_internships = SavedInternship.query.filter_by(user_id=user_id).options(
-            db.joinedload(SavedInternship.internship).joinedload(Internship.company),
-            db.joinedload(SavedInternship.internship).joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-            db.joinedload(SavedInternship.internship).joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-        ).order_by(SavedInternship.saved_at.desc()).all()
-        
-        saved_list = []
-        for saved in saved_internships:
-            internship = saved.internship
-            internship_dict = internship.to_dict()
-            internship_dict['company'] = internship.company.to_dict()
-            internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-            internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
-            internship_dict['saved_at'] = saved.saved_at.isoformat()
-            
-            saved_list.append(internship_dict)
+            db.joinedload(SavedInternship.internship).options(*projection.loader_options(streaming=True))
+        ).order_by(SavedInternship.saved_at.desc()).yield_per(STREAM_BATCH_SIZE)
+        
+        serializer = get_serialization_context()
+        
+        def saved_list():
+            for saved in saved_internships:
+                internship_dict = projection.serialize(serializer, saved.internship)
+                internship_dict['saved_at'] = saved.saved_at.isoformat()
+                yield internship_dict
         
-        return jsonify({'saved_internships': saved_list}), 200
+        return stream_list('saved_internships', saved_list())
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
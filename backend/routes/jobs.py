@@ -0,0 +1,79 @@
+from flask import Blueprint, jsonify, Response, stream_with_context
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from utils.job_queue import get_job_queue
+import json
+
+jobs_bp = Blueprint('jobs', __name__)
+
+def get_current_user_id():
+    """Get current user ID if authenticated, otherwise return None"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except:
+        return None
+
+def _get_visible_job(job_id):
+    """Return the job if it exists and the caller may see it"""
+    job = get_job_queue().get(job_id)
+    if not job:
+        return None
+    if job.user_id and job.user_id != get_current_user_id():
+        return None
+    return job
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a job's status; includes the result once it has succeeded"""
+    try:
+        job = _get_visible_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found or expired'}), 404
+
+        return jsonify({'job': job.to_dict()}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@jobs_bp.route('/<job_id>/events', methods=['GET'])
+def stream_job(job_id):
+    """Stream status changes as Server-Sent Events until the job finishes"""
+    try:
+        job = _get_visible_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found or expired'}), 404
+
+        queue = get_job_queue()
+
+        def generate():
+            current = job
+            yield f"event: status\ndata: {json.dumps(current.to_dict())}\n\n"
+            while not current.done:
+                previous_status = current.status
+                current = queue.wait(job_id, last_status=previous_status, timeout=15)
+                if current is None:
+                    yield "event: expired\ndata: {}\n\n"
+                    return
+                if current.status == previous_status:
+                    # Heartbeat keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: status\ndata: {json.dumps(current.to_dict())}\n\n"
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@jobs_bp.route('/stats', methods=['GET'])
+def get_job_stats():
+    """Queue depth and job counts by status"""
+    try:
+        return jsonify({'stats': get_job_queue().stats()}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
@@ -2,7 +2,6 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from models import User, UserSkill, UserInterest, Skill, Interest
-import uuid
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -95,7 +94,6 @@ def add_skill():
         
         # Add skill to user
         user_skill = UserSkill(
-            id=str(uuid.uuid4()),
             user_id=user_id,
             skill_id=skill_id,
             level=level
@@ -166,7 +164,6 @@ def add_interest():
         
         # Add interest to user
         user_interest = UserInterest(
-            id=str(uuid.uuid4()),
             user_id=user_id,
             interest_id=interest_id
         )
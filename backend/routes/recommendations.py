@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from extensions import db
+from utils.projections import InternshipProjection
+from utils.serializers import get_serialization_context
+from utils.streaming import stream_list
 from models import User, Internship, SavedInternship, Application, Skill, Interest, InternshipSkill, InternshipInterest
 from utils.matching import get_top_recommendations, calculate_match_score
 from datetime import datetime, timedelta
@@ -19,6 +22,10 @@ def get_current_user_id():
 @jwt_required()
 def get_recommendations():
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         user_id = get_jwt_identity()
         limit = int(request.args.get('limit', 5))
         
@@ -26,19 +33,16 @@ def get_recommendations():
         recommendations = get_top_recommendations(user_id, limit)
         
         # Get detailed internship information for each recommendation
-        detailed_recommendations = []
-        for rec in recommendations:
-            internship = Internship.query.options(
-                db.joinedload(Internship.company),
-                db.joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-                db.joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-            ).get(rec['internship_id'])
-            
-            if internship:
-                internship_dict = internship.to_dict()
-                internship_dict['company'] = internship.company.to_dict()
-                internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-                internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+        serializer = get_serialization_context()
+        streamed = {'total': 0}
+        
+        def detailed_recommendations():
+            for rec in recommendations:
+                internship = Internship.query.options(*projection.loader_options()).get(rec['internship_id'])
+                if not internship:
+                    continue
+                
+                internship_dict = projection.serialize(serializer, internship)
                 internship_dict['match_percentage'] = rec['score']
                 internship_dict['match_reasons'] = rec['reasons']
                 
@@ -56,12 +60,11 @@ def get_recommendations():
                 ).first()
                 internship_dict['has_applied'] = bool(has_applied)
                 
-                detailed_recommendations.append(internship_dict)
+                streamed['total'] += 1
+                yield internship_dict
         
-        return jsonify({
-            'recommendations': detailed_recommendations,
-            'total': len(detailed_recommendations)
-        }), 200
+        # Items are sent as each one is loaded and serialized
+        return stream_list('recommendations', detailed_recommendations(), extra=lambda: streamed)
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -87,6 +90,10 @@ def get_match_score(internship_id):
 @jwt_required()
 def get_category_recommendations(category):
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         user_id = get_jwt_identity()
         limit = int(request.args.get('limit', 5))
         
@@ -118,21 +125,15 @@ def get_category_recommendations(category):
             }), 200
         
         # Calculate match scores for these internships
+        serializer = get_serialization_context()
         recommendations_with_scores = []
         for internship_id in internship_ids:
             try:
                 match_result = calculate_match_score(user_id, internship_id)
-                internship = Internship.query.options(
-                    db.joinedload(Internship.company),
-                    db.joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-                    db.joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-                ).get(internship_id)
+                internship = Internship.query.options(*projection.loader_options()).get(internship_id)
                 
                 if internship:
-                    internship_dict = internship.to_dict()
-                    internship_dict['company'] = internship.company.to_dict()
-                    internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-                    internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+                    internship_dict = projection.serialize(serializer, internship)
                     internship_dict['match_percentage'] = match_result['score']
                     internship_dict['match_reasons'] = match_result['reasons']
                     
@@ -163,6 +164,10 @@ def get_category_recommendations(category):
 @recommendations_bp.route('/trending', methods=['GET'])
 def get_trending_internships():
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         limit = int(request.args.get('limit', 5))
         
         # Get internships posted in the last 7 days, ordered by applicants
@@ -171,21 +176,15 @@ def get_trending_internships():
         trending_internships = Internship.query.filter(
             Internship.active == True,
             Internship.posted_date >= week_ago
-        ).options(
-            db.joinedload(Internship.company),
-            db.joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-            db.joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-        ).order_by(
+        ).options(*projection.loader_options()).order_by(
             Internship.applicants.desc(),
             Internship.posted_date.desc()
         ).limit(limit).all()
         
+        serializer = get_serialization_context()
         trending_list = []
         for internship in trending_internships:
-            internship_dict = internship.to_dict()
-            internship_dict['company'] = internship.company.to_dict()
-            internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-            internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+            internship_dict = projection.serialize(serializer, internship)
             
             # Check if saved by current user
             user_id = get_current_user_id()
@@ -211,6 +210,10 @@ def get_trending_internships():
 @recommendations_bp.route('/similar/<internship_id>', methods=['GET'])
 def get_similar_internships(internship_id):
     try:
+        try:
+            projection = InternshipProjection.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         limit = int(request.args.get('limit', 5))
         
         # Get the reference internship
@@ -258,18 +261,12 @@ def get_similar_internships(internship_id):
         # Get internship details
         similar_internships = Internship.query.filter(
             Internship.id.in_(similar_ids)
-        ).options(
-            db.joinedload(Internship.company),
-            db.joinedload(Internship.skills).joinedload(InternshipSkill.skill),
-            db.joinedload(Internship.interests).joinedload(InternshipInterest.interest)
-        ).all()
+        ).options(*projection.loader_options()).all()
         
+        serializer = get_serialization_context()
         similar_list = []
         for internship in similar_internships:
-            internship_dict = internship.to_dict()
-            internship_dict['company'] = internship.company.to_dict()
-            internship_dict['skills'] = [is_obj.to_dict() for is_obj in internship.skills]
-            internship_dict['interests'] = [ii_obj.to_dict() for ii_obj in internship.interests]
+            internship_dict = projection.serialize(serializer, internship)
             
             # Check if saved by current user
             user_id = get_current_user_id()
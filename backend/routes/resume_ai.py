@@ -1,25 +1,107 @@
-from flask import Blueprint, request, jsonify
 import os
+from flask import Blueprint, request, jsonify
+from utils.job_queue import get_job_queue
+from utils.llm_gateway import LLMBusy, get_llm_gateway, request_user_key
+from utils.metrics import resume_analyses
+from utils.resume_analyzer import get_local_analyzer
 
 resume_ai_bp = Blueprint('resume_ai', __name__)
 
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except Exception:
-    GENAI_AVAILABLE = False
+# Local analyses less confident than this are sent to the LLM when one is configured
+LOCAL_MIN_CONFIDENCE = float(os.environ.get('RESUME_LOCAL_MIN_CONFIDENCE', 0.5))
+
+
+def run_analysis(resume_text, job_description='', user_key=None, deep=False):
+    """Review a resume and return the response payload (used inline and by background jobs).
+
+    The local analyzer answers unless the caller asked for a ``deep`` review
+    or its confidence is below ``LOCAL_MIN_CONFIDENCE``; those go to the LLM
+    when one is configured.
+    """
+    analysis, confidence = get_local_analyzer().analyze(resume_text, job_description)
+    local = {'analysis': analysis, 'provider': 'local', 'confidence': confidence}
 
+    gateway = get_llm_gateway()
+    if deep:
+        reason = 'requested'
+    elif confidence < LOCAL_MIN_CONFIDENCE:
+        reason = 'low_confidence'
+    else:
+        resume_analyses.inc(provider='local', reason='confident')
+        return local
+    if not gateway:
+        resume_analyses.inc(provider='local', reason='no_llm')
+        return local
 
-def get_gemini_model():
-    api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
-    if not api_key or not GENAI_AVAILABLE:
-        return None
-    genai.configure(api_key=api_key)
-    model_name = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash')
     try:
-        return genai.GenerativeModel(model_name)
+        result = _run_llm_analysis(gateway, resume_text, job_description, user_key)
+    except LLMBusy:
+        if deep:
+            raise
+        # Only escalated for confidence; the local answer is better than a 429
+        resume_analyses.inc(provider='local', reason='llm_busy')
+        return local
+    resume_analyses.inc(provider=gateway.provider, reason=reason)
+    return result
+
+
+def _run_llm_analysis(gateway, resume_text, job_description, user_key):
+    system_prompt = (
+        "You are an expert resume reviewer for internships."
+        "Analyze the resume text, extract strengths, identify gaps, and give actionable recommendations."
+        "If a job description is provided, compute a 0-100 match score and tailor feedback."
+        "Be concise and structured."
+    )
+
+    prompt = f"""
+{system_prompt}
+
+RESUME:
+{resume_text}
+
+JOB DESCRIPTION (optional):
+{job_description}
+
+Return a strict JSON object with keys: summary (string), match_score (number 0-100), strengths (string[]), gaps (string[]), recommendations (string[]).
+"""
+
+    text = gateway.generate(prompt, 'resume_analysis', user_key=user_key).strip()
+
+    # Try to parse JSON from the model output
+    import json as _json
+    parsed = None
+    try:
+        parsed = _json.loads(text)
+    except Exception:
+        # If not pure JSON, try to find JSON substring
+        import re as _re
+        match = _re.search(r"\{[\s\S]*\}", text)
+        if match:
+            try:
+                parsed = _json.loads(match.group(0))
+            except Exception:
+                parsed = None
+
+    if not parsed:
+        parsed = {
+            'summary': 'AI returned an unexpected format; showing raw text.',
+            'match_score': 0,
+            'strengths': [],
+            'gaps': [],
+            'recommendations': [text[:1000]]
+        }
+
+    # Clamp match_score
+    try:
+        ms = float(parsed.get('match_score', 0))
+        parsed['match_score'] = max(0, min(100, int(ms)))
     except Exception:
-        return None
+        parsed['match_score'] = 0
+
+    return {
+        'analysis': parsed,
+        'provider': gateway.provider
+    }
 
 
 @resume_ai_bp.route('/analyze', methods=['POST'])
@@ -27,15 +109,20 @@ def analyze_resume():
     try:
         resume_text = ''
         job_description = ''
+        wants_async = request.args.get('async', '').lower() == 'true'
+        deep = request.args.get('deep', '').lower() == 'true'
 
         # Support JSON body
         if request.is_json:
             data = request.get_json() or {}
             resume_text = (data.get('resume_text') or '').strip()
             job_description = (data.get('job_description') or '').strip()
+            wants_async = wants_async or data.get('async') is True
+            deep = deep or data.get('deep') is True
         else:
             # Support multipart form with file upload
             job_description = (request.form.get('job_description') or '').strip()
+            deep = deep or (request.form.get('deep') or '').lower() == 'true'
             if 'file' in request.files:
                 uploaded = request.files['file']
                 try:
@@ -54,83 +141,19 @@ def analyze_resume():
         if not resume_text:
             return jsonify({'error': 'resume_text is required'}), 400
 
-        model = get_gemini_model()
-        if not model:
+        user_key = request_user_key()
+        if wants_async:
+            job = get_job_queue().submit('resume_analysis', run_analysis, resume_text, job_description, user_key, deep)
             return jsonify({
-                'analysis': {
-                    'summary': 'AI is not configured. Add GEMINI_API_KEY to enable resume analysis.',
-                    'match_score': 0,
-                    'strengths': [],
-                    'gaps': [],
-                    'recommendations': [
-                        'Set GEMINI_API_KEY in backend environment to enable AI analysis.',
-                        'Provide a job description for tailored matching (optional).'
-                    ]
-                },
-                'provider': 'fallback'
-            }), 200
-
-        system_prompt = (
-            "You are an expert resume reviewer for internships."
-            "Analyze the resume text, extract strengths, identify gaps, and give actionable recommendations."
-            "If a job description is provided, compute a 0-100 match score and tailor feedback."
-            "Be concise and structured."
-        )
-
-        prompt = f"""
-{system_prompt}
-
-RESUME:
-{resume_text}
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/api/jobs/{job.id}'
+            }), 202
 
-JOB DESCRIPTION (optional):
-{job_description}
-
-Return a strict JSON object with keys: summary (string), match_score (number 0-100), strengths (string[]), gaps (string[]), recommendations (string[]).
-"""
-
-        result = model.generate_content(prompt)
-        text = getattr(result, 'text', None)
-        if not text and getattr(result, 'candidates', None):
-            text = result.candidates[0].content.parts[0].text
-        text = (text or '').strip()
-
-        # Try to parse JSON from the model output
-        import json as _json
-        parsed = None
-        try:
-            parsed = _json.loads(text)
-        except Exception:
-            # If not pure JSON, try to find JSON substring
-            import re as _re
-            match = _re.search(r"\{[\s\S]*\}", text)
-            if match:
-                try:
-                    parsed = _json.loads(match.group(0))
-                except Exception:
-                    parsed = None
-
-        if not parsed:
-            parsed = {
-                'summary': 'AI returned an unexpected format; showing raw text.',
-                'match_score': 0,
-                'strengths': [],
-                'gaps': [],
-                'recommendations': [text[:1000]]
-            }
-
-        # Clamp match_score
-        try:
-            ms = float(parsed.get('match_score', 0))
-            parsed['match_score'] = max(0, min(100, int(ms)))
-        except Exception:
-            parsed['match_score'] = 0
-
-        return jsonify({
-            'analysis': parsed,
-            'provider': 'gemini'
-        }), 200
+        return jsonify(run_analysis(resume_text, job_description, user_key, deep)), 200
 
+    except LLMBusy:
+        return jsonify({'error': 'Too many analyses in progress, please retry shortly'}), 429, {'Retry-After': '2'}
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
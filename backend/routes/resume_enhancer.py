@@ -1,25 +1,126 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-from utils.resume_parser import ResumeParser, InternshipMatcher
 from utils.supabase_client import supabase_client
+from utils.job_queue import get_job_queue
+from utils.parse_cache import get_parse_cache, content_digest
+from utils.user_cache import get_user_cache
 import os
-import tempfile
+import json
+import threading
 import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 resume_enhancer_bp = Blueprint('resume_enhancer', __name__)
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 
+# Only the internship columns the matcher and the response actually use
+MATCH_COLUMNS = 'id,title,description,requirements,location,duration,stipend'
+
+# Newest active internships scored per recommendation request
+MATCH_CANDIDATE_LIMIT = int(os.environ.get('MATCH_CANDIDATE_LIMIT', 500))
+
+# Concurrent count queries issued by /analyze-skills
+SKILL_COUNT_WORKERS = 8
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+_parser = None
+_parser_lock = threading.Lock()
+
+def _get_parser():
+    """ResumeParser shared by requests and background jobs (spaCy loads once)"""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                # spaCy, PyMuPDF and sklearn load here, not when the blueprint is imported
+                from utils.resume_parser import ResumeParser
+                _parser = ResumeParser()
+    return _parser
+
+def _update_profile_from_resume(supabase, current_user_id, parsed_data):
+    """Fill empty profile fields in Supabase from parsed resume data"""
+    user_cache = get_user_cache()
+    user = user_cache.get_by_id(supabase, current_user_id)
+    if not user:
+        return
+    
+    # Prepare update data for Supabase
+    update_data = {}
+    if parsed_data['contact_info']['name'] and not user.get('first_name'):
+        name_parts = parsed_data['contact_info']['name'].split()
+        if len(name_parts) >= 2:
+            update_data['first_name'] = name_parts[0]
+            update_data['last_name'] = ' '.join(name_parts[1:])
+    
+    if parsed_data['contact_info']['phone'] and not user.get('phone'):
+        update_data['phone'] = parsed_data['contact_info']['phone']
+    
+    # Update education if available
+    if parsed_data['education']:
+        education_info = parsed_data['education'][0]  # Take first education entry
+        if education_info.get('degree') and not user.get('major'):
+            update_data['major'] = education_info['degree']
+        if education_info.get('institution') and not user.get('university'):
+            update_data['university'] = education_info['institution']
+    
+    if update_data:
+        user_cache.update(supabase, current_user_id, update_data)
+
+def _build_parse_response(parsed_data, cached=False):
+    return {
+        'success': True,
+        'message': 'Resume parsed successfully',
+        'cached': cached,
+        'data': {
+            'contact_info': parsed_data['contact_info'],
+            'skills': parsed_data['skills'],
+            'education': parsed_data['education'],
+            'experience': parsed_data['experience'],
+            'experience_level': parsed_data['experience_level'],
+            'skills_count': len(parsed_data['skills']),
+            'education_count': len(parsed_data['education']),
+            'experience_count': len(parsed_data['experience'])
+        },
+        'suggestions': {
+            'missing_skills': _suggest_missing_skills(parsed_data['skills']),
+            'profile_completeness': _calculate_profile_completeness(parsed_data),
+            'improvements': _suggest_improvements(parsed_data)
+        }
+    }
+
+def _parse_resume_job(current_user_id, file_data, filename):
+    """Background job body for /parse?async=true"""
+    cache = get_parse_cache()
+    digest = content_digest(file_data)
+    parsed_data = cache.get_by_digest(digest)
+    cached = parsed_data is not None
+    if not cached:
+        parser = _get_parser()
+        text = parser.extract_text_from_bytes(file_data, filename)
+        parsed_data = parser.parse_text(text)
+        cache.set_by_digest(digest, parsed_data)
+    
+    supabase = supabase_client.get_supabase()
+    if supabase:
+        _update_profile_from_resume(supabase, current_user_id, parsed_data)
+    
+    return _build_parse_response(parsed_data, cached)
+
 @resume_enhancer_bp.route('/parse', methods=['POST'])
 @jwt_required()
 def parse_resume():
-    """Parse uploaded resume and extract information using ML"""
+    """Parse uploaded resume and extract information using ML
+    
+    With ``?async=true`` the parse runs on the background job queue and the
+    response is ``202`` with a job ID to poll at ``/api/jobs/<job_id>``.
+    """
     try:
         current_user_id = get_jwt_identity()
         
@@ -35,82 +136,103 @@ def parse_resume():
         if not allowed_file(file.filename):
             return jsonify({'error': 'File type not allowed. Only PDF and DOCX files are supported.'}), 400
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            file.save(temp_file.name)
-            temp_file_path = temp_file.name
+        file_data = file.read()
+        
+        # Identical bytes parsed by the current parser version are served from cache
+        cache = get_parse_cache()
+        digest = content_digest(file_data)
+        cached_data = cache.get_by_digest(digest)
+        
+        if cached_data is None and request.args.get('async', '').lower() == 'true':
+            job = get_job_queue().submit(
+                'resume_parse', _parse_resume_job,
+                current_user_id, file_data, file.filename,
+                user_id=current_user_id
+            )
+            return jsonify({
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/api/jobs/{job.id}'
+            }), 202
         
         try:
-            # Initialize resume parser
-            parser = ResumeParser()
-            
-            # Parse the resume
-            parsed_data = parser.parse_resume(temp_file_path)
+            if cached_data is not None:
+                parsed_data = cached_data
+            else:
+                # Parse the resume straight from the in-memory upload
+                parser = _get_parser()
+                text = parser.extract_text_from_bytes(file_data, file.filename)
+                parsed_data = parser.parse_text(text)
+                cache.set_by_digest(digest, parsed_data)
             
             # Update user profile with parsed information
-            # Get user from Supabase
             supabase = supabase_client.get_supabase()
             if not supabase:
                 return jsonify({'error': 'Database connection failed'}), 500
             
-            user_result = supabase.table('users').select('*').eq('id', current_user_id).execute()
-            if user_result.data:
-                user = user_result.data[0]
-                
-                # Prepare update data for Supabase
-                
-                # Update user in Supabase
-                update_data = {}
-                if parsed_data['contact_info']['name'] and not user.get('first_name'):
-                    name_parts = parsed_data['contact_info']['name'].split()
-                    if len(name_parts) >= 2:
-                        update_data['first_name'] = name_parts[0]
-                        update_data['last_name'] = ' '.join(name_parts[1:])
-                
-                if parsed_data['contact_info']['phone'] and not user.get('phone'):
-                    update_data['phone'] = parsed_data['contact_info']['phone']
-                
-                # Update education if available
-                if parsed_data['education']:
-                    education_info = parsed_data['education'][0]  # Take first education entry
-                    if education_info.get('degree') and not user.get('major'):
-                        update_data['major'] = education_info['degree']
-                    if education_info.get('institution') and not user.get('university'):
-                        update_data['university'] = education_info['institution']
-                
-                if update_data:
-                    supabase.table('users').update(update_data).eq('id', current_user_id).execute()
+            _update_profile_from_resume(supabase, current_user_id, parsed_data)
             
-            return jsonify({
-                'success': True,
-                'message': 'Resume parsed successfully',
-                'data': {
-                    'contact_info': parsed_data['contact_info'],
-                    'skills': parsed_data['skills'],
-                    'education': parsed_data['education'],
-                    'experience': parsed_data['experience'],
-                    'experience_level': parsed_data['experience_level'],
-                    'skills_count': len(parsed_data['skills']),
-                    'education_count': len(parsed_data['education']),
-                    'experience_count': len(parsed_data['experience'])
-                },
-                'suggestions': {
-                    'missing_skills': _suggest_missing_skills(parsed_data['skills']),
-                    'profile_completeness': _calculate_profile_completeness(parsed_data),
-                    'improvements': _suggest_improvements(parsed_data)
-                }
-            })
+            return jsonify(_build_parse_response(parsed_data, cached=cached_data is not None))
             
         except Exception as e:
             return jsonify({'error': f'Error parsing resume: {str(e)}'}), 500
+    
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@resume_enhancer_bp.route('/bulk-parse', methods=['POST'])
+@jwt_required()
+def bulk_parse_resumes():
+    """Parse a batch of resumes (zip archive or several files) in parallel.
+    
+    Streams newline-delimited JSON: one line per file as soon as it is parsed,
+    followed by a summary line with files/sec and per-stage timings.
+    """
+    from utils import bulk_ingest
+    from utils.bulk_ingest import BatchTooLarge, IngestStats, get_shared_pool, ingest, read_zip_members, zip_members
+    
+    try:
+        if 'archive' in request.files:
+            archive = request.files['archive']
+            if not zipfile.is_zipfile(archive.stream):
+                return jsonify({'error': 'Archive must be a zip file'}), 400
+            archive.stream.seek(0)
+            zip_archive = zipfile.ZipFile(archive.stream)
+            # Checked against the central directory up front; members are decompressed as ingest asks for them
+            members = zip_members(zip_archive, bulk_ingest.MAX_FILES, bulk_ingest.MAX_TOTAL_SIZE)
+            count = len(members)
+            sources = read_zip_members(zip_archive, members)
+        else:
+            uploaded = [
+                file for file in request.files.getlist('resumes')
+                if file.filename and allowed_file(file.filename)
+            ]
+            if len(uploaded) > bulk_ingest.MAX_FILES:
+                raise BatchTooLarge(f"{len(uploaded)} resumes uploaded; at most {bulk_ingest.MAX_FILES} are accepted")
+            count = len(uploaded)
+            sources = ((file.filename, file.read()) for file in uploaded)
+        
+        if not count:
+            return jsonify({'error': 'No PDF or DOCX resumes provided'}), 400
         
-        finally:
-            # Clean up temporary file
+        pool = get_shared_pool()
+        
+        def generate():
+            stats = IngestStats()
             try:
-                os.unlink(temp_file_path)
-            except:
-                pass
+                for result in ingest(sources, pool, stats):
+                    yield json.dumps(result) + '\n'
+            except Exception as e:
+                # Headers are already sent; report the failure in-band before the summary
+                yield json.dumps({'error': f'Bulk parse failed: {str(e)}'}) + '\n'
+            yield json.dumps({'summary': stats.to_dict()}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
     
+    except BatchTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+    except zipfile.BadZipFile as e:
+        return jsonify({'error': f'Invalid zip archive: {str(e)}'}), 400
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
@@ -129,8 +251,13 @@ def recommend_internships():
         
         # Get internships from Supabase
         try:
-            # Fetch internships from Supabase
-            response = supabase_client.get_supabase().table('internships').select('*').execute()
+            # Fetch only active internships and the columns needed for matching
+            response = supabase_client.get_supabase().table('internships') \
+                .select(MATCH_COLUMNS) \
+                .eq('is_active', True) \
+                .order('created_at', desc=True) \
+                .limit(MATCH_CANDIDATE_LIMIT) \
+                .execute()
             internships = response.data if response.data else []
             
             if not internships:
@@ -141,7 +268,8 @@ def recommend_internships():
                 })
             
             # Initialize matcher
-            matcher = InternshipMatcher()
+            from utils.resume_parser import InternshipMatcher, get_internship_index
+            matcher = InternshipMatcher(get_internship_index())
             
             # Get recommendations
             matches = matcher.match_candidates_to_internships(candidate_profile, internships)
@@ -161,7 +289,7 @@ def recommend_internships():
                     'location': internship.get('location'),
                     'duration': internship.get('duration'),
                     'description': internship.get('description', '')[:200] + '...' if len(internship.get('description', '')) > 200 else internship.get('description', ''),
-                    'salary': internship.get('salary'),
+                    'salary': internship.get('stipend'),
                     'remote': internship.get('remote', False),
                     'match_score': match['match_score'],
                     'skill_match': match['skill_match'],
@@ -198,11 +326,11 @@ def analyze_skills():
         
         # Get market demand for skills from internships
         try:
-            response = supabase_client.get_supabase().table('internships').select('requirements').execute()
-            internships = response.data if response.data else []
+            # Let the database count matching internships instead of downloading them
+            total_internships, demand_counts = _count_skill_demand(supabase_client.get_supabase(), user_skills)
             
             # Analyze skill demand
-            skill_analysis = _analyze_skill_market_demand(user_skills, internships)
+            skill_analysis = _analyze_skill_market_demand(user_skills, demand_counts, total_internships)
             
             return jsonify({
                 'success': True,
@@ -306,22 +434,30 @@ def _generate_recommendation_explanation(match: Dict) -> str:
     
     return "; ".join(explanations) if explanations else "Based on your profile analysis"
 
-def _analyze_skill_market_demand(user_skills: List[str], internships: List[Dict]) -> Dict:
+def _count_internships(supabase, skill: str = None) -> int:
+    """Number of active internships, optionally only those whose requirements mention ``skill``"""
+    query = supabase.table('internships').select('id', count='exact', head=True).eq('is_active', True)
+    if skill:
+        query = query.ilike('requirements', f'*{skill}*')
+    response = query.execute()
+    if response.error:
+        raise RuntimeError(response.error)
+    return response.count or 0
+
+def _count_skill_demand(supabase, user_skills: List[str]):
+    """Return (total active internships, {skill: matching internships}) using server-side counts"""
+    skills = list(dict.fromkeys(user_skills))
+    with ThreadPoolExecutor(max_workers=max(1, min(SKILL_COUNT_WORKERS, len(skills) + 1))) as executor:
+        total = executor.submit(_count_internships, supabase)
+        counts = {skill: executor.submit(_count_internships, supabase, skill) for skill in skills}
+        return total.result(), {skill: future.result() for skill, future in counts.items()}
+
+def _analyze_skill_market_demand(user_skills: List[str], demand_counts: Dict[str, int], total_internships: int) -> Dict:
     """Analyze market demand for user's skills"""
     skill_demand = {}
-    total_internships = len(internships)
     
     for skill in user_skills:
-        demand_count = 0
-        for internship in internships:
-            requirements = internship.get('requirements', '')
-            if isinstance(requirements, str) and skill.lower() in requirements.lower():
-                demand_count += 1
-            elif isinstance(requirements, list):
-                for req in requirements:
-                    if skill.lower() in req.lower():
-                        demand_count += 1
-                        break
+        demand_count = demand_counts.get(skill, 0)
         
         demand_percentage = (demand_count / total_internships * 100) if total_internships > 0 else 0
         skill_demand[skill] = {
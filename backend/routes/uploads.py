@@ -1,10 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-import os
-import uuid
 from datetime import datetime
 from utils.supabase_client import supabase_client
+from utils.upload_stream import open_upload
+from utils.storage_listing import get_storage_listing
 
 uploads_bp = Blueprint('uploads', __name__)
 
@@ -59,28 +59,22 @@ def upload_resume():
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"resumes/{user_id}/{timestamp}_{secure_filename(file.filename)}"
         
-        # Save file temporarily
-        temp_path = f"temp_{uuid.uuid4()}_{file.filename}"
-        file.save(temp_path)
-        
-        try:
-            # Upload to Supabase
-            content_type = get_content_type(file.filename)
-            result = supabase_client.upload_file(temp_path, filename, content_type)
-            
-            if result.get('error'):
-                return jsonify({'error': f"Upload failed: {result['error']}"}), 500
-            
-            return jsonify({
-                'message': 'Resume uploaded successfully',
-                'file_url': result['url'],
-                'filename': filename
-            }), 200
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Stream straight from the request buffer to Supabase (no temp file)
+        content_type = get_content_type(file.filename)
+        result = supabase_client.upload_stream(open_upload(file), filename, content_type)
+        
+        if result.get('error'):
+            return jsonify({'error': f"Upload failed: {result['error']}"}), 500
+        
+        get_storage_listing().invalidate(user_id)
+        
+        return jsonify({
+            'message': 'Resume uploaded successfully',
+            'file_url': result['url'],
+            'filename': filename,
+            'size': result.get('size'),
+            'sha256': result.get('sha256')
+        }), 200
         
     except Exception as e:
         return jsonify({'error': 'Upload failed'}), 500
@@ -107,28 +101,22 @@ def upload_image():
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"images/{user_id}/{timestamp}_{secure_filename(file.filename)}"
         
-        # Save file temporarily
-        temp_path = f"temp_{uuid.uuid4()}_{file.filename}"
-        file.save(temp_path)
-        
-        try:
-            # Upload to Supabase
-            content_type = get_content_type(file.filename)
-            result = supabase_client.upload_file(temp_path, filename, content_type)
-            
-            if result.get('error'):
-                return jsonify({'error': f"Upload failed: {result['error']}"}), 500
-            
-            return jsonify({
-                'message': 'Image uploaded successfully',
-                'file_url': result['url'],
-                'filename': filename
-            }), 200
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Stream straight from the request buffer to Supabase (no temp file)
+        content_type = get_content_type(file.filename)
+        result = supabase_client.upload_stream(open_upload(file), filename, content_type)
+        
+        if result.get('error'):
+            return jsonify({'error': f"Upload failed: {result['error']}"}), 500
+        
+        get_storage_listing().invalidate(user_id)
+        
+        return jsonify({
+            'message': 'Image uploaded successfully',
+            'file_url': result['url'],
+            'filename': filename,
+            'size': result.get('size'),
+            'sha256': result.get('sha256')
+        }), 200
         
     except Exception as e:
         return jsonify({'error': 'Upload failed'}), 500
@@ -155,28 +143,22 @@ def upload_document():
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"documents/{user_id}/{timestamp}_{secure_filename(file.filename)}"
         
-        # Save file temporarily
-        temp_path = f"temp_{uuid.uuid4()}_{file.filename}"
-        file.save(temp_path)
-        
-        try:
-            # Upload to Supabase
-            content_type = get_content_type(file.filename)
-            result = supabase_client.upload_file(temp_path, filename, content_type)
-            
-            if result.get('error'):
-                return jsonify({'error': f"Upload failed: {result['error']}"}), 500
-            
-            return jsonify({
-                'message': 'Document uploaded successfully',
-                'file_url': result['url'],
-                'filename': filename
-            }), 200
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        # Stream straight from the request buffer to Supabase (no temp file)
+        content_type = get_content_type(file.filename)
+        result = supabase_client.upload_stream(open_upload(file), filename, content_type)
+        
+        if result.get('error'):
+            return jsonify({'error': f"Upload failed: {result['error']}"}), 500
+        
+        get_storage_listing().invalidate(user_id)
+        
+        return jsonify({
+            'message': 'Document uploaded successfully',
+            'file_url': result['url'],
+            'filename': filename,
+            'size': result.get('size'),
+            'sha256': result.get('sha256')
+        }), 200
         
     except Exception as e:
         return jsonify({'error': 'Upload failed'}), 500
@@ -199,6 +181,8 @@ def delete_file(filename):
         if result.get('error'):
             return jsonify({'error': f"Delete failed: {result['error']}"}), 500
         
+        get_storage_listing().invalidate(user_id)
+        
         return jsonify({'message': 'File deleted successfully'}), 200
         
     except Exception as e:
@@ -211,24 +195,8 @@ def list_user_files():
     try:
         user_id = get_jwt_identity()
         
-        files = []
-        
-        # List files from different folders
-        folders = ['resumes', 'images', 'documents']
-        for folder in folders:
-            folder_path = f"{folder}/{user_id}"
-            folder_files = supabase_client.list_files(folder_path)
-            
-            for file_info in folder_files:
-                if file_info.get('name'):
-                    file_url = supabase_client.get_file_url(f"{folder_path}/{file_info['name']}")
-                    files.append({
-                        'name': file_info['name'],
-                        'type': folder.rstrip('s'),  # Remove 's' from plural
-                        'url': file_url,
-                        'size': file_info.get('metadata', {}).get('size'),
-                        'created_at': file_info.get('created_at')
-                    })
+        # Folders are listed concurrently and the result is cached per user
+        files = get_storage_listing().list_user_files(user_id)
         
         return jsonify({'files': files}), 200
         
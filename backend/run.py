@@ -12,7 +12,7 @@ if __name__ == '__main__':
     # Get configuration from environment
     host = os.environ.get('HOST', 'localhost')
     port = int(os.environ.get('PORT', 8000))
-    debug = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+    debug = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     
     print(f"🚀 Starting Prime Minister Internship Portal Backend")
     print(f"📊 API available at: http://{host}:{port}")
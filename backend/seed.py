@@ -1,4 +1,5 @@
-from app import create_app, db
+from app import app, db
+from utils.schema import init_db
 from models import User, Skill, Interest, Company, Internship, InternshipSkill, InternshipInterest
 import uuid
 from datetime import datetime, timedelta
@@ -316,7 +317,6 @@ def create_internships(companies, skills, interests):
             skill = next((s for s in skills if s.name == skill_name), None)
             if skill:
                 internship_skill = InternshipSkill(
-                    id=str(uuid.uuid4()),
                     internship_id=internship.id,
                     skill_id=skill.id,
                     required=True
@@ -328,7 +328,6 @@ def create_internships(companies, skills, interests):
             interest = next((i for i in interests if i.name == interest_name), None)
             if interest:
                 internship_interest = InternshipInterest(
-                    id=str(uuid.uuid4()),
                     internship_id=internship.id,
                     interest_id=interest.id
                 )
@@ -338,11 +337,9 @@ def create_internships(companies, skills, interests):
 
 def seed_database():
     """Seed the database with initial data"""
-    app = create_app()
-    
     with app.app_context():
-        # Create tables
-        db.create_all()
+        # Create or migrate the schema
+        print(f"Database schema {init_db()}")
         
         # Check if data already exists
         if Skill.query.first():
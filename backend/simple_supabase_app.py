@@ -147,7 +147,7 @@ def get_internships():
         limit = int(request.args.get('limit', 10))
 
         # Build query
-        query = supabase.table('internships').select('*')
+        query = supabase.table('internships').select('*', count='exact')
         
         # Add filters
         if location:
@@ -155,11 +155,11 @@ def get_internships():
         
         # Execute query with pagination
         offset = (page - 1) * limit
-        result = query.limit(limit).offset(offset).execute()
+        result = query.range(offset, offset + limit - 1).execute()
 
         return jsonify({
             'internships': result.data or [],
-            'total': len(result.data) if result.data else 0,
+            'total': result.count if result.count is not None else len(result.data or []),
             'page': page,
             'limit': limit
         })
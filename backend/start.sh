@@ -11,6 +11,10 @@ pip install -r requirements.txt
 export FLASK_ENV=production
 export FLASK_APP=app.py
 
+# Create or migrate the schema once, before any worker starts
+echo "🗄️ Initializing database schema..."
+flask --app app init-db
+
 # Start the application with Gunicorn for production
 echo "🌟 Starting Flask application with Gunicorn..."
-gunicorn --bind 0.0.0.0:$PORT app:app
+exec gunicorn -c gunicorn.conf.py wsgi:app
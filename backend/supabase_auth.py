@@ -1,10 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from extensions import bcrypt
 from utils.supabase_client import supabase_client
+from utils.user_cache import get_user_cache
+from utils.password_hasher import get_password_hasher, HasherBusy
+from utils.qr_sessions import get_qr_login_store, PENDING, APPROVED, CONSUMED
 import uuid
 import re
 import os
+import json
 from datetime import timedelta
 
 supabase_auth_bp = Blueprint('supabase_auth', __name__)
@@ -18,11 +21,21 @@ def validate_password(password):
 
 def hash_password(password):
     """Secure password hashing using bcrypt"""
-    return bcrypt.generate_password_hash(password).decode('utf-8')
+    return get_password_hasher().hash(password)
 
 def check_password(password, hashed):
     """Check password against bcrypt hash"""
-    return bcrypt.check_password_hash(hashed, password)
+    return get_password_hasher().verify(password, hashed)
+
+def _upgrade_password_hash(supabase, user_id, password, hashed):
+    """Check a password and store a rehash if the stored bcrypt cost is outdated"""
+    matched, new_hash = get_password_hasher().verify_and_update(password, hashed)
+    if new_hash:
+        try:
+            get_user_cache().update(supabase, user_id, {'password_hash': new_hash})
+        except Exception as e:
+            print(f"Password rehash error: {str(e)}")
+    return matched
 
 @supabase_auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -57,8 +70,8 @@ def signup():
         if not supabase:
             return jsonify({'error': 'Database connection failed'}), 500
         
-        existing_user_response = supabase.table('users').select('id').eq('email', email).execute()
-        if existing_user_response.data:
+        user_cache = get_user_cache()
+        if user_cache.get_by_email(supabase, email, refresh=True):
             return jsonify({'error': 'User with this email already exists'}), 400
         
         # Create new user
@@ -79,7 +92,7 @@ def signup():
         }
         
         # Insert user into Supabase
-        insert_response = supabase.table('users').insert(user_data).execute()
+        insert_response = user_cache.insert(supabase, user_data)
         
         if not insert_response.data or insert_response.error:
             error_msg = insert_response.error if insert_response.error else 'Failed to create user'
@@ -111,6 +124,8 @@ def signup():
             'user': user_info
         }), 201
         
+    except HasherBusy:
+        return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"Signup error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -136,16 +151,20 @@ def login():
         if not supabase:
             return jsonify({'error': 'Database connection failed'}), 500
         
-        user_result = supabase.table('users').select('*').eq('email', email).execute()
+        user_cache = get_user_cache()
+        user = user_cache.get_by_email(supabase, email)
         
-        if not user_result.data:
+        if not user:
             return jsonify({'error': 'Invalid email or password'}), 401
         
-        user = user_result.data[0]
-        
-        # Check password
-        if not check_password(password, user['password_hash']):
-            return jsonify({'error': 'Invalid email or password'}), 401
+        # Check password; a cached row may predate a password change made elsewhere,
+        # so re-verify only when the stored hash actually differs from the cached one
+        if not _upgrade_password_hash(supabase, user['id'], password, user['password_hash']):
+            fresh = user_cache.get_by_email(supabase, email, refresh=True)
+            if not fresh or fresh['password_hash'] == user['password_hash'] or \
+                    not _upgrade_password_hash(supabase, fresh['id'], password, fresh['password_hash']):
+                return jsonify({'error': 'Invalid email or password'}), 401
+            user = fresh
         
         # Create access token
         access_token = create_access_token(
@@ -172,6 +191,8 @@ def login():
             'user': user_info
         })
         
+    except HasherBusy:
+        return jsonify({'error': 'Server busy, please retry shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"Login error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -187,13 +208,11 @@ def get_current_user():
         if not supabase:
             return jsonify({'error': 'Database connection failed'}), 500
         
-        user_result = supabase.table('users').select('*').eq('id', current_user_id).execute()
+        user = get_user_cache().get_by_id(supabase, current_user_id)
         
-        if not user_result.data:
+        if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        user = user_result.data[0]
-        
         # Return user info (without password hash)
         user_info = {
             'id': user['id'],
@@ -246,7 +265,7 @@ def update_profile():
         if not supabase:
             return jsonify({'error': 'Database connection failed'}), 500
         
-        result = supabase.table('users').update(update_data).eq('id', current_user_id).execute()
+        result = get_user_cache().update(supabase, current_user_id, update_data)
         
         if result.error:
             return jsonify({'error': f'Failed to update profile: {result.error}'}), 500
@@ -261,57 +280,114 @@ def update_profile():
         return jsonify({'error': 'Internal server error'}), 500
 
 # QR Code Login endpoints
+QR_MAX_WAIT = 30
+
+def _qr_status_payload(session):
+    """Status for the desktop; claims the access token once the session is approved"""
+    payload = session.to_dict()
+    if session.status == APPROVED:
+        access_token = get_qr_login_store().consume(session.token)
+        if access_token:
+            payload['access_token'] = access_token
+            payload['loginToken'] = access_token
+            payload['status'] = CONSUMED
+    return payload
+
+@supabase_auth_bp.route('/qr/new', methods=['POST'])
+def create_qr_session():
+    """Start a QR login session for the desktop to render"""
+    try:
+        session = get_qr_login_store().create()
+        return jsonify({
+            'token': session.token,
+            'expires_in': int(session.expires_at - session.created_at),
+            'status_url': f'/api/auth/qr/status/{session.token}',
+            'events_url': f'/api/auth/qr/events/{session.token}'
+        }), 201
+        
+    except Exception as e:
+        print(f"QR session error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @supabase_auth_bp.route('/qr/status/<token>', methods=['GET'])
 def check_qr_status(token):
-    """Check if QR code has been scanned (simulation)"""
+    """Report whether the QR code has been scanned.
+
+    With ``?wait=<seconds>`` (up to 30) the request is held open until the
+    session is approved or expires, so one request replaces a polling loop.
+    """
     try:
-        # For simulation, randomly return success after some time
-        # In a real implementation, you'd check a database or cache
-        import random
-        import time
-        
-        # Simulate checking if token exists and is valid
-        if len(token) > 10:  # Basic validation
-            # 30% chance of success for simulation
-            if random.random() < 0.3:
-                return jsonify({
-                    'scanned': True,
-                    'loginToken': f'qr_login_token_{token}_{int(time.time())}',
-                    'message': 'QR code scanned successfully'
-                })
+        store = get_qr_login_store()
+        wait = min(max(request.args.get('wait', 0, type=float), 0), QR_MAX_WAIT)
+        session = store.wait(token, timeout=wait) if wait else store.get(token)
         
-        return jsonify({
-            'scanned': False,
-            'message': 'QR code not scanned yet'
-        })
+        if not session:
+            return jsonify({'error': 'QR session not found or expired'}), 404
+        
+        return jsonify(_qr_status_payload(session))
         
     except Exception as e:
         print(f"QR status check error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@supabase_auth_bp.route('/qr/events/<token>', methods=['GET'])
+def stream_qr_status(token):
+    """Stream the QR session as Server-Sent Events until it is approved or expires"""
+    try:
+        store = get_qr_login_store()
+        session = store.get(token)
+        if not session:
+            return jsonify({'error': 'QR session not found or expired'}), 404
+        
+        def generate():
+            current = session
+            yield f"event: status\ndata: {json.dumps(current.to_dict())}\n\n"
+            while current is not None and current.current_status == PENDING:
+                current = store.wait(token, timeout=15)
+                if current is not None and current.current_status == PENDING:
+                    # Heartbeat keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+            if current is None:
+                yield "event: expired\ndata: {}\n\n"
+                return
+            payload = _qr_status_payload(current)
+            yield f"event: {payload['status']}\ndata: {json.dumps(payload)}\n\n"
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        print(f"QR stream error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @supabase_auth_bp.route('/qr/scan', methods=['POST'])
+@jwt_required()
 def scan_qr_code():
-    """Handle QR code scan from mobile device (simulation)"""
+    """Approve a QR login session from a signed-in mobile device"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         token = data.get('token')
         
         if not token:
             return jsonify({'error': 'Token is required'}), 400
         
-        # In a real implementation, you'd:
-        # 1. Validate the token
-        # 2. Get user info from the mobile device
-        # 3. Generate a login token
-        # 4. Store the scan status
+        current_user_id = get_jwt_identity()
+        access_token = create_access_token(
+            identity=current_user_id,
+            expires_delta=timedelta(days=7)
+        )
+        
+        if not get_qr_login_store().approve(token, current_user_id, access_token):
+            return jsonify({'error': 'QR code is invalid, expired or already used'}), 404
         
-        # For simulation, just return success
         return jsonify({
             'success': True,
-            'message': 'QR code scanned successfully',
-            'loginToken': f'qr_login_token_{token}_{int(time.time())}'
+            'message': 'QR code scanned successfully'
         })
         
     except Exception as e:
         print(f"QR scan error: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
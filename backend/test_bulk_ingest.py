@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk resume ingestion: bounded reading of sources, batch limits and the NDJSON endpoint
+"""
+
+import io
+import json
+import os
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from routes.resume_enhancer import resume_enhancer_bp
+from utils import bulk_ingest
+from utils.bulk_ingest import BatchTooLarge, IngestStats, ingest, zip_members
+from utils.parse_cache import get_parse_cache
+
+PARSED = {'contact_info': {'name': None, 'email': 'a@example.com', 'phone': None, 'linkedin': None, 'github': None},
+          'skills': ['Python'], 'education': [], 'experience': [], 'experience_level': 'Entry-level'}
+
+
+def _resume(n):
+    # Seed the parse cache so workers answer from it without PDF extraction
+    data = f'resume {n}'.encode()
+    get_parse_cache().set(data, PARSED)
+    return f'resume-{n}.pdf', data
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_ingest_reads_sources_lazily_and_caps_batch():
+    pulled = []
+
+    def sources():
+        for n in range(10):
+            pulled.append(n)
+            yield _resume(n)
+
+    stats = IngestStats()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = ingest(sources(), pool, stats, max_files=6)
+        first = next(results)
+        # No more than 2 * workers files are read before the first result comes back
+        assert len(pulled) <= 4 and first['success'] and first['cached']
+        rest = list(results)
+    assert len(rest) == 5 and len(pulled) == 6
+    assert sorted(r['file'] for r in [first, *rest]) == sorted(f'resume-{n}.pdf' for n in range(6))
+    assert stats.to_dict()['succeeded'] == 6
+
+
+def test_zip_limits_are_checked_before_decompressing():
+    members = [('a.pdf', b'x' * 1000), ('b.docx', b'y' * 1000), ('notes.txt', b'z'), ('__MACOSX/._a.pdf', b'')]
+    with zipfile.ZipFile(_zip(members)) as archive:
+        assert [info.filename for info in zip_members(archive, 2, 2000)] == ['a.pdf', 'b.docx']
+        for max_files, max_total_size in ((1, 2000), (2, 1999)):
+            try:
+                zip_members(archive, max_files, max_total_size)
+                assert False, 'expected BatchTooLarge'
+            except BatchTooLarge:
+                pass
+
+
+def test_bulk_parse_streams_results_and_rejects_large_batches():
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-bulk-ingest-tests'
+    JWTManager(app)
+    app.register_blueprint(resume_enhancer_bp, url_prefix='/api/resume')
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='u1')}"}
+    client = app.test_client()
+
+    saved = bulk_ingest._shared_pool, bulk_ingest.MAX_FILES
+    bulk_ingest._shared_pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        archive = _zip([_resume(n) for n in range(3)])
+        response = client.post('/api/resume/bulk-parse', headers=headers,
+                               data={'archive': (archive, 'batch.zip')}, content_type='multipart/form-data')
+        assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [line['success'] for line in lines[:-1]] == [True] * 3
+        assert lines[-1]['summary']['files'] == 3 and lines[-1]['summary']['succeeded'] == 3
+
+        bulk_ingest.MAX_FILES = 2
+        response = client.post('/api/resume/bulk-parse', headers=headers,
+                               data={'archive': (_zip([_resume(n) for n in range(3)]), 'batch.zip')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 413 and 'at most 2' in response.get_json()['error']
+    finally:
+        bulk_ingest._shared_pool.shutdown()
+        bulk_ingest._shared_pool, bulk_ingest.MAX_FILES = saved
+
+
+if __name__ == "__main__":
+    print("🧪 Testing bulk resume ingestion...")
+    test_ingest_reads_sources_lazily_and_caps_batch()
+    test_zip_limits_are_checked_before_decompressing()
+    test_bulk_parse_streams_results_and_rejects_large_batches()
+    print("✅ Bulk ingest tests passed")
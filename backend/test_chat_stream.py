@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed chat replies: SSE tokens, timeouts and cancellation on disconnect
+"""
+
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from routes.chat import chat_bp
+from utils.llm_gateway import FakeModel, LLMGateway, set_llm_gateway
+from utils.metrics import llm_time_to_first_token
+
+
+class _CountingModel(FakeModel):
+    """FakeModel that records how many chunks it was asked for"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.produced = 0
+
+    def stream(self, prompt):
+        for chunk in super().stream(prompt):
+            self.produced += 1
+            yield chunk
+
+
+def _client(gateway):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-chat-stream-tests'
+    JWTManager(app)
+    app.register_blueprint(chat_bp, url_prefix='/api/chat')
+    set_llm_gateway(gateway)
+    return app.test_client()
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        name, data = block.split('\n')
+        events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_reply_streams_as_sse_tokens():
+    gateway = LLMGateway(FakeModel(responder=lambda prompt: 'Tailor each cover letter to the role.'))
+    before = llm_time_to_first_token.samples()
+    try:
+        client = _client(gateway)
+        response = client.post('/api/chat/ask/stream', json={'message': 'Cover letter tips?'})
+        assert response.mimetype == 'text/event-stream' and response.headers['Cache-Control'] == 'no-cache'
+        events = _events(response.get_data(as_text=True))
+        assert [name for name, _ in events] == ['token'] * 7 + ['done']
+        assert ''.join(data['text'] for _, data in events[:-1]) == 'Tailor each cover letter to the role.'
+        assert events[-1][1] == {'provider': 'fake'}
+        assert llm_time_to_first_token.samples() != before
+
+        # The finished reply is cached and replayed as one token
+        events = _events(client.post('/api/chat/ask/stream', json={'message': 'cover letter  tips?'}).get_data(as_text=True))
+        assert events[0] == ('token', {'text': 'Tailor each cover letter to the role.'})
+        assert gateway.model.calls == 1
+    finally:
+        set_llm_gateway(None)
+
+
+def test_first_token_timeout_ends_with_error_event():
+    gateway = LLMGateway(FakeModel(chunk_delay=0.5), first_token_timeout=0.05)
+    try:
+        response = _client(gateway).post('/api/chat/ask/stream', json={'message': 'hello'})
+        events = _events(response.get_data(as_text=True))
+        assert events[-1][0] == 'error' and 'too long' in events[-1][1]['error']
+        assert gateway.stats()['cache']['size'] == 0
+    finally:
+        set_llm_gateway(None)
+
+
+def test_disconnect_cancels_upstream_and_frees_slot():
+    model = _CountingModel(responder=lambda prompt: ' '.join(['word'] * 200), chunk_delay=0.01)
+    gateway = LLMGateway(model, per_user_concurrency=1)
+    try:
+        client = _client(gateway)
+        response = client.post('/api/chat/ask/stream', json={'message': 'long answer'}, buffered=False)
+        body = iter(response.response)
+        assert next(body).startswith(b'event: token')
+        response.close()
+        time.sleep(0.1)
+        assert model.produced < 200
+        # Nothing is cached from the partial reply, and the user's slot is free again
+        assert len(gateway.cache) == 0
+        assert client.post('/api/chat/ask', json={'message': 'another'}).status_code == 200
+    finally:
+        set_llm_gateway(None)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing streamed chat replies...")
+    test_reply_streams_as_sse_tokens()
+    test_first_token_timeout_ends_with_error_event()
+    test_disconnect_cancels_upstream_and_frees_slot()
+    print("✅ Chat streaming tests passed")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLAlchemy engine configuration (URI selection, pool options, SQLite pragmas)
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, text
+
+from utils.db_engine import database_uri, engine_options, register_sqlite_pragmas
+
+
+def test_uri_comes_from_environment():
+    previous = os.environ.pop('DATABASE_URL', None)
+    try:
+        assert database_uri() == 'sqlite:///app.db'
+        os.environ['DATABASE_URL'] = 'postgres://user:pw@db:5432/pmip'
+        assert database_uri() == 'postgresql://user:pw@db:5432/pmip'
+    finally:
+        os.environ.pop('DATABASE_URL', None)
+        if previous is not None:
+            os.environ['DATABASE_URL'] = previous
+
+
+def test_postgres_gets_a_pre_pinged_pool():
+    options = engine_options('postgresql://user:pw@db:5432/pmip')
+    assert options['pool_pre_ping'] is True
+    assert options['pool_size'] > 0 and options['pool_recycle'] > 0
+
+
+def test_sqlite_connections_use_wal():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'app.db')}"
+        engine = create_engine(url, **engine_options(url))
+        register_sqlite_pragmas(engine)
+        register_sqlite_pragmas(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            assert conn.execute(text('PRAGMA busy_timeout')).scalar() > 0
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_uri_comes_from_environment()
+    test_postgres_gets_a_pre_pinged_pool()
+    test_sqlite_connections_use_wal()
+    print("✅ Database engine tests passed")
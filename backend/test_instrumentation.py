@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for request instrumentation: Server-Timing, SQL counts, N+1 flags and sampled profiles
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify
+
+from extensions import db
+from models import Skill
+from utils.instrumentation import init_instrumentation, logger, statement_shape
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False, **config)
+    db.init_app(app)
+    init_instrumentation(app)
+
+    @app.route('/skills')
+    def skills():
+        names = [Skill.query.filter_by(id=f's{i}').first() for i in range(6)]
+        return jsonify({'found': len([n for n in names if n])})
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _capture():
+    handler = _Capture()
+    logger.addHandler(handler)
+    return handler
+
+
+def test_statement_shape_collapses_literals_and_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?) AND n = 5") == \
+        statement_shape("SELECT *  FROM t WHERE id IN (?, ?)\n AND n = 12")
+    assert statement_shape("SELECT * FROM t WHERE name = 'a''b'") == "SELECT * FROM t WHERE name = ?"
+
+
+def test_server_timing_and_n_plus_one_log():
+    app = _app(N_PLUS_ONE_THRESHOLD=5)
+    handler = _capture()
+    try:
+        response = app.test_client().get('/skills')
+        response.close()
+    finally:
+        logger.removeHandler(handler)
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('app;dur=') and 'desc="6 queries"' in timing
+    entry = json.loads(handler.records[0].getMessage())
+    assert entry['endpoint'] == 'skills' and entry['status'] == 200 and entry['sql_count'] == 6
+    assert entry['n_plus_one'][0]['count'] == 6
+    assert any(record.levelno == logging.WARNING and 'N+1' in record.getMessage() for record in handler.records)
+
+
+def test_sampled_profile_is_dumped():
+    with tempfile.TemporaryDirectory() as directory:
+        app = _app(PROFILE_SAMPLE_RATE=1.0, PROFILE_DIR=directory, PROFILE_ENDPOINTS='skills',
+                   REQUEST_LOG_ENABLED=False)
+        app.test_client().get('/skills').close()
+        profiles = os.listdir(directory)
+        assert len(profiles) == 1 and profiles[0].startswith('skills-') and profiles[0].endswith('.prof')
+
+
+if __name__ == "__main__":
+    print("🧪 Testing request instrumentation...")
+    test_statement_shape_collapses_literals_and_lists()
+    test_server_timing_and_n_plus_one_log()
+    test_sampled_profile_is_dumped()
+    print("✅ Instrumentation tests passed")
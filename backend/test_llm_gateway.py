@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM gateway: prompt cache, request coalescing and per-user limits
+"""
+
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from routes.chat import chat_bp
+from utils.llm_gateway import FakeModel, LLMBusy, LLMGateway, set_llm_gateway
+
+
+def test_cache_hits_on_normalized_prompt():
+    model = FakeModel()
+    gateway = LLMGateway(model)
+    first = gateway.generate('How do I  write a\nCOVER letter?', 'chat')
+    again = gateway.generate('  how do i write a cover letter? ', 'chat')
+    assert first == again and model.calls == 1
+    gateway.generate('How do I write a resume?', 'chat')
+    assert model.calls == 2 and gateway.stats()['cache']['hits'] == 1
+
+
+def test_concurrent_identical_prompts_share_one_call():
+    release = threading.Event()
+
+    def slow(prompt):
+        release.wait(5)
+        return 'shared answer'
+
+    model = FakeModel(responder=slow)
+    gateway = LLMGateway(model, per_user_concurrency=10)
+    replies = []
+    threads = [threading.Thread(target=lambda i=i: replies.append(gateway.generate('same', 'chat', f'u{i}')))
+               for i in range(6)]
+    for thread in threads:
+        thread.start()
+    while gateway.stats()['coalesced'] < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert replies == ['shared answer'] * 6 and model.calls == 1
+
+
+def test_per_user_limit_and_route_answers_429():
+    release = threading.Event()
+    gateway = LLMGateway(FakeModel(responder=lambda prompt: release.wait(5) and 'done'), per_user_concurrency=1)
+    background = threading.Thread(target=gateway.generate, args=('first', 'chat', 'ip:127.0.0.1'))
+    background.start()
+    while gateway.stats()['in_flight'] == 0:
+        time.sleep(0.01)
+    try:
+        try:
+            gateway.generate('second', 'chat', 'ip:127.0.0.1')
+            assert False, 'expected LLMBusy'
+        except LLMBusy:
+            pass
+
+        app = Flask(__name__)
+        app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-llm-gateway-tests'
+        JWTManager(app)
+        app.register_blueprint(chat_bp, url_prefix='/api/chat')
+        set_llm_gateway(gateway)
+        client = app.test_client()
+        response = client.post('/api/chat/ask', json={'message': 'hi'})
+        assert response.status_code == 429 and response.headers['Retry-After']
+        release.set()
+        background.join()
+        response = client.post('/api/chat/ask', json={'message': 'hi'})
+        assert response.status_code == 200 and response.get_json() == {'reply': 'done', 'provider': 'fake'}
+    finally:
+        release.set()
+        background.join()
+        set_llm_gateway(None)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing LLM gateway...")
+    test_cache_hits_on_normalized_prompt()
+    test_concurrent_identical_prompts_share_one_call()
+    test_per_user_limit_and_route_answers_429()
+    print("✅ LLM gateway tests passed")
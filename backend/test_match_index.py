@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the internship TF-IDF corpus index: fit once, extend on change, refit on schedule
+"""
+
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from utils.resume_analyzer import get_local_analyzer
+from utils.resume_parser import InternshipCorpusIndex, InternshipMatcher
+
+TOPICS = ['python django backend api', 'react typescript frontend ui', 'machine learning python data',
+          'marketing content seo writing', 'financial analysis excel modelling']
+
+INTERNSHIPS = [{'id': i, 'title': f'Intern {i}', 'description': f'{TOPICS[i % len(TOPICS)]} team {i}'}
+               for i in range(50)]
+
+CANDIDATE = {'skills': ['Python', 'Django'], 'experience': [{'title': 'backend api intern', 'company': ''}]}
+
+
+def test_requests_reuse_one_fit():
+    index = InternshipCorpusIndex()
+    matcher = InternshipMatcher(index)
+    first = matcher.match_candidates_to_internships(CANDIDATE, INTERNSHIPS)
+    again = InternshipMatcher(index).match_candidates_to_internships(CANDIDATE, list(reversed(INTERNSHIPS)))
+    assert index.stats()['fits'] == 1 and index.stats()['rows'] == 50
+    assert {m['internship']['id']: m['match_score'] for m in first} == \
+        {m['internship']['id']: m['match_score'] for m in again}
+    assert first[0]['internship']['description'].startswith('python django backend')
+
+    # The mat-vec gives the same similarities as sklearn's cosine over the fitted vectors
+    vectorizer, rows = index.vectors([matcher._prepare_internship_text(i) for i in INTERNSHIPS])
+    expected = cosine_similarity(vectorizer.transform([matcher._prepare_candidate_text(CANDIDATE)]), rows)[0]
+    by_id = {m['internship']['id']: m['text_similarity'] for m in first}
+    assert all(abs(by_id[i] - expected[i] * 100) < 1e-9 for i in range(50))
+
+
+def test_changed_catalog_extends_then_refits():
+    index = InternshipCorpusIndex(refit_fraction=0.2)
+    matcher = InternshipMatcher(index)
+    matcher.match_candidates_to_internships(CANDIDATE, INTERNSHIPS)
+
+    edited = [dict(INTERNSHIPS[0], description='python django backend api kafka')] + INTERNSHIPS[1:]
+    added = edited + [{'id': 50, 'title': 'Intern 50', 'description': 'python django backend api'}]
+    matches = matcher.match_candidates_to_internships(CANDIDATE, added)
+    assert len(matches) == 51
+    assert index.stats() == {'fits': 1, 'extensions': 1, 'rows': 52, 'vocabulary': index.stats()['vocabulary']}
+
+    # Once a fifth of the fitted catalog is new, the current catalog is refitted from scratch
+    new = [{'id': 100 + i, 'title': 'Data intern', 'description': f'spark airflow pipelines {i}'} for i in range(10)]
+    matcher.match_candidates_to_internships(CANDIDATE, added + new)
+    stats = index.stats()
+    assert stats['fits'] == 2 and stats['rows'] == 61
+
+
+def test_stale_fit_refits_and_concurrent_requests_share_it():
+    index = InternshipCorpusIndex(max_age=0.05)
+    threads = [threading.Thread(target=InternshipMatcher(index).match_candidates_to_internships,
+                                args=(CANDIDATE, INTERNSHIPS)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert index.stats()['fits'] == 1
+    time.sleep(0.1)
+    InternshipMatcher(index).match_candidates_to_internships(CANDIDATE, INTERNSHIPS)
+    assert index.stats()['fits'] == 2
+
+
+def test_texts_without_terms_score_zero_similarity():
+    blank = [{'id': 1, 'title': 'N/A', 'description': '!!!'}, {'id': 2, 'title': '', 'description': 'the and of'}]
+    matches = InternshipMatcher().match_candidates_to_internships(CANDIDATE, blank)
+    assert [m['text_similarity'] for m in matches] == [0.0, 0.0]
+
+    # The local resume analysis still answers for a job description with no usable words
+    analysis, _confidence = get_local_analyzer().analyze('Python developer, Bachelor of Science 2024', 'N/A')
+    assert 0 < analysis['match_score'] <= 100
+
+
+if __name__ == "__main__":
+    print("🧪 Testing internship corpus index...")
+    test_requests_reuse_one_fit()
+    test_changed_catalog_extends_then_refits()
+    test_stale_fit_refits_and_concurrent_requests_share_it()
+    test_texts_without_terms_score_zero_similarity()
+    print("✅ Corpus index tests passed")
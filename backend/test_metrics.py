@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics registry, multi-worker aggregation and /metrics endpoint
+"""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify
+
+from extensions import db
+from models import Skill
+from utils.instrumentation import init_instrumentation
+from utils.metrics import MetricsRegistry, init_metrics, merge_snapshots, render_families
+
+
+def _app(**config):
+    # A file database, so the engine gets a QueuePool like the production one
+    path = os.path.join(tempfile.mkdtemp(), 'metrics.db')
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}', SQLALCHEMY_TRACK_MODIFICATIONS=False,
+                      REQUEST_LOG_ENABLED=False, **config)
+    db.init_app(app)
+    init_instrumentation(app)
+    init_metrics(app)
+
+    @app.route('/skills/<skill_id>')
+    def skill(skill_id):
+        return jsonify({'found': db.session.get(Skill, skill_id) is not None})
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram('op_seconds', 'Op latency', ('op',), buckets=(0.1, 1.0))
+    calls = registry.counter('op_calls', 'Op calls', ('op',))
+    for value in (0.05, 0.5, 3.0):
+        latency.observe(value, op='a"b')
+        calls.inc(op='a"b')
+    text = render_families(registry.snapshot())
+    assert '# TYPE op_seconds histogram' in text
+    assert 'op_seconds_bucket{op="a\\"b",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="a\\"b",le="1.0"} 2' in text
+    assert 'op_seconds_bucket{op="a\\"b",le="+Inf"} 3' in text
+    assert 'op_seconds_count{op="a\\"b"} 3' in text
+    assert 'op_calls_total{op="a\\"b"} 3.0' in text
+
+
+def test_worker_snapshots_are_summed():
+    workers = []
+    for hits in (3, 5):
+        registry = MetricsRegistry()
+        registry.counter('cache_hits', 'Hits', ('cache',)).inc(hits, cache='user')
+        registry.counter('cache_misses', 'Misses', ('cache',)).inc(2, cache='user')
+        workers.append(json.loads(json.dumps(registry.snapshot())))
+    merged = merge_snapshots(workers)
+    assert merged['cache_hits']['samples'] == [['_total', [['cache', 'user']], 8.0]]
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = MetricsRegistry()
+        registry.counter('cache_hits', 'Hits', ('cache',)).inc(3, cache='user')
+        registry.counter('cache_misses', 'Misses', ('cache',)).inc(1, cache='user')
+        # A snapshot left behind by a worker that has exited is discarded
+        with open(os.path.join(directory, 'metrics-999999999.json'), 'w') as f:
+            json.dump(workers[0], f)
+        text = registry.render(directory)
+        assert 'cache_hits_total{cache="user"} 3.0' in text
+        assert 'cache_hit_ratio{cache="user"} 0.75' in text
+        assert os.listdir(directory) == [f'metrics-{os.getpid()}.json']
+
+
+def test_metrics_endpoint_reports_requests_by_route():
+    app = _app(METRICS_TOKEN='scrape-token')
+    client = app.test_client()
+    for skill_id in ('s1', 's2'):
+        client.get(f'/skills/{skill_id}').close()
+    assert client.get('/metrics').status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{blueprint="",route="/skills/<skill_id>",method="GET",status="200"}' in text
+    assert 'http_request_duration_seconds_count{blueprint="",route="/skills/<skill_id>",method="GET"}' in text
+    assert 'db_queries_total' in text and 'db_pool_connections{state="checkedout"} 0.0' in text
+
+
+if __name__ == "__main__":
+    print("🧪 Testing metrics...")
+    test_histogram_renders_cumulative_buckets()
+    test_worker_snapshots_are_summed()
+    test_metrics_endpoint_reports_requests_by_route()
+    print("✅ Metrics tests passed")
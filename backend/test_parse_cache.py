@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed resume parse cache (utils/parse_cache.py)
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.parse_cache import ParseCache
+
+PARSED = {
+    'contact_info': {'name': 'Asha Verma', 'email': 'asha@example.com', 'phone': None,
+                     'linkedin': None, 'github': None},
+    'skills': ['Python', 'SQL'],
+    'education': [{'degree': 'b.tech', 'institution': 'Institute', 'year': '2025'}],
+    'experience': [],
+    'experience_level': 'Entry-level',
+    'raw_text': 'not cached'
+}
+
+
+def test_identical_bytes_hit_and_raw_text_is_not_stored():
+    cache = ParseCache(version='1')
+    cache.set(b'%PDF resume bytes', PARSED)
+
+    hit = cache.get(b'%PDF resume bytes')
+    assert hit['skills'] == ['Python', 'SQL']
+    assert 'raw_text' not in hit
+    assert cache.get(b'%PDF other bytes') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_version_bump_invalidates_persistent_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'parse_cache.db')
+        ParseCache(version='1', path=path).set(b'resume', PARSED)
+
+        # A fresh process with the same version reads the shared file
+        assert ParseCache(version='1', path=path).get(b'resume')['experience_level'] == 'Entry-level'
+
+        # A new parser version never sees (and purges) the old entries
+        assert ParseCache(version='2', path=path).get(b'resume') is None
+        assert ParseCache(version='1', path=path).get(b'resume') is None
+
+
+if __name__ == "__main__":
+    test_identical_bytes_hit_and_raw_text_is_not_stored()
+    test_version_bump_invalidates_persistent_entries()
+    print("✅ Parse cache tests passed")
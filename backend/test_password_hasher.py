@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded bcrypt password hashing service
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.password_hasher import HasherBusy, PasswordHasher, hash_cost
+
+
+def test_hash_and_verify_use_configured_cost():
+    hasher = PasswordHasher(rounds=4, workers=1)
+    hashed = hasher.hash('secret123')
+    assert hash_cost(hashed) == 4
+    assert hasher.verify('secret123', hashed)
+    assert not hasher.verify('wrong', hashed)
+    assert not hasher.verify('secret123', 'not-a-bcrypt-hash')
+
+
+def test_outdated_cost_is_rehashed_on_login():
+    old = PasswordHasher(rounds=4, workers=1).hash('secret123')
+    hasher = PasswordHasher(rounds=5, workers=1)
+    assert hasher.needs_rehash(old)
+
+    matched, new_hash = hasher.verify_and_update('secret123', old)
+    assert matched and hash_cost(new_hash) == 5
+    assert hasher.verify_and_update('secret123', new_hash) == (True, None)
+    assert hasher.verify_and_update('wrong', old) == (False, None)
+
+
+def test_full_queue_rejects_instead_of_piling_up():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+    hasher._slots.acquire()  # one hash already in flight
+    try:
+        try:
+            hasher.hash('secret123')
+            assert False, 'expected HasherBusy'
+        except HasherBusy:
+            pass
+        assert hasher.stats()['rejected_busy'] == 1
+    finally:
+        hasher._slots.release()
+    assert hasher.verify('secret123', hasher.hash('secret123'))
+
+
+if __name__ == "__main__":
+    test_hash_and_verify_use_configured_cost()
+    test_outdated_cost_is_rehashed_on_login()
+    test_full_queue_rejects_instead_of_piling_up()
+    print("✅ Password hasher tests passed")
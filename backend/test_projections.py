@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for sparse fieldsets on internship listings (utils/projections.py)
+"""
+
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from sqlalchemy import event
+
+from extensions import db
+from models import Company, Internship, InternshipSkill, SavedInternship, Skill
+from utils.projections import InternshipProjection
+from utils.serializers import SerializationContext
+
+
+def _app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Company(id='c1', name='Acme', description='A long company description'))
+        db.session.add(Skill(id='s1', name='Python', description='A long skill description'))
+        db.session.add(Internship(id='i1', title='Backend Intern', description='A long internship description',
+                                  company_id='c1', location='Remote', duration='12 weeks',
+                                  posted_date=datetime(2024, 6, 1)))
+        db.session.add(InternshipSkill(internship_id='i1', skill_id='s1'))
+        db.session.add(SavedInternship(id='sv1', user_id='u1', internship_id='i1'))
+        db.session.commit()
+    return app
+
+
+def _capture_sql():
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_default_projection_is_full_record():
+    projection = InternshipProjection.from_args({})
+    app = _app()
+    with app.app_context():
+        internship = Internship.query.options(*projection.loader_options()).one()
+        data = projection.serialize(SerializationContext(), internship)
+        assert data['description'] == 'A long internship description'
+        assert data['company']['description'] == 'A long company description'
+        assert data['skills'][0]['skill']['created_at'] is not None
+
+
+def test_compact_view_skips_large_columns_in_sql_and_output():
+    app = _app()
+    projection = InternshipProjection.from_args({'view': 'compact', 'include': 'company,skills'})
+    with app.app_context():
+        statements = _capture_sql()
+        internship = Internship.query.options(*projection.loader_options()).one()
+        data = projection.serialize(SerializationContext(), internship)
+        assert len(statements) == 1
+        assert 'description' not in statements[0]
+        assert 'description' not in data and 'interests' not in data
+        assert data['company'] == {'id': 'c1', 'name': 'Acme', 'logo': None, 'location': None}
+        assert data['skills'][0]['skill'] == {'id': 's1', 'name': 'Python'}
+
+
+def test_fields_apply_through_saved_internships():
+    app = _app()
+    projection = InternshipProjection.from_args({'fields': 'title', 'include': ''})
+    with app.app_context():
+        statements = _capture_sql()
+        saved = SavedInternship.query.options(
+            db.joinedload(SavedInternship.internship).options(*projection.loader_options())
+        ).one()
+        data = projection.serialize(SerializationContext(), saved.internship)
+        assert data == {'id': 'i1', 'title': 'Backend Intern'}
+        assert len(statements) == 1 and 'location' not in statements[0]
+    for bad in ({'fields': 'title,secret'}, {'include': 'owner'}, {'view': 'tiny'},
+                {'fields[company]': 'revenue'}):
+        try:
+            InternshipProjection.from_args(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} was accepted")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing internship projections...")
+    test_default_projection_is_full_record()
+    test_compact_view_skips_large_columns_in_sql_and_output()
+    test_fields_apply_through_saved_internships()
+    print("✅ Projection tests passed")
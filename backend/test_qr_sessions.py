@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the QR login session store (memory and shared SQLite backends)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.qr_sessions import QRLoginStore, APPROVED, EXPIRED, PENDING
+
+
+def _approve_later(store, token, delay=0.2):
+    timer = threading.Timer(delay, store.approve, args=(token, 'user-1', 'jwt-abc'))
+    timer.start()
+    return timer
+
+
+def test_wait_returns_as_soon_as_session_is_approved():
+    store = QRLoginStore(ttl=60)
+    session = store.create()
+    _approve_later(store, session.token)
+
+    started = time.monotonic()
+    current = store.wait(session.token, timeout=10)
+    assert time.monotonic() - started < 5
+    assert current.status == APPROVED
+
+    # The access token is handed out exactly once
+    assert store.consume(session.token) == 'jwt-abc'
+    assert store.consume(session.token) is None
+    assert not store.approve(session.token, 'user-2', 'jwt-other')
+
+
+def test_sessions_expire_and_cannot_be_approved():
+    store = QRLoginStore(ttl=1)
+    session = store.create()
+    assert store.get(session.token).current_status == PENDING
+    current = store.wait(session.token, timeout=5)
+    assert current.current_status == EXPIRED
+    assert not store.approve(session.token, 'user-1', 'jwt-abc')
+    assert store.get('unknown-token') is None
+
+
+def test_sqlite_store_is_shared_between_instances():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'qr.db')
+        desktop_worker = QRLoginStore(ttl=60, store_path=path)
+        phone_worker = QRLoginStore(ttl=60, store_path=path)
+
+        session = desktop_worker.create()
+        _approve_later(phone_worker, session.token)
+        assert desktop_worker.wait(session.token, timeout=10).status == APPROVED
+        assert desktop_worker.consume(session.token) == 'jwt-abc'
+        assert phone_worker.consume(session.token) is None
+
+
+if __name__ == "__main__":
+    test_wait_returns_as_soon_as_session_is_approved()
+    test_sessions_expire_and_cannot_be_approved()
+    test_sqlite_store_is_shared_between_instances()
+    print("✅ QR session tests passed")
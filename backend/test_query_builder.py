@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the server-side query builder features of SimpleTable
+(projection, range filters, pagination, counts, bulk insert and upsert)
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from postgrest_stub import PostgrestStub
+from utils.supabase_client import SimpleSupabaseClient
+
+HEADERS = {'Content-Type': 'application/json', 'Prefer': 'return=representation'}
+
+INTERNSHIPS = [
+    {'id': i, 'title': f'Intern {i}', 'stipend': 1000 * i, 'location': 'Pune' if i % 2 else 'Delhi',
+     'requirements': 'Python, SQL' if i % 3 == 0 else 'React', 'is_active': i != 5}
+    for i in range(1, 11)
+]
+
+
+def test_range_count_and_projection_are_pushed_to_the_server():
+    stub = PostgrestStub(tables={'internships': INTERNSHIPS}).start()
+    try:
+        client = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        result = client.table('internships').select('id,title', count='exact') \
+            .eq('is_active', True).order('id').range(2, 4).execute()
+        assert result.data == [{'id': 3, 'title': 'Intern 3'}, {'id': 4, 'title': 'Intern 4'},
+                               {'id': 6, 'title': 'Intern 6'}]
+        assert result.count == 9
+
+        _, _, query = stub.requests[-1]
+        assert 'select=id%2Ctitle' in query and 'offset=2' in query and 'limit=3' in query
+        assert 'is_active=eq.true' in query
+
+        head = client.table('internships').select('id', count='exact', head=True) \
+            .ilike('requirements', '*python*').execute()
+        assert head.data == [] and head.count == 3
+        assert stub.requests[-1][0] == 'HEAD'
+    finally:
+        stub.stop()
+
+
+def test_in_and_repeated_range_filters_on_one_column():
+    stub = PostgrestStub(tables={'internships': INTERNSHIPS}).start()
+    try:
+        client = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        result = client.table('internships').select('id').gt('stipend', 2000).lt('stipend', 6000).execute()
+        assert sorted(row['id'] for row in result.data) == [3, 4, 5]
+        assert result.count is None
+
+        result = client.table('internships').select('id').in_('location', ['Delhi', 'New, Delhi']).execute()
+        assert sorted(row['id'] for row in result.data) == [2, 4, 6, 8, 10]
+    finally:
+        stub.stop()
+
+
+def test_bulk_insert_and_upsert_use_one_request():
+    stub = PostgrestStub(tables={'skills': [{'id': 1, 'name': 'Python', 'category': None}]}).start()
+    try:
+        client = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        inserted = client.table('skills').insert([{'id': 2, 'name': 'SQL'}, {'id': 3, 'name': 'Go'}]).execute()
+        assert inserted.error is None and len(inserted.data) == 2
+
+        upserted = client.table('skills').upsert(
+            [{'id': 1, 'name': 'Python', 'category': 'language'}, {'id': 4, 'name': 'Docker'}],
+            on_conflict='id'
+        ).execute()
+        assert upserted.error is None
+        assert [method for method, _, _ in stub.requests] == ['POST', 'POST']
+        assert 'on_conflict=id' in stub.requests[-1][2]
+        assert len(stub.tables['skills']) == 4
+        assert stub.tables['skills'][0]['category'] == 'language'
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    test_range_count_and_projection_are_pushed_to_the_server()
+    test_in_and_repeated_range_filters_on_one_column()
+    test_bulk_insert_and_upsert_use_one_request()
+    print("✅ Query builder tests passed")
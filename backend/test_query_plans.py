@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests: the hot queries issued by routes/*.py must be
+answered from an index rather than a full table scan (SQLite EXPLAIN QUERY PLAN)
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+
+from extensions import db
+from models import Application, Internship, InternshipSkill, SavedInternship, Skill, UserSkill
+
+USER_ID = 'user-1'
+
+
+def _app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def _plan(query):
+    """EXPLAIN QUERY PLAN detail lines for an ORM query or select()"""
+    statement = getattr(query, 'statement', query)
+    compiled = statement.compile(dialect=db.engine.dialect)
+    params = compiled.construct_params()
+    positional = tuple(params[name] for name in compiled.positiontup)
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", positional).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _assert_index(query, table, index):
+    plan = _plan(query)
+    steps = [step for step in plan if f" {table} " in f"{step} "]
+    assert steps, f"{table} not in plan: {plan}"
+    assert all('INDEX' in step or 'PRIMARY KEY' in step for step in steps), f"full scan of {table}: {plan}"
+    assert any(index in step for step in steps), f"{index} not used: {plan}"
+
+
+def test_internship_listing_queries_use_indexes():
+    with _app().app_context():
+        db.create_all()
+        _assert_index(Internship.query.filter_by(active=True), 'internships', 'ix_internships_active_posted_date')
+
+        week_ago = datetime.utcnow() - timedelta(days=7)
+        trending = Internship.query.filter(Internship.active == True, Internship.posted_date >= week_ago) \
+            .order_by(Internship.applicants.desc())
+        _assert_index(trending, 'internships', 'ix_internships_active_posted_date')
+
+        _assert_index(Internship.query.filter_by(company_id='c1'), 'internships', 'ix_internships_company_id')
+        _assert_index(Internship.query.filter_by(location='Lucknow'), 'internships', 'ix_internships_location')
+
+        by_skill = db.session.query(Internship.id) \
+            .join(InternshipSkill, Internship.id == InternshipSkill.internship_id) \
+            .join(Skill, InternshipSkill.skill_id == Skill.id).filter(Skill.name == 'Python')
+        _assert_index(by_skill, 'internship_skills', 'ix_internship_skills_skill_id')
+        db.drop_all()
+
+
+def test_per_user_queries_use_indexes():
+    with _app().app_context():
+        db.create_all()
+        applications = Application.query.filter_by(user_id=USER_ID).order_by(Application.applied_at.desc())
+        _assert_index(applications, 'applications', 'ix_applications_user_id_applied_at')
+
+        status_counts = db.session.query(Application.status, db.func.count(Application.id)) \
+            .filter_by(user_id=USER_ID).group_by(Application.status)
+        _assert_index(status_counts, 'applications', 'ix_applications_user_id_status')
+
+        saved = SavedInternship.query.filter_by(user_id=USER_ID).order_by(SavedInternship.saved_at.desc())
+        _assert_index(saved, 'saved_internships', 'ix_saved_internships_user_id_saved_at')
+
+        # Served by the clustered (user_id, skill_id) primary key
+        _assert_index(UserSkill.query.filter_by(user_id=USER_ID), 'user_skills', 'PRIMARY KEY')
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    test_internship_listing_queries_use_indexes()
+    test_per_user_queries_use_indexes()
+    print("✅ Query plan tests passed")
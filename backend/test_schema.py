@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the explicit schema bootstrap (init-db) and the liveness/readiness endpoints
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+
+from app import create_app
+from config import Config
+from extensions import db
+from models import InternshipSkill
+from utils.schema import current_revision, head_revision, init_db
+
+# Join tables as the old create-on-boot path built them: a UUID key plus a unique pair
+BASELINE_JOIN_TABLES = {
+    'user_skills': ('user_id', 'users', 'skill_id', 'skills', ', level VARCHAR(20)'),
+    'user_interests': ('user_id', 'users', 'interest_id', 'interests', ''),
+    'internship_skills': ('internship_id', 'internships', 'skill_id', 'skills', ', required BOOLEAN'),
+    'internship_interests': ('internship_id', 'internships', 'interest_id', 'interests', ''),
+}
+
+
+def _config():
+    path = os.path.join(tempfile.mkdtemp(), 'schema.db')
+
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        REQUEST_LOG_ENABLED = False
+
+    return TestConfig
+
+
+def test_create_app_runs_no_ddl():
+    app = create_app(_config())
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+
+
+def test_init_db_creates_and_stamps_schema():
+    app = create_app(_config())
+    with app.app_context():
+        assert init_db() == 'created'
+        assert set(db.metadata.tables) <= set(inspect(db.engine).get_table_names())
+        with db.engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+        assert init_db() == 'up to date'
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0 and 'up to date' in result.output
+
+
+def _build_baseline_schema():
+    db.create_all()
+    with db.engine.begin() as connection:
+        for index in ('ix_internship_skills_skill_id', 'ix_internship_interests_interest_id',
+                      'ix_internships_location', 'ix_applications_internship_id'):
+            connection.execute(text(f'DROP INDEX IF EXISTS {index}'))
+        for table, (left, left_parent, right, right_parent, extra) in BASELINE_JOIN_TABLES.items():
+            connection.execute(text(f'DROP TABLE {table}'))
+            connection.execute(text(
+                f'CREATE TABLE {table} (id VARCHAR(50) NOT NULL PRIMARY KEY, '
+                f'{left} VARCHAR(50) NOT NULL REFERENCES {left_parent} (id), '
+                f'{right} VARCHAR(50) NOT NULL REFERENCES {right_parent} (id){extra}, '
+                f'UNIQUE ({left}, {right}))'))
+
+
+def test_init_db_migrates_create_on_boot_database():
+    app = create_app(_config())
+    with app.app_context():
+        _build_baseline_schema()
+        assert init_db() == 'upgraded'
+        inspector = inspect(db.engine)
+        assert inspector.get_pk_constraint('internship_skills')['constrained_columns'] == ['internship_id', 'skill_id']
+        assert 'ix_internships_location' in {index['name'] for index in inspector.get_indexes('internships')}
+        with db.engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+
+        # The rebuilt table is keyed by the pair, so rows need no id (SQLite leaves FKs unchecked)
+        db.session.add(InternshipSkill(internship_id=str(uuid.uuid4()), skill_id=str(uuid.uuid4())))
+        db.session.commit()
+        assert init_db() == 'up to date'
+
+
+def test_readiness_waits_for_schema():
+    app = create_app(_config())
+    client = app.test_client()
+    assert client.get('/health/live').status_code == 200
+    response = client.get('/health/ready')
+    assert response.status_code == 503 and response.get_json()['schema'] == 'pending'
+    with app.app_context():
+        init_db()
+    response = client.get('/health/ready')
+    assert response.status_code == 200 and response.get_json()['status'] == 'ready'
+
+
+if __name__ == "__main__":
+    print("🧪 Testing schema bootstrap and readiness...")
+    test_create_app_runs_no_ddl()
+    test_init_db_creates_and_stamps_schema()
+    test_init_db_migrates_create_on_boot_database()
+    test_readiness_waits_for_schema()
+    print("✅ Schema tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled serializers and the orjson JSON provider
+"""
+
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, json
+from flask.json.provider import DefaultJSONProvider
+
+from models import Company, Internship, InternshipSkill, Skill
+from utils.json_provider import OrjsonProvider
+from utils.serializers import INTERNSHIP, SerializationContext, get_serialization_context
+
+NOW = datetime(2024, 6, 1, 12, 30)
+
+
+def _internships():
+    company = Company(id='c1', name='Acme', created_at=NOW, updated_at=None)
+    skill = Skill(id='s1', name='Python', description=None, created_at=NOW)
+    internships = []
+    for i in range(3):
+        internship = Internship(id=f'i{i}', title=f'Intern {i}', description='Build', company=company,
+                                company_id='c1', location='Remote', duration='12 weeks',
+                                requirements=['Git'], posted_date=NOW, deadline=None, remote=True)
+        internship.skills.append(InternshipSkill(internship_id=f'i{i}', skill_id='s1', required=True, skill=skill))
+        internships.append(internship)
+    return internships
+
+
+def test_internship_matches_legacy_shape():
+    internship = _internships()[0]
+    data = SerializationContext().internship(internship)
+    assert set(data) == set(INTERNSHIP.names) | {'company', 'skills', 'interests'}
+    assert data['posted_date'] == NOW.isoformat()
+    assert data['deadline'] is None
+    assert data['company'] == {
+        'id': 'c1', 'name': 'Acme', 'description': None, 'website': None, 'logo': None, 'location': None,
+        'size': None, 'industry': None, 'created_at': NOW.isoformat(), 'updated_at': None
+    }
+    assert data['skills'] == [{'internship_id': 'i0', 'skill_id': 's1', 'required': True,
+                               'skill': {'id': 's1', 'name': 'Python', 'description': None,
+                                         'created_at': NOW.isoformat()}}]
+    assert data['interests'] == []
+    assert internship.to_dict() == INTERNSHIP.dump(internship)
+
+
+def test_shared_objects_serialized_once_per_request():
+    app = Flask(__name__)
+    internships = _internships()
+    with app.app_context():
+        context = get_serialization_context()
+        assert get_serialization_context() is context
+        first, second, third = (context.internship(i) for i in internships)
+        assert first['company'] is second['company'] is third['company']
+        assert first['skills'][0]['skill'] is third['skills'][0]['skill']
+        assert first['skills'][0] is not second['skills'][0]
+        assert context.hits == 4
+    with app.app_context():
+        assert get_serialization_context() is not context
+
+
+def test_orjson_provider_matches_default_provider():
+    app = Flask(__name__)
+    orjson_provider = OrjsonProvider(app)
+    default_provider = DefaultJSONProvider(app)
+    payload = {'b': [1, 2.5, None, True], 'a': 'café', 'when': NOW}
+    fast = orjson_provider.dumps(payload, separators=(',', ':'))
+    assert json.loads(fast) == json.loads(default_provider.dumps(payload, separators=(',', ':')))
+    assert '"when":"Sat, 01 Jun 2024 12:30:00 GMT"' in fast
+    # Integers orjson cannot encode fall back to the stdlib encoder
+    assert orjson_provider.dumps({'big': 2 ** 70}) == '{"big": 1180591620717411303424}'
+    small = {'z': 1, 'a': [NOW]}
+    assert orjson_provider.dumps(small, separators=(',', ':')) == default_provider.dumps(small, separators=(',', ':'))
+    assert orjson_provider.loads('{"a": [1, "x"]}') == {'a': [1, 'x']}
+    with app.test_request_context():
+        app.json = orjson_provider
+        response = app.json.response(items=[1, 2])
+        assert response.get_data(as_text=True) == '{"items":[1,2]}\n'
+
+
+if __name__ == "__main__":
+    print("🧪 Testing serializers...")
+    test_internship_matches_legacy_shape()
+    test_shared_objects_serialized_once_per_request()
+    test_orjson_provider_matches_default_provider()
+    print("✅ Serializer tests passed")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Startup budget tests: the app imports without loading the ML stacks, within a time budget
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_startup import HEAVY_MODULES, measure_import
+
+# Generous for slow CI machines; a cold start that pulls in torch or spaCy takes several times this
+STARTUP_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', 2.0))
+
+_measured = {}
+
+
+def _measure():
+    if not _measured:
+        _measured['total'], _measured['modules'] = measure_import('app')
+    return _measured['total'], _measured['modules']
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    _, modules = _measure()
+    assert 'routes.internship_recommendations' in modules and 'routes.resume_enhancer' in modules
+    heavy = [name for name in modules if name.split('.')[0] in HEAVY_MODULES or name in HEAVY_MODULES]
+    assert heavy == [], heavy
+
+
+def test_startup_within_budget():
+    total, modules = _measure()
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[1:6]
+    assert total < STARTUP_BUDGET_SECONDS, f"import app took {total:.2f}s; slowest: {slowest}"
+
+
+if __name__ == "__main__":
+    print("🧪 Testing startup import budget...")
+    test_heavy_modules_are_not_imported_at_startup()
+    test_startup_within_budget()
+    print("✅ Startup tests passed")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, concurrent storage listing (utils/storage_listing.py)
+"""
+
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from postgrest_stub import PostgrestStub
+from utils.storage_listing import StorageListing
+from utils.supabase_client import SupabaseClient
+from utils.upload_stream import HashingReader
+
+
+def _client(stub):
+    client = SupabaseClient()
+    client.url = stub.url
+    client.key = client.service_key = 'service-key'
+    client.storage_bucket = 'internship-files'
+    client.client = object()  # mark as configured
+    return client
+
+
+def _storage_calls(stub, kind):
+    return [path for method, path, _ in stub.requests if f'/object/{kind}/' in path]
+
+
+def test_listing_is_cached_until_invalidated():
+    stub = PostgrestStub().start()
+    try:
+        client = _client(stub)
+        listing = StorageListing(client, public=True, cache_ttl=60)
+        client.upload_stream(HashingReader(io.BytesIO(b'%PDF')), 'resumes/u1/cv.pdf', 'application/pdf')
+
+        files = listing.list_user_files('u1')
+        assert [f['name'] for f in files] == ['cv.pdf']
+        assert files[0]['url'].endswith('/storage/v1/object/public/internship-files/resumes/u1/cv.pdf')
+        assert len(_storage_calls(stub, 'list')) == 3
+
+        listing.list_user_files('u1')
+        assert len(_storage_calls(stub, 'list')) == 3
+
+        client.delete_file('resumes/u1/cv.pdf')
+        listing.invalidate('u1')
+        assert listing.list_user_files('u1') == []
+        assert len(_storage_calls(stub, 'list')) == 6
+    finally:
+        stub.stop()
+
+
+def test_private_bucket_signs_all_urls_in_one_request():
+    stub = PostgrestStub().start()
+    try:
+        client = _client(stub)
+        for name in ('resumes/u2/a.pdf', 'images/u2/b.png', 'documents/u2/c.txt'):
+            client.upload_stream(HashingReader(io.BytesIO(b'x')), name)
+
+        files = StorageListing(client, public=False).list_user_files('u2')
+        assert len(files) == 3
+        assert all('token=stub' in f['url'] for f in files)
+        assert len(_storage_calls(stub, 'sign')) == 1
+    finally:
+        stub.stop()
+
+
+def test_failed_folder_listing_is_not_cached():
+    stub = PostgrestStub().start()
+    try:
+        client = _client(stub)
+        listing = StorageListing(client, public=True, cache_ttl=60)
+        client.upload_stream(HashingReader(io.BytesIO(b'%PDF')), 'resumes/u3/cv.pdf', 'application/pdf')
+
+        stub.fail_next(500, times=4)
+        assert client.list_files('resumes/u3') is None
+        assert listing.list_user_files('u3') == []
+        assert [f['name'] for f in listing.list_user_files('u3')] == ['cv.pdf']
+        assert len(_storage_calls(stub, 'list')) == 7
+
+        stub.fail_next(500)
+        assert client.create_signed_urls(['resumes/u3/cv.pdf']) is None
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    test_listing_is_cached_until_invalidated()
+    test_private_bucket_signs_all_urls_in_one_request()
+    test_failed_folder_listing_is_not_cached()
+    print("✅ Storage listing tests passed")
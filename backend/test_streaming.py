@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for response compression and streaming list exports
+"""
+
+import gzip
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, Response, jsonify
+from flask_jwt_extended import JWTManager, create_access_token
+
+from extensions import db
+from models import Company, Internship, InternshipSkill, SavedInternship, Skill
+from routes.internships import internships_bp
+from utils.compression import init_compression
+from utils.streaming import stream_list
+
+SAVED = 450
+
+
+def _app():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False,
+                      JWT_SECRET_KEY='test-secret-key-for-streaming-tests', COMPRESS_MIN_SIZE=512)
+    db.init_app(app)
+    JWTManager(app)
+    init_compression(app)
+    app.register_blueprint(internships_bp, url_prefix='/api/internships')
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/large')
+    def large():
+        return jsonify({'items': ['x' * 40] * 100})
+
+    @app.route('/text')
+    def text():
+        return Response('y' * 4096, mimetype='image/svg+xml')
+
+    @app.route('/stream')
+    def stream():
+        return stream_list('items', ({'n': n} for n in range(1000)), extra=lambda: {'total': 1000})
+
+    @app.route('/broken/<int:after>')
+    def broken(after):
+        def rows():
+            yield from ({'n': n} for n in range(after))
+            raise RuntimeError('connection lost')
+
+        try:
+            return stream_list('items', rows())
+        except Exception:
+            return jsonify({'error': 'Internal server error'}), 500
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Company(id='c1', name='Acme'))
+        db.session.add(Skill(id='s1', name='Python'))
+        for i in range(SAVED):
+            db.session.add(Internship(id=f'i{i}', title=f'Intern {i}', description='d', company_id='c1',
+                                      location='Remote', duration='12 weeks'))
+            db.session.add(InternshipSkill(internship_id=f'i{i}', skill_id='s1'))
+            db.session.add(SavedInternship(id=f'sv{i}', user_id='u1', internship_id=f'i{i}'))
+        db.session.commit()
+        token = create_access_token(identity='u1')
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def test_compression_threshold_and_allowlist():
+    app, _ = _app()
+    client = app.test_client()
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data))['items'][0] == 'x' * 40
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in client.get('/text', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in client.get('/large').headers
+
+
+def test_streamed_json_and_ndjson():
+    app, _ = _app()
+    client = app.test_client()
+    response = client.get('/stream')
+    assert response.is_streamed
+    assert response.get_json() == {'items': [{'n': n} for n in range(1000)], 'total': 1000}
+    response = client.get('/stream?format=ndjson', headers={'Accept-Encoding': 'gzip'})
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line)['n'] for line in lines] == list(range(1000))
+
+
+def test_failure_partway_through_is_visible():
+    app, _ = _app()
+    client = app.test_client()
+    # Small lists are read before the response starts, so the route's error handling applies
+    assert client.get('/broken/5').status_code == 500
+
+    response = client.get('/broken/450?format=ndjson')
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 451 and 'incomplete' in lines[-1]['error']
+
+    # JSON is never closed into a valid (but short) document
+    try:
+        body = client.get('/broken/450').get_data(as_text=True)
+    except RuntimeError:
+        body = None
+    assert body is None or not body.rstrip().endswith('}')
+
+
+def test_saved_list_streams_from_server_side_cursor():
+    app, headers = _app()
+    client = app.test_client()
+    response = client.get('/api/internships/saved/list', headers=headers)
+    assert response.status_code == 200 and response.is_streamed
+    saved = response.get_json()['saved_internships']
+    assert len(saved) == SAVED
+    assert saved[0]['company']['name'] == 'Acme'
+    assert saved[0]['skills'][0]['skill']['name'] == 'Python'
+    response = client.get('/api/internships/saved/list?format=ndjson&view=compact&include=', headers=headers)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == SAVED and 'description' not in rows[0] and 'company' not in rows[0]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing compression and streaming...")
+    test_compression_threshold_and_allowlist()
+    test_streamed_json_and_ndjson()
+    test_failure_partway_through_is_visible()
+    test_saved_list_streams_from_server_side_cursor()
+    print("✅ Compression and streaming tests passed")
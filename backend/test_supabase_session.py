@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled Supabase REST client, run against the local PostgREST stand-in
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from postgrest_stub import PostgrestStub
+from utils import http_session
+from utils.supabase_client import SimpleSupabaseClient
+
+HEADERS = {'Content-Type': 'application/json', 'Prefer': 'return=representation'}
+
+
+def _client(stub):
+    return SimpleSupabaseClient(stub.rest_url, HEADERS)
+
+
+def test_calls_reuse_one_keep_alive_connection():
+    stub = PostgrestStub(tables={'users': [{'id': '1', 'email': 'a@example.com'}]}).start()
+    try:
+        client = _client(stub)
+        for _ in range(10):
+            result = client.table('users').select('*').eq('email', 'a@example.com').execute()
+            assert result.data == [{'id': '1', 'email': 'a@example.com'}]
+        assert stub.connections == 1
+    finally:
+        stub.stop()
+
+
+def test_insert_and_update_are_builders_executed_once():
+    stub = PostgrestStub(tables={'users': []}).start()
+    try:
+        client = _client(stub)
+        inserted = client.table('users').insert({'id': '2', 'first_name': 'Ravi'}).execute()
+        assert inserted.error is None and inserted.data[0]['id'] == '2'
+
+        updated = client.table('users').update({'first_name': 'Ravi K'}).eq('id', '2').execute()
+        assert updated.data == [{'id': '2', 'first_name': 'Ravi K'}]
+        assert [method for method, _, _ in stub.requests] == ['POST', 'PATCH']
+    finally:
+        stub.stop()
+
+
+def test_reads_retry_on_503_but_writes_do_not():
+    stub = PostgrestStub(tables={'users': []}).start()
+    try:
+        client = _client(stub)
+        stub.fail_next(503)
+        assert client.table('users').select('*').execute().error is None
+
+        stub.fail_next(503)
+        result = client.table('users').insert({'id': '3'}).execute()
+        assert result.error and '503' in result.error
+        assert stub.tables['users'] == []
+    finally:
+        stub.stop()
+
+
+def test_latency_is_recorded_per_operation():
+    stub = PostgrestStub(tables={'internships': []}).start()
+    try:
+        http_session.latency.reset()
+        _client(stub).table('internships').select('id').execute()
+        stats = http_session.latency.snapshot()
+        assert stats['internships.select']['count'] == 1
+        assert stats['internships.select']['errors'] == 0
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    test_calls_reuse_one_keep_alive_connection()
+    test_insert_and_update_are_builders_executed_once()
+    test_reads_retry_on_503_but_writes_do_not()
+    test_latency_is_recorded_per_operation()
+    print("✅ Supabase session tests passed")
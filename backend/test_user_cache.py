@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the Supabase users read-through cache, run against the local PostgREST stand-in
+"""
+
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from postgrest_stub import PostgrestStub
+from supabase_auth import supabase_auth_bp
+from utils import password_hasher, user_cache
+from utils.password_hasher import PasswordHasher
+from utils.supabase_client import SimpleSupabaseClient, supabase_client
+from utils.user_cache import UserCache
+
+HEADERS = {'Content-Type': 'application/json', 'Prefer': 'return=representation'}
+USER = {'id': 'u1', 'email': 'asha@example.com', 'first_name': 'Asha', 'password_hash': 'x'}
+
+
+def _reads(stub):
+    return sum(1 for method, _, _ in stub.requests if method == 'GET')
+
+
+def test_repeat_lookups_hit_the_cache():
+    stub = PostgrestStub(tables={'users': [USER]}).start()
+    try:
+        supabase = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        cache = UserCache(ttl=60)
+        for _ in range(5):
+            assert cache.get_by_id(supabase, 'u1')['first_name'] == 'Asha'
+        assert cache.get_by_email(supabase, 'asha@example.com')['id'] == 'u1'
+        assert _reads(stub) == 1
+        assert cache.stats()['by_id']['hits'] >= 5
+
+        # Callers get copies, so mutating a result never corrupts the cache
+        cache.get_by_id(supabase, 'u1')['first_name'] = 'changed'
+        assert cache.get_by_id(supabase, 'u1')['first_name'] == 'Asha'
+    finally:
+        stub.stop()
+
+
+def test_unknown_emails_are_negatively_cached_until_insert():
+    stub = PostgrestStub(tables={'users': []}).start()
+    try:
+        supabase = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        cache = UserCache(ttl=60, negative_ttl=0.2)
+        assert cache.get_by_email(supabase, 'new@example.com') is None
+        assert cache.get_by_email(supabase, 'new@example.com') is None
+        assert _reads(stub) == 1
+
+        cache.insert(supabase, {'id': 'u2', 'email': 'new@example.com', 'first_name': 'Dev'})
+        assert cache.get_by_email(supabase, 'new@example.com')['id'] == 'u2'
+        assert _reads(stub) == 1
+
+        # A signup through another worker is seen once the short-lived miss expires
+        assert cache.get_by_email(supabase, 'late@example.com') is None
+        supabase.table('users').insert({'id': 'u3', 'email': 'late@example.com', 'first_name': 'Lee'}).execute()
+        assert cache.get_by_email(supabase, 'late@example.com') is None
+        time.sleep(0.3)
+        assert cache.get_by_email(supabase, 'late@example.com')['id'] == 'u3'
+    finally:
+        stub.stop()
+
+
+def test_updates_are_written_through():
+    stub = PostgrestStub(tables={'users': [USER]}).start()
+    try:
+        supabase = SimpleSupabaseClient(stub.rest_url, HEADERS)
+        cache = UserCache(ttl=60)
+        cache.get_by_id(supabase, 'u1')
+        cache.update(supabase, 'u1', {'first_name': 'Asha R'})
+        assert cache.get_by_id(supabase, 'u1')['first_name'] == 'Asha R'
+        assert cache.get_by_email(supabase, 'asha@example.com')['first_name'] == 'Asha R'
+        assert _reads(stub) == 1
+    finally:
+        stub.stop()
+
+
+def test_wrong_password_checks_bcrypt_once():
+    hasher = PasswordHasher(rounds=4)
+    user = dict(USER, last_name='Rao', password_hash=hasher.hash('right-password'))
+    stub = PostgrestStub(tables={'users': [user]}).start()
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-user-cache-tests'
+    JWTManager(app)
+    app.register_blueprint(supabase_auth_bp, url_prefix='/api/auth')
+    client = app.test_client()
+
+    saved = supabase_client.client, user_cache._user_cache, password_hasher._password_hasher
+    supabase_client.client = SimpleSupabaseClient(stub.rest_url, HEADERS)
+    user_cache._user_cache, password_hasher._password_hasher = UserCache(ttl=60, negative_ttl=60), hasher
+    try:
+        login = {'email': 'asha@example.com', 'password': 'right-password'}
+        assert client.post('/api/auth/login', json=login).status_code == 200
+        # The hash did not change, so the fresh row is not verified a second time
+        response = client.post('/api/auth/login', json=dict(login, password='wrong'))
+        assert response.status_code == 401 and hasher.stats()['verified'] == 2
+
+        # Unknown emails are answered from the negative cache
+        for _ in range(3):
+            response = client.post('/api/auth/login', json=dict(login, email='nobody@example.com'))
+            assert response.status_code == 401
+        assert _reads(stub) == 3
+    finally:
+        supabase_client.client, user_cache._user_cache, password_hasher._password_hasher = saved
+        stub.stop()
+
+
+if __name__ == "__main__":
+    test_repeat_lookups_hit_the_cache()
+    test_unknown_emails_are_negatively_cached_until_insert()
+    test_updates_are_written_through()
+    test_wrong_password_checks_bcrypt_once()
+    print("✅ User cache tests passed")
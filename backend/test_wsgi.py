@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the production server configuration and the load test script
+"""
+
+import os
+import runpy
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify
+from werkzeug.serving import make_server
+
+from bench_load import run_level
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+
+
+def _load_config(**env):
+    # The config also sets defaults of its own; restore those too
+    saved = {name: os.environ.get(name) for name in [*env, 'METRICS_DIR', 'TOKENIZERS_PARALLELISM']}
+    os.environ.update(env)
+    try:
+        return runpy.run_path(CONFIG_PATH)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def test_worker_defaults_scale_with_cpus():
+    config = _load_config(GUNICORN_MAX_WORKERS='8')
+    assert config['default_workers'](1) == 3 and config['default_workers'](16) == 8
+    assert config['worker_class'] == 'gthread' and config['preload_app'] is True
+    assert config['timeout'] >= 120 and config['max_requests'] > 0 and config['max_requests_jitter'] > 0
+
+
+def test_environment_overrides():
+    config = _load_config(WEB_CONCURRENCY='3', GUNICORN_THREADS='16', PORT='9100', GUNICORN_PRELOAD='false')
+    assert (config['workers'], config['threads'], config['bind']) == (3, 16, '0.0.0.0:9100')
+    assert config['preload_app'] is False
+
+
+def test_load_level_reports_throughput():
+    app = Flask(__name__)
+
+    @app.route('/ping')
+    def ping():
+        return jsonify({'ok': True})
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        level = run_level(f'http://127.0.0.1:{server.server_port}', ['/ping', '/missing'], {}, 4, 0.5)
+    finally:
+        server.shutdown()
+    assert level['concurrency'] == 4 and level['requests'] > 0 and level['errors'] > 0
+    assert level['rps'] > 0 and 0 < level['p50_ms'] <= level['p99_ms']
+
+
+if __name__ == "__main__":
+    print("🧪 Testing production server configuration...")
+    test_worker_defaults_scale_with_cpus()
+    test_environment_overrides()
+    test_load_level_reports_throughput()
+    print("✅ WSGI tests passed")
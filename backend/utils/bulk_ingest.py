@@ -0,0 +1,253 @@
+"""
+Bulk resume ingestion.
+
+Colleges upload whole folders of resumes at once. Parsing one file means a
+PyMuPDF/python-docx extraction followed by several spaCy passes, so the work
+is CPU bound and is fanned out over a process pool. Every worker process
+builds its own ``ResumeParser`` once (loading the spaCy model is the slow
+part) and reuses it for every file it is handed.
+
+Results are yielded as soon as each file finishes, together with per-stage
+timings, so callers can stream them to a client or a terminal.
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx'}
+
+# Guard against zip bombs: members larger than this once decompressed are skipped
+MAX_MEMBER_SIZE = int(os.environ.get('BULK_INGEST_MAX_MEMBER_SIZE', 10 * 1024 * 1024))
+
+# Upper bound on the number of resumes accepted in one batch
+MAX_FILES = int(os.environ.get('BULK_INGEST_MAX_FILES', 500))
+
+# Upper bound on the total decompressed size of the resumes in one uploaded archive
+MAX_TOTAL_SIZE = int(os.environ.get('BULK_INGEST_MAX_TOTAL_SIZE', 200 * 1024 * 1024))
+
+# Per-process parser, created by _init_worker
+_worker_parser = None
+
+
+def _init_worker():
+    """Warm a ResumeParser once per worker process"""
+    global _worker_parser
+    from utils.resume_parser import ResumeParser
+    _worker_parser = ResumeParser()
+
+
+def _parse_one(name: str, data: bytes) -> Dict:
+    """Parse a single resume inside a worker process"""
+    from utils.parse_cache import get_parse_cache
+
+    timings = {}
+    started = time.perf_counter()
+    try:
+        cache = get_parse_cache()
+        parsed = cache.get(data)
+        cached = parsed is not None
+        if not cached:
+            extract_started = time.perf_counter()
+            text = _worker_parser.extract_text_from_bytes(data, name)
+            timings['extract_text'] = time.perf_counter() - extract_started
+
+            parsed = _worker_parser.parse_text(text, timings)
+            cache.set(data, parsed)
+
+        result = {
+            'file': name,
+            'success': True,
+            'cached': cached,
+            'data': {
+                'contact_info': parsed['contact_info'],
+                'skills': parsed['skills'],
+                'education': parsed['education'],
+                'experience': parsed['experience'],
+                'experience_level': parsed['experience_level']
+            }
+        }
+    except Exception as e:
+        result = {'file': name, 'success': False, 'error': str(e)}
+
+    timings['total'] = time.perf_counter() - started
+    result['timings'] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    result['worker_pid'] = os.getpid()
+    return result
+
+
+def _is_supported(name: str) -> bool:
+    base = os.path.basename(name)
+    if not base or base.startswith('.') or base.startswith('~$'):
+        return False
+    return os.path.splitext(base)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+class BatchTooLarge(ValueError):
+    """An archive holds more resumes, or more decompressed bytes, than one batch accepts"""
+
+
+def zip_members(archive: zipfile.ZipFile, max_files: Optional[int] = None,
+                max_total_size: Optional[int] = None) -> List[zipfile.ZipInfo]:
+    """Supported resume members of an open archive, checked against the batch limits.
+
+    Only the central directory is read. Limits left as None are not enforced.
+    Reads never decompress more than a member's declared ``file_size``, so
+    the declared sizes bound the memory a batch can take.
+    """
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and '__MACOSX' not in info.filename
+        and _is_supported(info.filename) and info.file_size <= MAX_MEMBER_SIZE
+    ]
+    if max_files is not None and len(members) > max_files:
+        raise BatchTooLarge(f"Archive holds {len(members)} resumes; at most {max_files} are accepted")
+    total_size = sum(info.file_size for info in members)
+    if max_total_size is not None and total_size > max_total_size:
+        raise BatchTooLarge(f"Archive expands to {total_size} bytes; at most {max_total_size} are accepted")
+    return members
+
+
+def read_zip_members(archive: zipfile.ZipFile, members: Iterable[zipfile.ZipInfo]) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, bytes) per member, decompressing each only when it is requested"""
+    for info in members:
+        yield info.filename, archive.read(info)
+
+
+def iter_zip_sources(zip_file) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, bytes) for every supported resume in a zip archive.
+
+    ``zip_file`` may be a path or a seekable file object.
+    """
+    with zipfile.ZipFile(zip_file) as archive:
+        yield from read_zip_members(archive, zip_members(archive))
+
+
+def iter_directory_sources(directory: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative name, bytes) for every supported resume under a directory"""
+    for root, _dirs, files in os.walk(directory):
+        for file_name in sorted(files):
+            if not _is_supported(file_name):
+                continue
+            path = os.path.join(root, file_name)
+            if os.path.getsize(path) > MAX_MEMBER_SIZE:
+                continue
+            with open(path, 'rb') as f:
+                yield os.path.relpath(path, directory), f.read()
+
+
+def iter_sources(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield resumes from a zip archive, a directory or a single file"""
+    if os.path.isdir(path):
+        return iter_directory_sources(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip_sources(path)
+    if _is_supported(path):
+        with open(path, 'rb') as f:
+            return iter([(os.path.basename(path), f.read())])
+    raise ValueError(f"Unsupported input: {path}. Expected a zip archive, a directory, a PDF or a DOCX.")
+
+
+class IngestStats:
+    """Aggregated throughput and per-stage timings for a batch"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.stage_totals: Dict[str, float] = {}
+
+    def record(self, result: Dict):
+        self.files += 1
+        if result.get('success'):
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        for stage, seconds in result.get('timings', {}).items():
+            self.stage_totals[stage] = self.stage_totals.get(stage, 0.0) + seconds
+
+    def to_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            'files': self.files,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed_seconds': round(elapsed, 3),
+            'files_per_second': round(self.files / elapsed, 2) if elapsed > 0 else 0.0,
+            'stage_totals_seconds': {stage: round(total, 4) for stage, total in self.stage_totals.items()},
+            'stage_avg_seconds': {
+                stage: round(total / self.files, 4) for stage, total in self.stage_totals.items()
+            } if self.files else {}
+        }
+
+
+def default_workers() -> int:
+    return int(os.environ.get('BULK_INGEST_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+
+
+def create_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Create a process pool whose workers each hold a warmed ResumeParser.
+
+    Workers are spawned rather than forked: forking a threaded web worker
+    (or one that already loaded native ML libraries) is not safe.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker
+    )
+
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_shared_pool() -> ProcessPoolExecutor:
+    """Process pool reused across bulk requests in a web process"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = create_pool()
+    return _shared_pool
+
+
+def ingest(sources: Iterable[Tuple[str, bytes]], pool: ProcessPoolExecutor,
+           stats: Optional[IngestStats] = None, max_files: int = MAX_FILES) -> Iterator[Dict]:
+    """Parse resumes on ``pool`` and yield each result as it completes.
+
+    At most ``2 * max_workers`` files are in flight at a time, so memory use
+    stays bounded regardless of the batch size.
+    """
+    max_in_flight = 2 * max(1, getattr(pool, '_max_workers', 1))
+    pending = set()
+
+    # Sources are pulled one at a time, so a lazy source is never read ahead of the window
+    for name, data in itertools.islice(sources, max_files):
+        pending.add(pool.submit(_parse_one, name, data))
+
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if stats is not None:
+                    stats.record(result)
+                yield result
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if stats is not None:
+                stats.record(result)
+            yield result
+
+
+def ingest_path(path: str, workers: Optional[int] = None) -> Tuple[List[Dict], Dict]:
+    """Convenience wrapper: parse everything under ``path`` and return (results, summary)"""
+    stats = IngestStats()
+    with create_pool(workers) as pool:
+        results = list(ingest(iter_sources(path), pool, stats))
+    return results, stats.to_dict()
@@ -0,0 +1,135 @@
+"""
+HTTP response compression.
+
+``init_compression`` registers an ``after_request`` hook that compresses
+responses with brotli (when the ``brotli`` package is installed) or gzip,
+whichever the client prefers in ``Accept-Encoding``. Only content types in
+``COMPRESSIBLE_TYPES`` are touched, and buffered bodies smaller than
+``COMPRESS_MIN_SIZE`` bytes are sent as they are, since compressing them
+costs more CPU than it saves on the wire.
+
+Streamed responses (NDJSON exports) are compressed chunk by chunk with a
+sync flush after every chunk, so the client still receives items as soon as
+they are produced. Server-sent events are never compressed.
+"""
+
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/plain',
+    'text/html',
+    'text/css',
+    'text/csv',
+})
+
+DEFAULTS = {
+    'COMPRESS_ENABLED': True,
+    'COMPRESS_MIN_SIZE': 1024,
+    'COMPRESS_LEVEL': 6,
+    'COMPRESS_BROTLI_QUALITY': 4,
+}
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 31: gzip container rather than a raw zlib stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _setting(name: str):
+    return current_app.config.get(name, DEFAULTS[name])
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding() -> Optional[str]:
+    """The best encoding the client accepts that we can produce, or None"""
+    return request.accept_encodings.best_match(available_encodings())
+
+
+def _encoder(encoding: str):
+    if encoding == 'br':
+        return _BrotliEncoder(_setting('COMPRESS_BROTLI_QUALITY'))
+    return _GzipEncoder(_setting('COMPRESS_LEVEL'))
+
+
+def _compress_stream(chunks: Iterable, encoder) -> Iterator[bytes]:
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = encoder.compress(chunk) + encoder.flush()
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    if not _setting('COMPRESS_ENABLED'):
+        return response
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.mimetype not in COMPRESSIBLE_TYPES
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, _encoder(encoding))
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < _setting('COMPRESS_MIN_SIZE'):
+            return response
+        encoder = _encoder(encoding)
+        response.set_data(encoder.compress(body) + encoder.finish())
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -0,0 +1,69 @@
+"""
+SQLAlchemy engine configuration.
+
+The database URI comes from ``DATABASE_URL`` (falling back to a local SQLite
+file), and engine options are chosen per backend:
+
+- PostgreSQL gets a sized connection pool with pre-ping and recycling, so
+  dropped or idle-killed connections are replaced instead of failing a
+  request.
+- SQLite connections are switched to WAL with ``synchronous=NORMAL``, a
+  memory map and a busy timeout. Readers then no longer block the writer,
+  and concurrent writers wait for the lock instead of failing with
+  "database is locked".
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_DATABASE_URI = 'sqlite:///app.db'
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+
+def database_uri() -> str:
+    """``DATABASE_URL`` with the legacy ``postgres://`` scheme normalised for SQLAlchemy"""
+    uri = os.environ.get('DATABASE_URL') or DEFAULT_DATABASE_URI
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def engine_options(uri: str) -> Dict[str, Any]:
+    """``SQLALCHEMY_ENGINE_OPTIONS`` suited to the backend named in ``uri``"""
+    if uri.startswith('postgresql'):
+        return {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': True
+        }
+    if uri.startswith('sqlite'):
+        # sqlite3 waits this long for a lock before raising "database is locked"
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {'pool_pre_ping': True}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    finally:
+        cursor.close()
+
+
+def register_sqlite_pragmas(target=Engine):
+    """Apply the SQLite pragmas to new connections of ``target`` (every engine by default); idempotent"""
+    if not event.contains(target, 'connect', _set_sqlite_pragmas):
+        event.listen(target, 'connect', _set_sqlite_pragmas)
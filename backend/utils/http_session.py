@@ -0,0 +1,117 @@
+"""
+Shared HTTP session for outbound REST calls (Supabase PostgREST and Storage).
+
+Module-level ``requests.get``/``post`` open a fresh TCP+TLS connection per
+call. ``get_session`` instead returns one keep-alive ``requests.Session`` per
+process with a tuned connection pool, retry/backoff for idempotent requests
+and default timeouts. Every call made through ``request`` is timed into
+``latency`` so slow upstream calls are visible.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.metrics import record_external_call
+
+POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 4))
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 20))
+MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', 3))
+BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.2))
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 15))
+
+
+class LatencyRecorder:
+    """Per-operation call count, error count and latency (seconds)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, seconds: float, error: bool = False):
+        with self._lock:
+            op = self._ops.setdefault(operation, {'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0})
+            op['count'] += 1
+            op['total'] += seconds
+            op['max'] = max(op['max'], seconds)
+            if error:
+                op['errors'] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    'count': int(op['count']),
+                    'errors': int(op['errors']),
+                    'avg_ms': round(op['total'] / op['count'] * 1000, 2) if op['count'] else 0.0,
+                    'max_ms': round(op['max'] * 1000, 2),
+                    'total_seconds': round(op['total'], 4)
+                }
+                for name, op in self._ops.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+
+
+latency = LatencyRecorder()
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(429, 502, 503, 504),
+        # Never blindly replay inserts/updates
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session (rebuilt after a fork)"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def request(method: str, url: str, operation: Optional[str] = None, **kwargs) -> requests.Response:
+    """Send a request on the shared session with default timeouts and record its latency"""
+    kwargs.setdefault('timeout', (CONNECT_TIMEOUT, READ_TIMEOUT))
+    started = time.perf_counter()
+    error = False
+    try:
+        response = get_session().request(method, url, **kwargs)
+        error = response.status_code >= 400
+        return response
+    except requests.RequestException:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        latency.record(operation or method, elapsed, error)
+        record_external_call('supabase', operation or method, elapsed, error)
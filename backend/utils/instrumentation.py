@@ -0,0 +1,263 @@
+"""
+Request-scoped instrumentation.
+
+``init_instrumentation`` times every request and, through SQLAlchemy
+``before/after_cursor_execute`` events, counts the SQL statements it runs
+and the time spent in them. Statements are grouped by shape (literals and
+``IN (...)`` lists collapsed), so a shape repeated ``N_PLUS_ONE_THRESHOLD``
+or more times in one request is flagged as a likely N+1 query pattern.
+
+The results are surfaced three ways:
+
+- a ``Server-Timing`` header (``app``, ``db``), visible in browser dev tools
+- one structured JSON log line per request on the ``app.requests`` logger,
+  written once the response body has been sent (so streamed responses are
+  measured in full), with N+1 shapes also logged as warnings
+- optional sampled profiles: with ``PROFILE_SAMPLE_RATE`` > 0, that fraction
+  of requests (limited to ``PROFILE_ENDPOINTS`` when set) is run under
+  cProfile, or pyinstrument when ``PROFILER=pyinstrument`` and it is
+  installed, and dumped to ``PROFILE_DIR``
+
+Request counts, latency and in-flight gauges are also fed to ``utils.metrics``
+for the ``/metrics`` endpoint.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - optional dependency
+    pyinstrument = None
+
+from utils import metrics
+
+logger = logging.getLogger('app.requests')
+
+DEFAULTS = {
+    'INSTRUMENTATION_ENABLED': True,
+    'SERVER_TIMING_ENABLED': True,
+    'REQUEST_LOG_ENABLED': True,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_ENDPOINTS': '',
+    'PROFILE_DIR': 'profiles',
+    'PROFILER': 'cprofile',
+}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r'\s+')
+
+# Only one profiler can be active per process at a time
+_profile_lock = threading.Lock()
+
+
+def statement_shape(statement: str) -> str:
+    """``statement`` with literals and parameter lists collapsed, for grouping repeats"""
+    shape = _LITERALS.sub('?', statement)
+    shape = _PARAM_LISTS.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.profiler = None
+        self.finishing = False
+        self.blueprint = request.blueprint or ''
+        # The rule, not the path, so ids do not explode label cardinality
+        self.route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    def record_query(self, statement: str, seconds: float):
+        self.sql_count += 1
+        self.sql_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def repeated_shapes(self, threshold: int) -> List[Dict[str, Any]]:
+        return [{'count': count, 'statement': shape[:300]}
+                for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return g.get('_request_stats') if has_app_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-execution context, so a failed statement leaves nothing behind
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    metrics.db_queries.inc()
+    metrics.db_query_duration.observe(seconds)
+    stats = current_request_stats()
+    if stats is not None:
+        stats.record_query(statement, seconds)
+
+
+def register_sql_listeners(target=Engine):
+    """Count queries on ``target`` (every engine by default); idempotent"""
+    if not event.contains(target, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(target, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(target, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _setting(name: str):
+    return current_app.config.get(name, DEFAULTS[name])
+
+
+def _should_profile() -> bool:
+    rate = float(_setting('PROFILE_SAMPLE_RATE'))
+    if rate <= 0 or random.random() >= rate:
+        return False
+    endpoints = [e.strip() for e in _setting('PROFILE_ENDPOINTS').split(',') if e.strip()]
+    return not endpoints or request.endpoint in endpoints
+
+
+def _start_profiler():
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        if _setting('PROFILER') == 'pyinstrument' and pyinstrument is not None:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+    except Exception:
+        _profile_lock.release()
+        raise
+
+
+def _stop_profiler(profiler, endpoint: str, directory: str) -> Optional[str]:
+    try:
+        os.makedirs(directory, exist_ok=True)
+        name = f"{(endpoint or 'unknown').replace('.', '-')}-{int(time.time() * 1000)}-{os.getpid()}"
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            path = os.path.join(directory, name + '.prof')
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = os.path.join(directory, name + '.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return path
+    finally:
+        _profile_lock.release()
+
+
+def _begin_request():
+    stats = g._request_stats = RequestStats()
+    metrics.http_in_flight.inc(blueprint=stats.blueprint)
+    if _should_profile():
+        stats.profiler = _start_profiler()
+
+
+def _server_timing(stats: RequestStats) -> str:
+    return (f'app;dur={stats.elapsed() * 1000:.1f}, '
+            f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_count} queries"')
+
+
+def _finish(stats: RequestStats, entry: Dict[str, Any], threshold: int, log_enabled: bool, profile_dir: str):
+    try:
+        _record_metrics(stats, entry)
+        _report(stats, entry, threshold, log_enabled, profile_dir)
+    except Exception as e:
+        print(f"Error reporting request stats: {e}")
+
+
+def _record_metrics(stats: RequestStats, entry: Dict[str, Any]):
+    metrics.http_in_flight.dec(blueprint=stats.blueprint)
+    metrics.http_requests.inc(blueprint=stats.blueprint, route=stats.route,
+                              method=entry['method'], status=entry['status'])
+    metrics.http_request_duration.observe(stats.elapsed(), blueprint=stats.blueprint,
+                                          route=stats.route, method=entry['method'])
+    metrics.maybe_flush()
+
+
+def _report(stats: RequestStats, entry: Dict[str, Any], threshold: int, log_enabled: bool, profile_dir: str):
+    entry['duration_ms'] = round(stats.elapsed() * 1000, 2)
+    entry['sql_count'] = stats.sql_count
+    entry['sql_ms'] = round(stats.sql_seconds * 1000, 2)
+    repeated = stats.repeated_shapes(threshold)
+    if repeated:
+        entry['n_plus_one'] = repeated
+    if stats.profiler is not None:
+        entry['profile'] = _stop_profiler(stats.profiler, entry['endpoint'], profile_dir)
+    if log_enabled:
+        logger.info(json.dumps(entry))
+        for shape in repeated:
+            logger.warning(f"Possible N+1 in {entry['method']} {entry['path']}: "
+                           f"{shape['count']}x {shape['statement']}")
+
+
+def _end_request(response):
+    stats = g.get('_request_stats')
+    if stats is None:
+        return response
+    if _setting('SERVER_TIMING_ENABLED'):
+        response.headers.add('Server-Timing', _server_timing(stats))
+    entry = {
+        'event': 'request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+    }
+    threshold = int(_setting('N_PLUS_ONE_THRESHOLD'))
+    stats.finishing = True
+    log_enabled, profile_dir = _setting('REQUEST_LOG_ENABLED'), _setting('PROFILE_DIR')
+    # Finish once the body has been sent, so streamed responses are measured in full
+    response.call_on_close(lambda: _finish(stats, entry, threshold, log_enabled, profile_dir))
+    return response
+
+
+def _teardown_request(error=None):
+    # Another after_request hook failed before ours ran: still close the request's metrics
+    stats = g.get('_request_stats')
+    if stats is not None and not stats.finishing:
+        stats.finishing = True
+        _record_metrics(stats, {'method': request.method, 'status': 500})
+        if stats.profiler is not None:
+            _stop_profiler(stats.profiler, request.endpoint, _setting('PROFILE_DIR'))
+
+
+def init_instrumentation(app):
+    if not app.config.get('INSTRUMENTATION_ENABLED', DEFAULTS['INSTRUMENTATION_ENABLED']):
+        return
+    register_sql_listeners()
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    app.before_request(_begin_request)
+    app.after_request(_end_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,255 @@
+"""
+Background job queue for slow requests (resume parsing, AI analysis).
+
+Jobs run on an in-process thread pool so the web worker that accepted the
+request can answer immediately with a job ID. Job records (status, result,
+error) live in a store that expires them after ``JOB_RESULT_TTL`` seconds:
+
+- ``MemoryJobStore`` (default) keeps them in the process.
+- ``SQLiteJobStore`` is used when ``JOB_STORE_PATH`` is set, so that status
+  polls landing on a different web worker still find the job.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+TERMINAL_STATES = {SUCCEEDED, FAILED}
+
+
+class Job:
+    def __init__(self, kind: str, user_id: Optional[str] = None, job_id: Optional[str] = None):
+        self.id = job_id or str(uuid.uuid4())
+        self.kind = kind
+        self.user_id = user_id
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error
+        }
+        if include_result and self.status == SUCCEEDED:
+            data['result'] = self.result
+        return data
+
+    @classmethod
+    def from_row(cls, row) -> 'Job':
+        job = cls(row['kind'], row['user_id'], row['id'])
+        job.status = row['status']
+        job.result = json.loads(row['result']) if row['result'] else None
+        job.error = row['error']
+        job.created_at = row['created_at']
+        job.started_at = row['started_at']
+        job.finished_at = row['finished_at']
+        return job
+
+
+class MemoryJobStore:
+    """Job records kept in this process only"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.done and job.finished_at is not None and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+
+class SQLiteJobStore:
+    """Job records shared by all web workers on the host through one SQLite file"""
+
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' id TEXT PRIMARY KEY, kind TEXT, user_id TEXT, status TEXT,'
+                ' result TEXT, error TEXT, created_at REAL, started_at REAL, finished_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_jobs_status_finished ON jobs (status, finished_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def save(self, job: Job):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (job.id, job.kind, job.user_id, job.status,
+             json.dumps(job.result) if job.result is not None else None,
+             job.error, job.created_at, job.started_at, job.finished_at)
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def purge_expired(self):
+        self._connect().execute(
+            'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+            (SUCCEEDED, FAILED, time.time() - self.ttl)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        for row in self._connect().execute('SELECT status, COUNT(*) AS n FROM jobs GROUP BY status'):
+            counts[row['status']] = row['n']
+        return counts
+
+
+class JobQueue:
+    def __init__(self, workers: int = 4, ttl: int = 900, store_path: Optional[str] = None):
+        self.workers = workers
+        self.ttl = ttl
+        self.store = SQLiteJobStore(store_path, ttl) if store_path else MemoryJobStore(ttl)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._changed = threading.Condition()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable, *args, user_id: Optional[str] = None, **kwargs) -> Job:
+        """Queue ``func(*args, **kwargs)`` and return its job immediately"""
+        self.store.purge_expired()
+
+        job = Job(kind, user_id)
+        self.store.save(job)
+        with self._pending_lock:
+            self._pending += 1
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job: Job, func: Callable, args, kwargs):
+        with self._pending_lock:
+            self._pending -= 1
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._update(job)
+
+        # The job object is shared with pollers and the purge: fill in
+        # finished_at, result and error before the status marks it done
+        try:
+            result, error, status = func(*args, **kwargs), None, SUCCEEDED
+        except Exception as e:
+            result, error, status = None, str(e), FAILED
+        job.finished_at = time.time()
+        job.result, job.error = result, error
+        job.status = status
+        try:
+            self._update(job)
+        except Exception as e:
+            # e.g. a result json can't encode, or a locked database: fail the job
+            # rather than leave its stored row running until pollers time out
+            print(f"Error storing job {job.id}: {e}")
+            job.error = f'Could not store job result: {e}'
+            job.status = FAILED
+            job.result = None
+            try:
+                self._update(job)
+            except Exception as e:
+                print(f"Error storing failure of job {job.id}: {e}")
+
+    def _update(self, job: Job):
+        self.store.save(job)
+        with self._changed:
+            self._changed.notify_all()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, last_status: Optional[str] = None, timeout: float = 15.0) -> Optional[Job]:
+        """Block until the job's status differs from ``last_status`` or ``timeout`` elapses.
+
+        Jobs owned by another worker (shared SQLite store) are re-read every
+        half second instead of being notified.
+        """
+        deadline = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job is not None and job.status == last_status and not job.done:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with self._changed:
+                self._changed.wait(min(remaining, 0.5))
+            job = self.get(job_id)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self.store.counts()
+        with self._pending_lock:
+            local_depth = self._pending
+        return {
+            'workers': self.workers,
+            'queue_depth': local_depth,
+            'jobs': counts,
+            'result_ttl_seconds': self.ttl
+        }
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue, configured from the environment on first use"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue(
+                    workers=int(os.environ.get('JOB_WORKERS', 4)),
+                    ttl=int(os.environ.get('JOB_RESULT_TTL', 900)),
+                    store_path=os.environ.get('JOB_STORE_PATH')
+                )
+    return _job_queue
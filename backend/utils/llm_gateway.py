@@ -0,0 +1,377 @@
+"""
+LLM gateway shared by the chat assistant and the AI resume review.
+
+The routes used to run ``genai.configure`` and build a new
+``GenerativeModel`` on every request, then block on ``generate_content``
+even for a question or resume + job description pair answered a minute
+earlier. ``LLMGateway`` instead:
+
+- holds one configured model per process
+- caches replies in a TTL cache keyed by a hash of the normalized prompt
+  (whitespace collapsed, case folded) and the model name
+- coalesces concurrent identical prompts: the first caller makes the
+  upstream call and the others wait for its result
+- limits how many uncached generations one user may have in flight
+  (``LLM_PER_USER_CONCURRENCY``); beyond that ``LLMBusy`` is raised so the
+  route can answer 429
+
+``stream`` yields the reply as the model produces it. The upstream iterator
+runs on its own thread so the caller can enforce a first-token and a total
+deadline (``LLM_FIRST_TOKEN_TIMEOUT``, ``LLM_TIMEOUT``) and cancel it when
+the client goes away; time to first token is recorded in the metrics.
+Streams are served from the cache but are not coalesced.
+
+``LLM_PROVIDER=fake`` swaps Gemini for ``FakeModel``, a deterministic local
+model for tests and offline development.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils.cache import TTLCache
+from utils.metrics import llm_streams, llm_time_to_first_token, track_external_call
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class LLMBusy(Exception):
+    """The user already has the maximum number of generations in flight"""
+
+
+class LLMTimeout(TimeoutError):
+    """The model did not produce (the rest of) its reply in time"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _WHITESPACE.sub(' ', prompt).strip().casefold()
+
+
+def prompt_key(prompt: str, model_name: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+
+
+class GeminiModel:
+    provider = 'gemini'
+
+    def __init__(self, api_key: str, model_name: str):
+        # Imported on first use: the Gemini SDK pulls in gRPC and protobuf
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        result = self._model.generate_content(prompt)
+        text = getattr(result, 'text', None)
+        if not text and getattr(result, 'candidates', None):
+            text = result.candidates[0].content.parts[0].text
+        return text or ''
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._model.generate_content(prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                # A chunk without text parts (e.g. only safety ratings)
+                continue
+            if text:
+                yield text
+
+
+class FakeModel:
+    """Deterministic local model: echoes the last prompt line, or a fixed analysis when JSON is requested"""
+    provider = 'fake'
+
+    def __init__(self, responder: Optional[Callable[[str], str]] = None, name: str = 'fake',
+                 chunk_delay: float = 0.0):
+        self.name = name
+        self.responder = responder
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.responder is not None:
+            return self.responder(prompt)
+        if 'strict JSON' in prompt:
+            return json.dumps({
+                'summary': 'Fake analysis.',
+                'match_score': 50,
+                'strengths': ['Clear structure'],
+                'gaps': ['No quantified results'],
+                'recommendations': ['Quantify the impact of each project.']
+            })
+        lines = [line.strip() for line in prompt.strip().splitlines() if line.strip()]
+        return f"Fake reply to: {lines[-1] if lines else ''}"
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """The ``generate`` reply a word at a time, ``chunk_delay`` seconds apart"""
+        for word in re.findall(r'\S+\s*', self.generate(prompt)):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield word
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMGateway:
+    def __init__(self, model, cache_ttl: float = 3600, cache_size: int = 512,
+                 per_user_concurrency: int = 2, timeout: float = 120, first_token_timeout: float = 30):
+        self.model = model
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.per_user_concurrency = per_user_concurrency
+        self.timeout = timeout
+        self.first_token_timeout = first_token_timeout
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._active: Dict[str, int] = {}
+        self._counts = {'upstream': 0, 'coalesced': 0, 'rejected_busy': 0, 'errors': 0}
+
+    @property
+    def provider(self) -> str:
+        return self.model.provider
+
+    def _acquire(self, user_key: Optional[str]):
+        if user_key is None:
+            return
+        with self._lock:
+            if self._active.get(user_key, 0) >= self.per_user_concurrency:
+                self._counts['rejected_busy'] += 1
+                raise LLMBusy(user_key)
+            self._active[user_key] = self._active.get(user_key, 0) + 1
+
+    def _release(self, user_key: Optional[str]):
+        if user_key is None:
+            return
+        with self._lock:
+            remaining = self._active.get(user_key, 1) - 1
+            if remaining:
+                self._active[user_key] = remaining
+            else:
+                self._active.pop(user_key, None)
+
+    def generate(self, prompt: str, operation: str, user_key: Optional[str] = None, cache: bool = True) -> str:
+        """Reply to ``prompt``, from the cache, a concurrent identical call, or the model"""
+        key = prompt_key(prompt, self.model.name)
+        if cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        self._acquire(user_key)
+        try:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                else:
+                    self._counts['coalesced'] += 1
+            if not leader:
+                if not flight.done.wait(self.timeout):
+                    raise LLMTimeout(f"LLM call for {operation} did not finish in {self.timeout}s")
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            return self._call(key, flight, prompt, operation, cache)
+        finally:
+            self._release(user_key)
+
+    def _call(self, key: str, flight: _Flight, prompt: str, operation: str, cache: bool) -> str:
+        try:
+            with self._lock:
+                self._counts['upstream'] += 1
+            with track_external_call(self.provider, operation):
+                flight.result = self.model.generate(prompt)
+            if cache and flight.result:
+                self.cache.set(key, flight.result)
+            return flight.result
+        except Exception as e:
+            with self._lock:
+                self._counts['errors'] += 1
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stream(self, prompt: str, operation: str, user_key: Optional[str] = None,
+               cache: bool = True) -> 'LLMStream':
+        """Stream the reply to ``prompt``; raises ``LLMBusy`` up front, before anything is sent"""
+        key = prompt_key(prompt, self.model.name)
+        if cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return LLMStream(self, key, prompt, operation, cached=cached)
+        self._acquire(user_key)
+        with self._lock:
+            self._counts['upstream'] += 1
+        return LLMStream(self, key, prompt, operation, user_key=user_key, cache=cache)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts, in_flight=len(self._flights))
+        return {'provider': self.provider, 'model': self.model.name, 'cache': self.cache.stats(), **counts}
+
+
+class LLMStream:
+    """Iterable of reply chunks; ``close`` cancels the upstream call and frees the user's slot"""
+
+    _END = object()
+
+    def __init__(self, gateway: LLMGateway, key: str, prompt: str, operation: str,
+                 user_key: Optional[str] = None, cache: bool = True, cached: Optional[str] = None):
+        self.gateway = gateway
+        self.key = key
+        self.prompt = prompt
+        self.operation = operation
+        self.user_key = user_key
+        self.cache = cache
+        self.cached = cached
+        self.outcome: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[str]:
+        if self.cached is not None:
+            self.outcome = 'cached'
+            yield self.cached
+            return
+        provider, operation = self.gateway.provider, self.operation
+        chunks: 'queue.Queue' = queue.Queue()
+        threading.Thread(target=self._produce, args=(chunks,), daemon=True, name='llm-stream').start()
+        started = time.perf_counter()
+        deadline = started + self.gateway.timeout
+        parts = []
+        try:
+            while True:
+                wait = deadline - time.perf_counter()
+                if not parts:
+                    wait = min(wait, started + self.gateway.first_token_timeout - time.perf_counter())
+                try:
+                    item = chunks.get(timeout=max(wait, 0))
+                except queue.Empty:
+                    self.outcome = 'timeout'
+                    raise LLMTimeout(f"{operation}: no {'further ' if parts else ''}reply from {provider} in time")
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    self.outcome = 'error'
+                    raise item
+                if not parts:
+                    llm_time_to_first_token.observe(time.perf_counter() - started,
+                                                    provider=provider, operation=operation)
+                parts.append(item)
+                yield item
+            self.outcome = 'completed'
+            reply = ''.join(parts)
+            if self.cache and reply:
+                self.gateway.cache.set(self.key, reply)
+        finally:
+            if self.outcome is None:
+                # The consumer stopped iterating: the client went away
+                self.outcome = 'cancelled'
+            self.close()
+
+    def _produce(self, chunks: 'queue.Queue'):
+        upstream = None
+        try:
+            with track_external_call(self.gateway.provider, self.operation):
+                upstream = self.gateway.model.stream(self.prompt)
+                for chunk in upstream:
+                    if self._cancelled.is_set():
+                        break
+                    chunks.put(chunk)
+            chunks.put(self._END)
+        except Exception as e:
+            with self.gateway._lock:
+                self.gateway._counts['errors'] += 1
+            chunks.put(e)
+        finally:
+            close = getattr(upstream, 'close', None)
+            if close is not None:
+                close()
+
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._cancelled.set()
+        if self.cached is None:
+            self.gateway._release(self.user_key)
+        llm_streams.inc(provider=self.gateway.provider, outcome=self.outcome or 'cancelled')
+
+
+def request_user_key() -> str:
+    """Who to count a generation against: the JWT identity if present, else the client address"""
+    from flask import request
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    return f"user:{identity}" if identity else f"ip:{request.remote_addr}"
+
+
+def _build_model():
+    provider = os.environ.get('LLM_PROVIDER', 'gemini').lower()
+    if provider == 'fake':
+        return FakeModel()
+    api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+    if not api_key:
+        return None
+    try:
+        return GeminiModel(api_key, os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash'))
+    except Exception as e:
+        print(f"Error configuring Gemini: {e}")
+        return None
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_configured = False
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> Optional[LLMGateway]:
+    """Process-wide gateway, configured from the environment on first use; None when no model is configured"""
+    global _gateway, _gateway_configured
+    if not _gateway_configured:
+        with _gateway_lock:
+            if not _gateway_configured:
+                model = _build_model()
+                if model is not None:
+                    _gateway = LLMGateway(
+                        model,
+                        cache_ttl=float(os.environ.get('LLM_CACHE_TTL', 3600)),
+                        cache_size=int(os.environ.get('LLM_CACHE_SIZE', 512)),
+                        per_user_concurrency=int(os.environ.get('LLM_PER_USER_CONCURRENCY', 2)),
+                        timeout=float(os.environ.get('LLM_TIMEOUT', 120)),
+                        first_token_timeout=float(os.environ.get('LLM_FIRST_TOKEN_TIMEOUT', 30))
+                    )
+                _gateway_configured = True
+    return _gateway
+
+
+def set_llm_gateway(gateway: Optional[LLMGateway]):
+    """Replace the process-wide gateway (tests, or a custom model)"""
+    global _gateway, _gateway_configured
+    with _gateway_lock:
+        _gateway = gateway
+        _gateway_configured = True
@@ -0,0 +1,427 @@
+"""
+Prometheus-style metrics.
+
+A small self-contained registry of counters, gauges and histograms rendered
+in the Prometheus text exposition format at ``/metrics``; no client library
+is required. Covered:
+
+- HTTP request counts, latency histograms and in-flight gauges per blueprint
+  and route (recorded by ``utils.instrumentation``)
+- SQL query counts/latency, and connection pool usage read at scrape time
+- cache hits, misses and hit ratios of the in-process caches
+- model load times (spaCy, sentence embeddings)
+- external call latency and errors: Gemini, and Supabase REST/Storage calls
+  made through ``utils.http_session``
+- time to first token and outcomes of streamed LLM replies
+
+Multiple workers: when ``METRICS_DIR`` (or ``PROMETHEUS_MULTIPROC_DIR``) is
+set, each worker writes a snapshot of its metrics to that directory every
+``METRICS_FLUSH_INTERVAL`` seconds and on scrape, and ``/metrics`` serves the
+sum over all live workers, whichever worker answers the scrape. Gauges are
+summed too (in-flight requests, checked-out connections across workers).
+
+If ``prometheus_client`` is installed, its default process and GC metrics
+for the answering worker are appended.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, jsonify, request
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOAD_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# (sample name suffix, label pairs, value)
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = registry.lock
+        self._values: Dict[Tuple[str, ...], object] = {}
+        registry.add(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _pairs(self, key: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        """Mirror a monotonic count kept elsewhere (e.g. a cache's own hit counter)"""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def samples(self) -> List[Sample]:
+        return [('_total', self._pairs(key), value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[Sample]:
+        return [('', self._pairs(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state['counts'][index] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for key, state in self._values.items():
+            pairs = self._pairs(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                samples.append(('_bucket', pairs + (('le', _format_value(bound)),), cumulative))
+            samples.append(('_bucket', pairs + (('le', '+Inf'),), state['count']))
+            samples.append(('_sum', pairs, state['sum']))
+            samples.append(('_count', pairs, state['count']))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], None]] = {}
+        self._last_flush = 0.0
+
+    def add(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return Counter(self, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return Gauge(self, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return Histogram(self, name, help_text, labelnames, buckets)
+
+    def register_collector(self, name: str, collector: Callable[[], None]):
+        """``collector`` is called before every snapshot to refresh scrape-time values; replaces ``name``"""
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Dict]:
+        for name, collector in list(self._collectors.items()):
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector {name} failed: {e}")
+        with self.lock:
+            return {
+                metric.name: {
+                    'type': metric.kind,
+                    'help': metric.help,
+                    'samples': [[suffix, list(map(list, pairs)), value] for suffix, pairs, value in metric.samples()]
+                }
+                for metric in self._metrics.values()
+            }
+
+    # Multi-worker aggregation
+
+    def flush(self, directory: str, force: bool = False, interval: float = 5.0):
+        """Write this worker's snapshot to ``directory`` (at most every ``interval`` seconds unless forced)"""
+        now = time.monotonic()
+        if not force and now - self._last_flush < interval:
+            return
+        self._last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        temp = f'{path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp, path)
+
+    def render(self, directory: Optional[str] = None) -> str:
+        if directory:
+            self.flush(directory, force=True)
+            families = merge_snapshots(_read_worker_snapshots(directory))
+        else:
+            families = self.snapshot()
+        text = render_families(_with_hit_ratios(families))
+        if prometheus_client is not None:
+            text += prometheus_client.generate_latest(prometheus_client.REGISTRY).decode('utf-8')
+        return text
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_worker_snapshots(directory: str) -> List[Dict]:
+    snapshots = []
+    for name in os.listdir(directory):
+        if not (name.startswith('metrics-') and name.endswith('.json')):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            pid = int(name[len('metrics-'):-len('.json')])
+        except ValueError:
+            continue
+        if not _pid_alive(pid):
+            # A restarted worker starts from zero; Prometheus treats the drop as a counter reset
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path, encoding='utf-8') as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict[str, Dict]:
+    """Sum samples with identical name and labels across worker snapshots"""
+    merged: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {'type': family['type'], 'help': family['help'], 'values': {}})
+            for suffix, pairs, value in family['samples']:
+                key = (suffix, tuple(tuple(pair) for pair in pairs))
+                target['values'][key] = target['values'].get(key, 0.0) + value
+    return {
+        name: {'type': family['type'], 'help': family['help'],
+               'samples': [[suffix, [list(pair) for pair in pairs], value]
+                           for (suffix, pairs), value in family['values'].items()]}
+        for name, family in merged.items()
+    }
+
+
+def _with_hit_ratios(families: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Derive ``cache_hit_ratio`` after merging, since per-worker ratios cannot be summed"""
+    totals: Dict[Tuple, List[float]] = {}
+    for index, name in enumerate(('cache_hits', 'cache_misses')):
+        for _, pairs, value in families.get(name, {}).get('samples', []):
+            totals.setdefault(tuple(map(tuple, pairs)), [0.0, 0.0])[index] += value
+    samples = [['', [list(pair) for pair in pairs], hits / (hits + misses)]
+               for pairs, (hits, misses) in totals.items() if hits + misses]
+    if samples:
+        families = dict(families, cache_hit_ratio={
+            'type': 'gauge', 'help': 'Cache hits / lookups, across workers', 'samples': samples})
+    return families
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return f'{int(value)}.0' if isinstance(value, float) else str(value)
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_families(families: Dict[str, Dict]) -> str:
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for suffix, pairs, value in family['samples']:
+            labels = ','.join(f'{key}="{_escape(str(val))}"' for key, val in pairs)
+            lines.append(f"{name}{suffix}{{{labels}}} {_format_value(value)}" if labels
+                         else f"{name}{suffix} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'http_requests', 'HTTP requests handled', ('blueprint', 'route', 'method', 'status'))
+http_request_duration = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency, including streamed bodies',
+    ('blueprint', 'route', 'method'))
+http_in_flight = registry.gauge('http_requests_in_flight', 'HTTP requests being handled', ('blueprint',))
+
+db_queries = registry.counter('db_queries', 'SQL statements executed')
+db_query_duration = registry.histogram('db_query_duration_seconds', 'SQL statement latency')
+db_pool = registry.gauge('db_pool_connections', 'SQLAlchemy connection pool usage', ('state',))
+
+cache_hits = registry.counter('cache_hits', 'Cache lookups that found a live entry', ('cache',))
+cache_misses = registry.counter('cache_misses', 'Cache lookups that missed or found an expired entry', ('cache',))
+cache_size = registry.gauge('cache_entries', 'Entries currently cached', ('cache',))
+
+model_load_duration = registry.histogram(
+    'model_load_duration_seconds', 'Time to load an ML model', ('model',), buckets=LOAD_BUCKETS)
+
+external_call_duration = registry.histogram(
+    'external_call_duration_seconds', 'Latency of calls to external services', ('service', 'operation'))
+external_call_errors = registry.counter(
+    'external_call_errors', 'Failed calls to external services', ('service', 'operation'))
+
+llm_time_to_first_token = registry.histogram(
+    'llm_time_to_first_token_seconds', 'Time until a streamed LLM reply produced its first chunk',
+    ('provider', 'operation'))
+llm_streams = registry.counter(
+    'llm_streams', 'Streamed LLM replies by outcome (completed, cached, cancelled, timeout, error)',
+    ('provider', 'outcome'))
+resume_analyses = registry.counter(
+    'resume_analyses', 'Resume analyses by engine and routing reason', ('provider', 'reason'))
+
+
+@contextmanager
+def track_external_call(service: str, operation: str):
+    """Time a call to ``service`` and count it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        external_call_errors.inc(service=service, operation=operation)
+        raise
+    finally:
+        external_call_duration.observe(time.perf_counter() - started, service=service, operation=operation)
+
+
+def record_external_call(service: str, operation: str, seconds: float, error: bool = False):
+    external_call_duration.observe(seconds, service=service, operation=operation)
+    if error:
+        external_call_errors.inc(service=service, operation=operation)
+
+
+def metrics_dir() -> Optional[str]:
+    return os.environ.get('METRICS_DIR') or os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def flush_interval() -> float:
+    return float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+
+
+def maybe_flush():
+    """Publish this worker's snapshot for the other workers, throttled"""
+    directory = metrics_dir()
+    if directory:
+        try:
+            registry.flush(directory, interval=flush_interval())
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {e}")
+
+
+def _collect_caches():
+    # Read the process-wide caches only once something created them: building
+    # the parse cache would import the resume parser (spaCy) just for a scrape
+    from utils import llm_gateway, parse_cache, storage_listing, user_cache
+    caches = {}
+    if llm_gateway._gateway is not None:
+        caches['llm'] = llm_gateway._gateway.cache
+    if user_cache._user_cache is not None:
+        caches['user_by_id'] = user_cache._user_cache.by_id
+        caches['user_by_email'] = user_cache._user_cache.email_index
+    if storage_listing._storage_listing is not None:
+        caches['storage_listing'] = storage_listing._storage_listing.cache
+    if parse_cache._parse_cache is not None:
+        caches['parse'] = parse_cache._parse_cache.memory
+    for name, cache in caches.items():
+        stats = cache.stats()
+        cache_hits.set(stats['hits'], cache=name)
+        cache_misses.set(stats['misses'], cache=name)
+        cache_size.set(stats['size'], cache=name)
+
+
+def pool_collector(engine):
+    """Collector reporting ``engine``'s connection pool (QueuePool; other pools report what they have)"""
+    def collect_pool():
+        pool = engine.pool
+        for state in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, state, None)
+            if callable(method):
+                db_pool.set(method(), state=state)
+    return collect_pool
+
+
+registry.register_collector('caches', _collect_caches)
+
+
+def render() -> str:
+    return registry.render(metrics_dir())
+
+
+def init_metrics(app):
+    """Serve ``/metrics`` and report the app's connection pool"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    from extensions import db
+    with app.app_context():
+        registry.register_collector('db_pool', pool_collector(db.engine))
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        token = app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return jsonify({'error': 'Unauthorized'}), 401
+        return Response(render(), content_type=CONTENT_TYPE)
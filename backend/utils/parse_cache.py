@@ -0,0 +1,109 @@
+"""
+Content-addressed cache of parsed resumes.
+
+Entries are keyed by the SHA-256 of the uploaded file bytes plus
+``ResumeParser.PARSER_VERSION``, so re-uploading an identical file skips the
+whole extraction/NLP pipeline, and bumping the parser version invalidates
+everything parsed by older code.
+
+A bounded in-memory LRU sits in front of an optional SQLite file
+(``PARSE_CACHE_PATH``) that is shared by all workers and bulk-ingest processes
+on the host.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.cache import TTLCache
+
+CACHED_FIELDS = ('contact_info', 'skills', 'education', 'experience', 'experience_level')
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, version: str, path: Optional[str] = None, maxsize: int = 512):
+        self.version = version
+        self.memory = TTLCache(maxsize=maxsize)
+        self.path = path
+        self._local = threading.local()
+        if path:
+            conn = self._connect()
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS parsed_resumes ('
+                ' digest TEXT NOT NULL, parser_version TEXT NOT NULL, payload TEXT NOT NULL,'
+                ' created_at REAL NOT NULL, PRIMARY KEY (digest, parser_version))'
+            )
+            # Entries from other parser versions can never be hit again
+            conn.execute('DELETE FROM parsed_resumes WHERE parser_version != ?', (version,))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, data: bytes) -> Optional[Dict]:
+        return self.get_by_digest(content_digest(data))
+
+    def get_by_digest(self, digest: str) -> Optional[Dict]:
+        key = f"{digest}:{self.version}"
+        parsed = self.memory.get(key)
+        if parsed is not None or not self.path:
+            return parsed
+
+        row = self._connect().execute(
+            'SELECT payload FROM parsed_resumes WHERE digest = ? AND parser_version = ?',
+            (digest, self.version)
+        ).fetchone()
+        if row is None:
+            return None
+        parsed = json.loads(row[0])
+        self.memory.set(key, parsed)
+        return parsed
+
+    def set(self, data: bytes, parsed: Dict):
+        self.set_by_digest(content_digest(data), parsed)
+
+    def set_by_digest(self, digest: str, parsed: Dict):
+        entry = {field: parsed[field] for field in CACHED_FIELDS}
+        self.memory.set(f"{digest}:{self.version}", entry)
+        if self.path:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO parsed_resumes VALUES (?, ?, ?, ?)',
+                (digest, self.version, json.dumps(entry), time.time())
+            )
+
+    def stats(self) -> Dict:
+        stats = self.memory.stats()
+        stats['parser_version'] = self.version
+        stats['persistent'] = bool(self.path)
+        return stats
+
+
+_parse_cache: Optional[ParseCache] = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Process-wide parse cache, configured from the environment on first use"""
+    global _parse_cache
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                from utils.resume_parser import ResumeParser
+                _parse_cache = ParseCache(
+                    version=ResumeParser.PARSER_VERSION,
+                    path=os.environ.get('PARSE_CACHE_PATH'),
+                    maxsize=int(os.environ.get('PARSE_CACHE_SIZE', 512))
+                )
+    return _parse_cache
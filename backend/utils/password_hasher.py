@@ -0,0 +1,133 @@
+"""
+Password hashing service.
+
+bcrypt is deliberately slow, so a burst of signups/logins can pin every core
+and starve unrelated requests. Hashing here runs on a small, bounded thread
+pool (bcrypt releases the GIL while it works), which caps how many CPUs
+authentication may use at once. When more than ``max_pending`` hashes are
+already queued, new requests fail fast with ``HasherBusy`` so the route can
+answer 503 instead of piling up.
+
+The work factor comes from ``BCRYPT_LOG_ROUNDS``. Hashes made with a
+different cost are upgraded on the next successful login via
+``verify_and_update``.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import bcrypt
+
+from config import Config
+
+# bcrypt only looks at the first 72 bytes; older bcrypt releases truncated
+# silently and bcrypt 5 raises instead, so truncate to keep old hashes valid
+MAX_PASSWORD_BYTES = 72
+
+
+class HasherBusy(Exception):
+    """Too many password hashes are already queued"""
+
+
+def _encode(password: str) -> bytes:
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    """Work factor of a ``$2b$12$...`` hash, or None if it is not a bcrypt hash"""
+    parts = hashed.split('$') if hashed else []
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int = 12, workers: Optional[int] = None,
+                 max_pending: int = 64, timeout: float = 30):
+        if not 4 <= rounds <= 31:
+            raise ValueError(f"bcrypt rounds must be between 4 and 31, got {rounds}")
+        self.rounds = rounds
+        self.timeout = timeout
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._counts = {'hashed': 0, 'verified': 0, 'rehashed': 0, 'rejected_busy': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected_busy')
+            raise HasherBusy('Password hashing queue is full')
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result(timeout=self.timeout)
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(_encode(password), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def _check(password: str, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(_encode(password), hashed.encode('utf-8'))
+        except ValueError:
+            # Not a bcrypt hash (or corrupt); treat as a mismatch
+            return False
+
+    def hash(self, password: str) -> str:
+        hashed = self._run(self._hash, password)
+        self._count('hashed')
+        return hashed
+
+    def verify(self, password: str, hashed: str) -> bool:
+        if not hashed:
+            return False
+        matched = self._run(self._check, password, hashed)
+        self._count('verified')
+        return matched
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return hash_cost(hashed) != self.rounds
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; on success also return a new hash if the stored cost is outdated"""
+        if not self.verify(password, hashed):
+            return False, None
+        if not self.needs_rehash(hashed):
+            return True, None
+        new_hash = self.hash(password)
+        self._count('rehashed')
+        return True, new_hash
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counts)
+        stats['rounds'] = self.rounds
+        stats['workers'] = self.workers
+        return stats
+
+
+_password_hasher: Optional[PasswordHasher] = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                _password_hasher = PasswordHasher(
+                    rounds=Config.BCRYPT_LOG_ROUNDS,
+                    workers=Config.PASSWORD_HASH_WORKERS,
+                    max_pending=Config.PASSWORD_HASH_MAX_PENDING
+                )
+    return _password_hasher
@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets for internship listings.
+
+List endpoints accept query parameters that pick which keys each item
+carries, and the same choice drives what SQL loads, so columns that are not
+returned (long descriptions, timestamps) are never read either:
+
+- ``fields=id,title,location`` internship keys to return
+- ``fields[company]=name,logo``, ``fields[skills]=name``,
+  ``fields[interests]=name`` keys of the embedded objects
+- ``include=company,skills`` which relations to embed (``include=`` for none)
+- ``view=compact`` a preset for list views: no description or requirements,
+  and only names (plus logo and location for companies) in embedded objects
+
+``id`` is always returned. Without any of these parameters the full records
+are returned, as before.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from extensions import db
+from models import Company, Interest, Internship, InternshipInterest, InternshipSkill, Skill
+from utils.serializers import COMPANY, INTEREST, INTERNSHIP, SKILL, Serializer, SerializationContext
+
+INCLUDES = ('company', 'skills', 'interests')
+
+COMPACT = {
+    'internship': ('id', 'title', 'company_id', 'location', 'duration', 'salary', 'rating', 'applicants',
+                   'posted_date', 'deadline', 'remote'),
+    'company': ('id', 'name', 'logo', 'location'),
+    'skills': ('id', 'name'),
+    'interests': ('id', 'name'),
+}
+
+# Loaded even when not returned: the company relationship joins on company_id
+_INTERNSHIP_KEY_COLUMNS = ('id', 'company_id')
+
+
+def _names(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    return tuple(name.strip() for name in value.split(',') if name.strip())
+
+
+def _subset(spec: Serializer, names: Optional[Iterable[str]], label: str) -> Serializer:
+    if names is None:
+        return spec
+    try:
+        return spec.only({'id', *names})
+    except ValueError as e:
+        raise ValueError(f"{e} (in fields for {label})") from None
+
+
+def _columns(model, names: Iterable[str]):
+    return [getattr(model, name) for name in dict.fromkeys(names)]
+
+
+class InternshipProjection:
+    def __init__(self, fields: Optional[Iterable[str]] = None, include: Iterable[str] = INCLUDES,
+                 company_fields: Optional[Iterable[str]] = None, skill_fields: Optional[Iterable[str]] = None,
+                 interest_fields: Optional[Iterable[str]] = None):
+        include = tuple(include)
+        unknown = set(include).difference(INCLUDES)
+        if unknown:
+            raise ValueError(f"Unknown include(s): {', '.join(sorted(unknown))}")
+        self.include = include
+        self.internship = _subset(INTERNSHIP, fields, 'internships')
+        self.company = _subset(COMPANY, company_fields, 'company') if 'company' in include else None
+        self.skills = _subset(SKILL, skill_fields, 'skills') if 'skills' in include else None
+        self.interests = _subset(INTEREST, interest_fields, 'interests') if 'interests' in include else None
+
+    @classmethod
+    def from_args(cls, args) -> 'InternshipProjection':
+        """Projection for a request's query string; ValueError on unknown views, fields or includes"""
+        view = args.get('view', 'full')
+        if view not in ('full', 'compact'):
+            raise ValueError(f"Unknown view: {view}")
+        preset: Dict[str, Tuple[str, ...]] = COMPACT if view == 'compact' else {}
+        include = _names(args.get('include'))
+        return cls(
+            fields=_names(args.get('fields')) or preset.get('internship'),
+            include=INCLUDES if include is None else include,
+            company_fields=_names(args.get('fields[company]')) or preset.get('company'),
+            skill_fields=_names(args.get('fields[skills]')) or preset.get('skills'),
+            interest_fields=_names(args.get('fields[interests]')) or preset.get('interests')
+        )
+
+    def loader_options(self, streaming: bool = False) -> List[Any]:
+        """Loader options for an ``Internship`` query (or nested under a relationship to it).
+
+        ``streaming`` loads skills and interests with a per-batch SELECT ... IN
+        instead of a join, as ``Query.yield_per`` requires for collections.
+        """
+        collection = db.selectinload if streaming else db.joinedload
+        options = []
+        if self.internship is not INTERNSHIP:
+            options.append(db.load_only(*_columns(Internship, _INTERNSHIP_KEY_COLUMNS + self.internship.names)))
+        if self.company is not None:
+            option = db.joinedload(Internship.company)
+            if self.company is not COMPANY:
+                option = option.load_only(*_columns(Company, self.company.names))
+            options.append(option)
+        if self.skills is not None:
+            option = collection(Internship.skills).joinedload(InternshipSkill.skill)
+            if self.skills is not SKILL:
+                option = option.load_only(*_columns(Skill, self.skills.names))
+            options.append(option)
+        if self.interests is not None:
+            option = collection(Internship.interests).joinedload(InternshipInterest.interest)
+            if self.interests is not INTEREST:
+                option = option.load_only(*_columns(Interest, self.interests.names))
+            options.append(option)
+        return options
+
+    def serialize(self, context: SerializationContext, internship) -> Dict[str, Any]:
+        return context.internship(
+            internship,
+            company=self.company or False,
+            skills=self.skills or False,
+            interests=self.interests or False,
+            spec=self.internship
+        )
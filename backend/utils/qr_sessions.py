@@ -0,0 +1,237 @@
+"""
+QR code login sessions.
+
+A desktop browser asks for a session token and renders it as a QR code. A
+phone that is already signed in scans it and approves the session, which
+attaches a freshly issued access token. The desktop then receives that
+access token exactly once, through a long-poll or an SSE stream that wakes
+up as soon as the session changes, instead of polling in a loop.
+
+Sessions expire after ``QR_SESSION_TTL`` seconds and live in a store:
+
+- ``MemoryQRStore`` (default) keeps them in the process.
+- ``SQLiteQRStore`` is used when ``QR_STORE_PATH`` is set, so the phone's
+  scan and the desktop's status request may land on different web workers.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+PENDING = 'pending'
+APPROVED = 'approved'
+CONSUMED = 'consumed'
+EXPIRED = 'expired'
+
+
+class QRSession:
+    def __init__(self, token: str, expires_at: float, status: str = PENDING, user_id: Optional[str] = None,
+                 access_token: Optional[str] = None, created_at: Optional[float] = None,
+                 approved_at: Optional[float] = None):
+        self.token = token
+        self.status = status
+        self.user_id = user_id
+        self.access_token = access_token
+        self.created_at = created_at or time.time()
+        self.expires_at = expires_at
+        self.approved_at = approved_at
+
+    @property
+    def expired(self) -> bool:
+        return self.status == PENDING and time.time() >= self.expires_at
+
+    @property
+    def current_status(self) -> str:
+        return EXPIRED if self.expired else self.status
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.current_status,
+            'scanned': self.status in (APPROVED, CONSUMED),
+            'expires_in': max(0, int(self.expires_at - time.time()))
+        }
+
+    @classmethod
+    def from_row(cls, row) -> 'QRSession':
+        return cls(row['token'], row['expires_at'], row['status'], row['user_id'],
+                   row['access_token'], row['created_at'], row['approved_at'])
+
+
+class MemoryQRStore:
+    """QR sessions kept in this process only"""
+
+    def __init__(self):
+        self._sessions: Dict[str, QRSession] = {}
+        self._lock = threading.Lock()
+
+    def add(self, session: QRSession):
+        with self._lock:
+            self._sessions[session.token] = session
+
+    def get(self, token: str) -> Optional[QRSession]:
+        with self._lock:
+            session = self._sessions.get(token)
+            return QRSession(**vars(session)) if session else None
+
+    def approve(self, token: str, user_id: str, access_token: str) -> bool:
+        with self._lock:
+            session = self._sessions.get(token)
+            if not session or session.status != PENDING or session.expired:
+                return False
+            session.status = APPROVED
+            session.user_id = user_id
+            session.access_token = access_token
+            session.approved_at = time.time()
+            return True
+
+    def consume(self, token: str) -> Optional[str]:
+        with self._lock:
+            session = self._sessions.get(token)
+            if not session or session.status != APPROVED:
+                return None
+            session.status = CONSUMED
+            access_token, session.access_token = session.access_token, None
+            return access_token
+
+    def purge_expired(self, grace: float):
+        cutoff = time.time() - grace
+        with self._lock:
+            for token in [t for t, s in self._sessions.items() if s.expires_at < cutoff]:
+                del self._sessions[token]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+class SQLiteQRStore:
+    """QR sessions shared by all web workers on the host through one SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS qr_sessions ('
+            ' token TEXT PRIMARY KEY, status TEXT NOT NULL, user_id TEXT, access_token TEXT,'
+            ' created_at REAL NOT NULL, expires_at REAL NOT NULL, approved_at REAL)'
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def add(self, session: QRSession):
+        self._connect().execute(
+            'INSERT INTO qr_sessions VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (session.token, session.status, session.user_id, session.access_token,
+             session.created_at, session.expires_at, session.approved_at)
+        )
+
+    def get(self, token: str) -> Optional[QRSession]:
+        row = self._connect().execute('SELECT * FROM qr_sessions WHERE token = ?', (token,)).fetchone()
+        return QRSession.from_row(row) if row else None
+
+    def approve(self, token: str, user_id: str, access_token: str) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(
+            'UPDATE qr_sessions SET status = ?, user_id = ?, access_token = ?, approved_at = ?'
+            ' WHERE token = ? AND status = ? AND expires_at > ?',
+            (APPROVED, user_id, access_token, now, token, PENDING, now)
+        )
+        return cursor.rowcount == 1
+
+    def consume(self, token: str) -> Optional[str]:
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT access_token FROM qr_sessions WHERE token = ? AND status = ?', (token, APPROVED)
+            ).fetchone()
+            if row:
+                conn.execute('UPDATE qr_sessions SET status = ?, access_token = NULL WHERE token = ?',
+                             (CONSUMED, token))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return row['access_token'] if row else None
+
+    def purge_expired(self, grace: float):
+        self._connect().execute('DELETE FROM qr_sessions WHERE expires_at < ?', (time.time() - grace,))
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM qr_sessions').fetchone()[0]
+
+
+class QRLoginStore:
+    def __init__(self, ttl: int = 300, store_path: Optional[str] = None):
+        self.ttl = ttl
+        self.store = SQLiteQRStore(store_path) if store_path else MemoryQRStore()
+        self._changed = threading.Condition()
+
+    def create(self) -> QRSession:
+        # Keep approved-but-unclaimed sessions a little past expiry before dropping them
+        self.store.purge_expired(grace=self.ttl)
+        session = QRSession(secrets.token_urlsafe(32), time.time() + self.ttl)
+        self.store.add(session)
+        return session
+
+    def get(self, token: str) -> Optional[QRSession]:
+        return self.store.get(token)
+
+    def approve(self, token: str, user_id: str, access_token: str) -> bool:
+        """Attach ``access_token`` to a pending session; False if unknown, expired or already used"""
+        approved = self.store.approve(token, user_id, access_token)
+        if approved:
+            with self._changed:
+                self._changed.notify_all()
+        return approved
+
+    def consume(self, token: str) -> Optional[str]:
+        """Hand out the approved session's access token, at most once"""
+        return self.store.consume(token)
+
+    def wait(self, token: str, timeout: float = 25.0) -> Optional[QRSession]:
+        """Block until the session leaves ``pending`` (or expires) or ``timeout`` elapses.
+
+        Approvals made by another worker (shared SQLite store) are picked up
+        by re-reading every half second.
+        """
+        deadline = time.monotonic() + timeout
+        session = self.get(token)
+        while session is not None and session.current_status == PENDING:
+            remaining = min(deadline - time.monotonic(), session.expires_at - time.time())
+            if remaining <= 0:
+                break
+            with self._changed:
+                self._changed.wait(min(remaining, 0.5))
+            session = self.get(token)
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        return {'sessions': self.store.count(), 'ttl_seconds': self.ttl}
+
+
+_qr_login_store: Optional[QRLoginStore] = None
+_qr_login_store_lock = threading.Lock()
+
+
+def get_qr_login_store() -> QRLoginStore:
+    """Process-wide QR session store, configured from the environment on first use"""
+    global _qr_login_store
+    if _qr_login_store is None:
+        with _qr_login_store_lock:
+            if _qr_login_store is None:
+                _qr_login_store = QRLoginStore(
+                    ttl=int(os.environ.get('QR_SESSION_TTL', 300)),
+                    store_path=os.environ.get('QR_STORE_PATH')
+                )
+    return _qr_login_store
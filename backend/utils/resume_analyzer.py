@@ -0,0 +1,148 @@
+"""
+Local resume analysis.
+
+Produces the same JSON as the Gemini review (summary, match_score, strengths,
+gaps, recommendations) from the regex stages of ``ResumeParser`` (skills,
+education, experience) and the ``InternshipMatcher`` score against the job
+description, in milliseconds and without a network call.
+
+Each analysis also gets a confidence between 0 and 1: how much of the resume
+(and the job description) the parser actually recognised. ``resume_ai`` uses
+it to decide whether a request is worth sending to the LLM.
+"""
+
+import re
+import threading
+from typing import Dict, List, Tuple
+
+# Below this many words the parser has too little to go on
+MIN_RESUME_WORDS = 80
+
+# Number of recognised skills that counts as a well-covered skills section
+SKILL_TARGET = 5
+
+QUANTIFIED_PATTERN = re.compile(r'\d+\s*%|\$\s*\d|\b\d+[kKmM]?\+?\s+(?:users|customers|requests|students|projects|people)\b')
+
+
+class LocalResumeAnalyzer:
+    def __init__(self, parser=None):
+        if parser is None:
+            # sklearn loads here; spaCy and NLTK are not needed for the regex stages
+            from utils.resume_parser import ResumeParser
+            parser = ResumeParser(load_nlp=False)
+        self.parser = parser
+
+    def profile(self, resume_text: str) -> Dict:
+        experience = self.parser.extract_experience(resume_text)
+        return {
+            'skills': sorted(self.parser.match_known_skills(resume_text)),
+            'education': self.parser.extract_education(resume_text),
+            'experience': experience,
+            'experience_level': self.parser._calculate_experience_level(experience, resume_text),
+        }
+
+    def analyze(self, resume_text: str, job_description: str = '') -> Tuple[Dict, float]:
+        """Return ``(analysis, confidence)`` for a resume and optional job description"""
+        profile = self.profile(resume_text)
+        skills = profile['skills']
+        quantified = bool(QUANTIFIED_PATTERN.search(resume_text))
+        signals = [
+            len(resume_text.split()) >= MIN_RESUME_WORDS,
+            len(skills) >= 3,
+            bool(profile['education']),
+            bool(profile['experience']),
+        ]
+
+        strengths, gaps, recommendations = [], [], []
+        if job_description:
+            match, required, missing = self._match(profile, job_description)
+            # Without recognisable requirements the skill score is a neutral guess
+            signals.append(len(required) >= 2)
+            match_score = match['match_score']
+            matched = [skill for skill in required if skill not in missing]
+            if matched:
+                strengths.append(f"Covers {len(matched)} of {len(required)} required skills: {', '.join(matched)}")
+            if missing:
+                gaps.append(f"Missing required skills: {', '.join(missing)}")
+                recommendations.append(f"Add projects or coursework that show {', '.join(missing[:5])}")
+            if match['text_similarity'] < 10:
+                recommendations.append('Mirror the wording of the job description in your summary and experience')
+        else:
+            match_score = self._completeness(profile, quantified)
+            recommendations.append('Provide a job description for a tailored match score')
+
+        if skills:
+            strengths.append(f"Technical skills: {', '.join(skills[:10])}")
+        if len(skills) < SKILL_TARGET:
+            gaps.append('Few recognisable technical skills')
+            recommendations.append('List your tools and technologies in a dedicated skills section')
+        if profile['education']:
+            degree = profile['education'][0]
+            institution = f" ({degree['institution']})" if degree['institution'] else ''
+            strengths.append(f"Education: {degree['degree'].title()}{institution}")
+        else:
+            gaps.append('No degree or education section found')
+            recommendations.append('Add an education section with degree, institution and graduation year')
+        if profile['experience']:
+            strengths.append(f"{len(profile['experience'])} relevant role(s) listed")
+        else:
+            gaps.append('No internships, jobs or projects recognised')
+            recommendations.append('Describe internships, jobs or projects with your role and dates')
+        if quantified:
+            strengths.append('Achievements are quantified')
+        else:
+            recommendations.append('Quantify achievements with numbers (users, % improvement, time saved)')
+
+        match_score = max(0, min(100, int(match_score)))
+        summary = (f"{profile['experience_level']} candidate with {len(skills)} recognised technical skill(s), "
+                   f"{len(profile['education'])} education entr{'y' if len(profile['education']) == 1 else 'ies'} "
+                   f"and {len(profile['experience'])} role(s).")
+        if job_description:
+            summary += f" Estimated match with the job description: {match_score}/100."
+
+        analysis = {
+            'summary': summary,
+            'match_score': match_score,
+            'strengths': strengths,
+            'gaps': gaps,
+            'recommendations': recommendations,
+        }
+        return analysis, round(sum(signals) / len(signals), 2)
+
+    def _match(self, profile: Dict, job_description: str) -> Tuple[Dict, List[str], List[str]]:
+        from utils.resume_parser import InternshipMatcher
+
+        required = sorted(self.parser.match_known_skills(job_description))
+        have = {skill.lower() for skill in profile['skills']}
+        missing = [skill for skill in required if skill.lower() not in have]
+        internship = {
+            'title': '',
+            'description': job_description,
+            'required_skills': required,
+            'education_requirements': [edu['degree'] for edu in self.parser.extract_education(job_description)],
+            'experience_level': self.parser._calculate_experience_level([], job_description),
+        }
+        # A private index: job descriptions are one-off and must not grow the catalog's
+        match = InternshipMatcher().match_candidates_to_internships(profile, [internship])[0]
+        return match, required, missing
+
+    @staticmethod
+    def _completeness(profile: Dict, quantified: bool) -> float:
+        """Resume strength without a job description: skills, education, experience, numbers"""
+        return (min(len(profile['skills']), SKILL_TARGET * 2) * 5
+                + (20 if profile['education'] else 0)
+                + (20 if profile['experience'] else 0)
+                + (10 if quantified else 0))
+
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_local_analyzer() -> LocalResumeAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = LocalResumeAnalyzer()
+    return _analyzer
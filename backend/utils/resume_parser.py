@@ -1,27 +1,47 @@
+import hashlib
+import io
 import os
 import re
-import spacy
-import nltk
-import fitz  # PyMuPDF
-import pandas as pd
-from docx import Document
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import threading
+import time
 import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
 from typing import Dict, List, Optional, Tuple
 import json
 
+from utils.metrics import model_load_duration
+
 class ResumeParser:
-    def __init__(self):
+    # Bump whenever extraction output changes; invalidates the parse cache
+    PARSER_VERSION = '2'
+    
+    def __init__(self, load_nlp: bool = True):
+        """With ``load_nlp=False`` spaCy and NLTK are not loaded: only the
+        regex-based stages run (no name extraction, no entity-based skills).
+        """
+        self.nlp = None
+        self.stop_words = set()
+        if load_nlp:
+            self._load_nlp()
+        
+        # Load skill database
+        self.tech_skills = self._load_skill_database()
+        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+    
+    def _load_nlp(self):
+        import spacy
+        import nltk
+        from nltk.corpus import stopwords
+        
         # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Downloading spaCy model...")
-            spacy.cli.download("en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
+        with model_load_duration.time(model='spacy_en_core_web_sm'):
+            try:
+                self.nlp = spacy.load("en_core_web_sm")
+            except OSError:
+                print("Downloading spaCy model...")
+                spacy.cli.download("en_core_web_sm")
+                self.nlp = spacy.load("en_core_web_sm")
         
         # Load NLTK resources
         try:
@@ -29,10 +49,6 @@ class ResumeParser:
         except:
             nltk.download('stopwords')
             self.stop_words = set(stopwords.words('english'))
-        
-        # Load skill database
-        self.tech_skills = self._load_skill_database()
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
     
     def _load_skill_database(self) -> List[str]:
         """Load comprehensive skill database"""
@@ -82,9 +98,30 @@ class ResumeParser:
         
         return text
     
+    def extract_text_from_bytes(self, data: bytes, filename: str) -> str:
+        """Extract text from in-memory PDF or DOCX content"""
+        file_extension = os.path.splitext(filename)[1].lower()
+        
+        if file_extension == '.pdf':
+            try:
+                import fitz  # PyMuPDF
+                doc = fitz.open(stream=data, filetype='pdf')
+                text = ""
+                for page in doc:
+                    text += page.get_text()
+                doc.close()
+                return text
+            except Exception as e:
+                raise Exception(f"Error extracting text from PDF: {str(e)}")
+        elif file_extension in ['.docx', '.doc']:
+            return self._extract_text_from_docx(io.BytesIO(data))
+        else:
+            raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
+    
     def _extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF using PyMuPDF"""
         try:
+            import fitz  # PyMuPDF
             doc = fitz.open(file_path)
             text = ""
             for page in doc:
@@ -94,9 +131,10 @@ class ResumeParser:
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
-    def _extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+    def _extract_text_from_docx(self, file_path) -> str:
+        """Extract text from DOCX file (path or file-like object)"""
         try:
+            from docx import Document
             doc = Document(file_path)
             text = ""
             for paragraph in doc.paragraphs:
@@ -140,6 +178,8 @@ class ResumeParser:
             contact_info['github'] = f"github.com/{github_matches[0]}"
         
         # Name extraction using NLP
+        if self.nlp is None:
+            return contact_info
         doc = self.nlp(text[:1000])  # First 1000 characters
         for ent in doc.ents:
             if ent.label_ == "PERSON" and not contact_info['name']:
@@ -152,6 +192,23 @@ class ResumeParser:
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills using multiple methods"""
+        extracted_skills = self.match_known_skills(text)
+        
+        # NLP-based extraction
+        if self.nlp is not None:
+            doc = self.nlp(text)
+            
+            # Extract entities that might be skills
+            for ent in doc.ents:
+                if ent.label_ in ["ORG", "PRODUCT"] and ent.text not in extracted_skills:
+                    # Check if it's a known technology
+                    if any(skill.lower() in ent.text.lower() for skill in self.tech_skills):
+                        extracted_skills.append(ent.text)
+        
+        return list(set(extracted_skills))  # Remove duplicates
+    
+    def match_known_skills(self, text: str) -> List[str]:
+        """Skills from the skill database mentioned in ``text`` (regex only, no NLP)"""
         extracted_skills = []
         text_lower = text.lower()
         
@@ -162,17 +219,7 @@ class ResumeParser:
             if re.search(pattern, text_lower):
                 extracted_skills.append(skill)
         
-        # Method 2: NLP-based extraction
-        doc = self.nlp(text)
-        
-        # Extract entities that might be skills
-        for ent in doc.ents:
-            if ent.label_ in ["ORG", "PRODUCT"] and ent.text not in extracted_skills:
-                # Check if it's a known technology
-                if any(skill.lower() in ent.text.lower() for skill in self.tech_skills):
-                    extracted_skills.append(ent.text)
-        
-        # Method 3: Pattern-based extraction for common skill patterns
+        # Method 2: Pattern-based extraction for common skill patterns
         skill_patterns = [
             r'proficient in ([^.]+)',
             r'experience with ([^.]+)',
@@ -322,33 +369,51 @@ class ResumeParser:
         
         return ""
     
-    def parse_resume(self, file_path: str) -> Dict:
+    def parse_resume(self, file_path: str, timings: Optional[Dict[str, float]] = None) -> Dict:
         """Main function to parse resume and extract all information"""
         try:
             # Extract text
+            started = time.perf_counter()
             text = self.extract_text_from_file(file_path)
+            if timings is not None:
+                timings['extract_text'] = time.perf_counter() - started
             
-            # Extract different components
-            contact_info = self.extract_contact_info(text)
-            skills = self.extract_skills(text)
-            education = self.extract_education(text)
-            experience = self.extract_experience(text)
-            
-            # Calculate experience level
-            experience_level = self._calculate_experience_level(experience, text)
-            
-            return {
-                'contact_info': contact_info,
-                'skills': skills,
-                'education': education,
-                'experience': experience,
-                'experience_level': experience_level,
-                'raw_text': text[:500] + "..." if len(text) > 500 else text  # First 500 chars for preview
-            }
+            return self.parse_text(text, timings)
         
         except Exception as e:
             raise Exception(f"Error parsing resume: {str(e)}")
     
+    def parse_text(self, text: str, timings: Optional[Dict[str, float]] = None) -> Dict:
+        """Extract all resume components from already-extracted text.
+        
+        When a ``timings`` dict is passed, the wall time (seconds) of each
+        stage is recorded in it under the stage name.
+        """
+        def timed(stage, func, *args):
+            started = time.perf_counter()
+            result = func(*args)
+            if timings is not None:
+                timings[stage] = time.perf_counter() - started
+            return result
+        
+        # Extract different components
+        contact_info = timed('contact_info', self.extract_contact_info, text)
+        skills = timed('skills', self.extract_skills, text)
+        education = timed('education', self.extract_education, text)
+        experience = timed('experience', self.extract_experience, text)
+        
+        # Calculate experience level
+        experience_level = self._calculate_experience_level(experience, text)
+        
+        return {
+            'contact_info': contact_info,
+            'skills': skills,
+            'education': education,
+            'experience': experience,
+            'experience_level': experience_level,
+            'raw_text': text[:500] + "..." if len(text) > 500 else text  # First 500 chars for preview
+        }
+    
     def _calculate_experience_level(self, experiences: List[Dict], text: str) -> str:
         """Calculate experience level based on resume content"""
         # Count years mentioned
@@ -376,9 +441,90 @@ class ResumeParser:
         else:
             return "Entry-level"
 
+class InternshipCorpusIndex:
+    """TF-IDF model of the internship catalog, fitted once and reused by requests.
+    
+    Rows of the sparse matrix are keyed by a digest of each internship's text,
+    so edited or new internships are noticed without any invalidation. They
+    are transformed with the fitted vocabulary and appended. The catalog of
+    the current request is refitted from scratch once the rows appended since
+    the last fit exceed ``refit_fraction`` of it, or when the fit is older
+    than ``max_age`` seconds (dropping rows of removed internships).
+    """
+    
+    def __init__(self, max_age: float = 3600.0, refit_fraction: float = 0.2):
+        self.max_age = max_age
+        self.refit_fraction = refit_fraction
+        self.fits = 0
+        self.extensions = 0
+        self._lock = threading.Lock()
+        # (vectorizer, matrix, {digest: row}, fitted_at, fitted_rows), replaced as a whole
+        self._state = None
+    
+    def vectors(self, texts: List[str]):
+        """Return the fitted vectorizer and the L2-normalised TF-IDF rows of ``texts``"""
+        digests = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in texts]
+        with self._lock:
+            state = self._state
+            new = {}
+            if state is not None:
+                rows = state[2]
+                new = {digest: text for digest, text in zip(digests, texts) if digest not in rows}
+            if (state is None or time.monotonic() - state[3] > self.max_age
+                    or len(state[2]) + len(new) - state[4] > self.refit_fraction * state[4]):
+                state = self._fit(texts, digests)
+            elif new:
+                state = self._extend(state, new)
+            self._state = state
+        vectorizer, matrix, rows = state[:3]
+        return vectorizer, matrix[[rows[digest] for digest in digests]]
+    
+    def _fit(self, texts: List[str], digests: List[str]):
+        with model_load_duration.time(model='internship_tfidf'):
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+            unique = dict(zip(digests, texts))
+            matrix = vectorizer.fit_transform(list(unique.values())).tocsr()
+        self.fits += 1
+        return vectorizer, matrix, {digest: row for row, digest in enumerate(unique)}, time.monotonic(), len(unique)
+    
+    def _extend(self, state, new: Dict[str, str]):
+        vectorizer, matrix, rows, fitted_at, fitted_rows = state
+        added = vectorizer.transform(list(new.values()))
+        rows = dict(rows)
+        for digest in new:
+            rows[digest] = len(rows)
+        self.extensions += 1
+        return vectorizer, sp.vstack([matrix, added], format='csr'), rows, fitted_at, fitted_rows
+    
+    def stats(self) -> Dict:
+        state = self._state
+        return {
+            'fits': self.fits,
+            'extensions': self.extensions,
+            'rows': state[1].shape[0] if state else 0,
+            'vocabulary': len(state[0].vocabulary_) if state else 0,
+        }
+
+
+_corpus_index = None
+_corpus_index_lock = threading.Lock()
+
+def get_internship_index() -> InternshipCorpusIndex:
+    """Corpus index shared by all recommendation requests in this process"""
+    global _corpus_index
+    if _corpus_index is None:
+        with _corpus_index_lock:
+            if _corpus_index is None:
+                _corpus_index = InternshipCorpusIndex(
+                    max_age=float(os.environ.get('MATCH_INDEX_MAX_AGE', 3600)),
+                    refit_fraction=float(os.environ.get('MATCH_INDEX_REFIT_FRACTION', 0.2)),
+                )
+    return _corpus_index
+
 class InternshipMatcher:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+    def __init__(self, index: Optional[InternshipCorpusIndex] = None):
+        """Without a shared ``index`` the matcher fits a private one on its first call"""
+        self.index = index if index is not None else InternshipCorpusIndex()
     
     def match_candidates_to_internships(self, candidate_profile: Dict, internships: List[Dict]) -> List[Dict]:
         """Match a candidate to internships using ML algorithms"""
@@ -391,15 +537,17 @@ class InternshipMatcher:
         # Prepare internship texts
         internship_texts = [self._prepare_internship_text(internship) for internship in internships]
         
-        # Vectorize all texts
-        all_texts = [candidate_text] + internship_texts
-        tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-        
-        # Calculate similarities
-        candidate_vector = tfidf_matrix[0:1]
-        internship_vectors = tfidf_matrix[1:]
-        
-        similarities = cosine_similarity(candidate_vector, internship_vectors)[0]
+        # Only the candidate is vectorized per request; internship rows come from the index
+        try:
+            vectorizer, internship_vectors = self.index.vectors(internship_texts)
+        except ValueError:
+            # Empty vocabulary: the texts hold only stop words or punctuation (e.g. "N/A")
+            similarities = np.zeros(len(internships))
+        else:
+            candidate_vector = vectorizer.transform([candidate_text])
+            
+            # Rows are L2-normalised, so cosine similarity is a single sparse dot product
+            similarities = (internship_vectors @ candidate_vector.T).toarray().ravel()
         
         # Calculate comprehensive scores
         matches = []
@@ -0,0 +1,123 @@
+"""
+Schema bootstrap and readiness.
+
+The app no longer creates tables when it is constructed: every worker, test
+import and script used to reflect the schema and issue DDL on boot, racing
+each other on a fresh database. The schema is instead set up once, explicitly:
+
+    flask --app app init-db
+
+``init_db`` creates an empty database from the models and stamps it with the
+newest migration (the migrations only carry changes on top of the models'
+initial schema). A database built by the old create-on-boot path has tables
+but no revision; it is migrated from the base revision, which the migrations
+support by skipping what already exists. A versioned database is upgraded to
+the newest migration. On PostgreSQL it
+holds an advisory lock, so concurrent deploy hooks do not run DDL twice.
+
+``check_ready`` backs the readiness endpoint: the database answers and the
+schema is at the newest migration.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import click
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+from extensions import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# Arbitrary application-wide key for pg_advisory_lock
+_INIT_LOCK_KEY = 724411
+
+_head: Optional[str] = None
+_head_lock = threading.Lock()
+# Engines whose schema has been seen at head; the schema only moves forward, so stop re-checking
+_schema_ready = set()
+
+
+def head_revision() -> Optional[str]:
+    global _head
+    if _head is None:
+        with _head_lock:
+            if _head is None:
+                _head = ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+    return _head
+
+
+def current_revision(connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def _missing_tables(connection):
+    existing = set(inspect(connection).get_table_names())
+    return sorted(set(db.metadata.tables) - existing)
+
+
+def _stamp_head(connection):
+    MigrationContext.configure(connection).stamp(ScriptDirectory(MIGRATIONS_DIR), 'heads')
+
+
+def init_db() -> str:
+    """Create, stamp or upgrade the schema of the current app's database; returns what was done"""
+    engine = db.engine
+    with engine.connect() as lock_connection:
+        postgres = engine.dialect.name == 'postgresql'
+        if postgres:
+            lock_connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _INIT_LOCK_KEY})
+        try:
+            return _init_db(engine)
+        finally:
+            if postgres:
+                lock_connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _INIT_LOCK_KEY})
+
+
+def _init_db(engine) -> str:
+    with engine.begin() as connection:
+        revision = current_revision(connection)
+        missing = _missing_tables(connection)
+    if revision is None and len(missing) == len(db.metadata.tables):
+        # Empty database: the models already describe the newest schema
+        db.create_all()
+        with engine.begin() as connection:
+            _stamp_head(connection)
+        return 'created'
+    if revision == head_revision():
+        return 'up to date'
+    if revision is None:
+        # Built by the old create_all-on-boot path, in whatever shape the models had then.
+        # Add tables it never had, then run every migration from the base revision.
+        db.create_all()
+    import flask_migrate
+    flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+    return 'upgraded'
+
+
+def check_ready() -> Tuple[bool, Dict[str, Any]]:
+    """Whether the database is reachable and its schema is at the newest migration"""
+    engine = db.engine
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            if engine.url in _schema_ready:
+                return True, {'database': 'ok', 'schema': 'ok'}
+            revision = current_revision(connection)
+    except Exception as e:
+        print(f"Readiness check failed: {e}")
+        return False, {'database': 'unavailable'}
+    if revision != head_revision():
+        return False, {'database': 'ok', 'schema': 'pending', 'revision': revision, 'head': head_revision()}
+    _schema_ready.add(engine.url)
+    return True, {'database': 'ok', 'schema': 'ok'}
+
+
+def register_schema_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create the database schema, or migrate it to the newest revision."""
+        click.echo(f"Database schema {init_db()}")
@@ -0,0 +1,163 @@
+"""
+Response serialization.
+
+Field lists for the API's models are declared once as ``Serializer`` specs
+and compiled into a plain function that builds the dict in one expression,
+so dumping an object costs no per-field lookups or branching beyond the
+datetime conversions it needs.
+
+List endpoints repeat the same company, skill and interest on many
+internships. ``SerializationContext`` memoizes those shared sub-objects for
+the duration of a request, so each is serialized once and the same dict is
+reused wherever it appears. Memoized dicts are shared: add keys to the
+internship dict around them, never to the shared dicts themselves.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from flask import g, has_app_context
+
+
+def iso(value) -> str:
+    return value.isoformat()
+
+
+FieldSpec = Union[str, Tuple[str, Callable[[Any], Any]]]
+
+
+class Serializer:
+    """A fixed field list compiled into a ``dump(obj) -> dict`` function.
+
+    Each field is an attribute name, or ``(name, converter)`` where the
+    converter is applied to non-None values (``iso`` for datetimes).
+    """
+
+    def __init__(self, *fields: FieldSpec):
+        self.fields = tuple(field if isinstance(field, tuple) else (field, None) for field in fields)
+        self.names = tuple(name for name, _ in self.fields)
+        self.dump: Callable[[Any], Dict[str, Any]] = self._compile()
+        self._subsets: Dict[Tuple[str, ...], 'Serializer'] = {}
+
+    def only(self, names: Iterable[str]) -> 'Serializer':
+        """A serializer for a subset of these fields (kept in declaration order); cached"""
+        wanted = set(names)
+        unknown = wanted.difference(self.names)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        key = tuple(name for name in self.names if name in wanted)
+        if key == self.names:
+            return self
+        subset = self._subsets.get(key)
+        if subset is None:
+            subset = self._subsets[key] = Serializer(*(field for field in self.fields if field[0] in wanted))
+        return subset
+
+    def _compile(self):
+        namespace = {}
+        items = []
+        for index, (name, converter) in enumerate(self.fields):
+            if not name.isidentifier():
+                raise ValueError(f"Invalid field name: {name!r}")
+            if converter is None:
+                items.append(f"{name!r}: obj.{name}")
+            else:
+                namespace[f'_convert{index}'] = converter
+                items.append(f"{name!r}: None if (v{index} := obj.{name}) is None else _convert{index}(v{index})")
+        source = "def dump(obj):\n    return {" + ", ".join(items) + "}\n"
+        exec(compile(source, f'<serializer {", ".join(self.names)}>', 'exec'), namespace)
+        return namespace['dump']
+
+
+SKILL = Serializer('id', 'name', 'description', ('created_at', iso))
+
+INTEREST = Serializer('id', 'name', 'description', ('created_at', iso))
+
+COMPANY = Serializer(
+    'id', 'name', 'description', 'website', 'logo', 'location', 'size', 'industry',
+    ('created_at', iso), ('updated_at', iso)
+)
+
+INTERNSHIP = Serializer(
+    'id', 'title', 'description', 'company_id', 'location', 'duration', 'salary', 'requirements',
+    'team_size', 'rating', 'applicants', ('posted_date', iso), ('deadline', iso), 'remote', 'active',
+    ('created_at', iso), ('updated_at', iso)
+)
+
+INTERNSHIP_SKILL = Serializer('internship_id', 'skill_id', 'required')
+
+INTERNSHIP_INTEREST = Serializer('internship_id', 'interest_id')
+
+USER_SKILL = Serializer('user_id', 'skill_id', 'level')
+
+USER_INTEREST = Serializer('user_id', 'interest_id')
+
+APPLICATION = Serializer(
+    'id', 'user_id', 'internship_id', 'status', ('applied_at', iso), 'notes', 'resume_url', 'cover_letter'
+)
+
+SAVED_INTERNSHIP = Serializer('id', 'user_id', 'internship_id', ('saved_at', iso))
+
+
+class SerializationContext:
+    def __init__(self):
+        self._memo: Dict[Tuple[int, Any], Dict[str, Any]] = {}
+        self.hits = 0
+
+    def shared(self, serializer: Serializer, obj) -> Optional[Dict[str, Any]]:
+        """``serializer.dump(obj)``, computed once per object for this context"""
+        if obj is None:
+            return None
+        key = (id(serializer), obj.id)
+        data = self._memo.get(key)
+        if data is None:
+            data = self._memo[key] = serializer.dump(obj)
+        else:
+            self.hits += 1
+        return data
+
+    def company(self, company) -> Optional[Dict[str, Any]]:
+        return self.shared(COMPANY, company)
+
+    def internship_skill(self, link, skill: Serializer = SKILL) -> Dict[str, Any]:
+        data = INTERNSHIP_SKILL.dump(link)
+        data['skill'] = self.shared(skill, link.skill)
+        return data
+
+    def internship_interest(self, link, interest: Serializer = INTEREST) -> Dict[str, Any]:
+        data = INTERNSHIP_INTEREST.dump(link)
+        data['interest'] = self.shared(interest, link.interest)
+        return data
+
+    def internship(self, internship, company: Union[bool, Serializer] = True, skills: Union[bool, Serializer] = True,
+                   interests: Union[bool, Serializer] = True, spec: Serializer = INTERNSHIP) -> Dict[str, Any]:
+        """An internship with its company, skills and interests embedded, as the list endpoints return it.
+
+        Each of ``company``/``skills``/``interests`` is True (all fields),
+        False (left out) or the ``Serializer`` to embed it with.
+        """
+        data = spec.dump(internship)
+        if company:
+            data['company'] = self.shared(COMPANY if company is True else company, internship.company)
+        if skills:
+            skill = SKILL if skills is True else skills
+            data['skills'] = [self.internship_skill(link, skill) for link in internship.skills]
+        if interests:
+            interest = INTEREST if interests is True else interests
+            data['interests'] = [self.internship_interest(link, interest) for link in internship.interests]
+        return data
+
+    def application(self, application, **internship_parts) -> Dict[str, Any]:
+        """An application with its internship embedded; ``internship_parts`` as for ``internship``"""
+        data = APPLICATION.dump(application)
+        data['internship'] = self.internship(application.internship, **internship_parts)
+        return data
+
+
+def get_serialization_context() -> SerializationContext:
+    """The current request's context (a fresh one outside an app context)"""
+    if not has_app_context():
+        return SerializationContext()
+    context = g.get('_serialization_context')
+    if context is None:
+        context = g._serialization_context = SerializationContext()
+    return context
@@ -0,0 +1,86 @@
+"""
+Per-user listing of uploaded files in Supabase Storage.
+
+A user's files live under three prefixes (resumes/, images/, documents/).
+The three folders are listed concurrently, URLs are derived locally for
+public buckets or signed in a single batch request for private ones, and the
+assembled listing is cached per user until an upload or delete invalidates it.
+A listing with a failed folder or unsigned URL is returned but not cached.
+Invalidation is per process, so other workers may serve a listing up to
+``STORAGE_LIST_CACHE_TTL`` seconds old.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from config import Config
+from utils.cache import TTLCache
+
+FOLDERS = ('resumes', 'images', 'documents')
+
+_executor = ThreadPoolExecutor(max_workers=len(FOLDERS) * 2, thread_name_prefix='storage-list')
+
+
+class StorageListing:
+    def __init__(self, client, public: bool = True, signed_url_expires: int = 3600,
+                 cache_ttl: int = 60, cache_size: int = 2048):
+        self.client = client
+        self.public = public
+        self.signed_url_expires = signed_url_expires
+        # Signed URLs must outlive the cached listing that hands them out
+        ttl = min(cache_ttl, signed_url_expires // 2) if not public else cache_ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+
+    def list_user_files(self, user_id: str) -> List[Dict]:
+        files = self.cache.get(user_id)
+        if files is not None:
+            return files
+
+        folder_paths = [f"{folder}/{user_id}" for folder in FOLDERS]
+        listings = list(_executor.map(self.client.list_files, folder_paths))
+
+        complete = all(folder_files is not None for folder_files in listings)
+        entries = []
+        for folder, folder_path, folder_files in zip(FOLDERS, folder_paths, listings):
+            for file_info in folder_files or []:
+                if file_info.get('name'):
+                    entries.append((folder, f"{folder_path}/{file_info['name']}", file_info))
+
+        if self.public:
+            urls = {path: self.client.public_url(path) for _, path, _ in entries}
+        else:
+            urls = self.client.create_signed_urls([path for _, path, _ in entries], self.signed_url_expires)
+            if urls is None:
+                urls, complete = {}, False
+
+        files = [{
+            'name': file_info['name'],
+            'type': folder.rstrip('s'),  # Remove 's' from plural
+            'url': urls.get(path),
+            'size': (file_info.get('metadata') or {}).get('size'),
+            'created_at': file_info.get('created_at')
+        } for folder, path, file_info in entries]
+
+        # A partial answer is served once but not cached for the full TTL
+        if complete and all(file['url'] for file in files):
+            self.cache.set(user_id, files)
+        return files
+
+    def invalidate(self, user_id: str):
+        self.cache.delete(user_id)
+
+
+_storage_listing = None
+
+
+def get_storage_listing() -> StorageListing:
+    global _storage_listing
+    if _storage_listing is None:
+        from utils.supabase_client import supabase_client
+        _storage_listing = StorageListing(
+            supabase_client,
+            public=Config.SUPABASE_STORAGE_PUBLIC,
+            signed_url_expires=Config.SUPABASE_SIGNED_URL_EXPIRES,
+            cache_ttl=Config.STORAGE_LIST_CACHE_TTL
+        )
+    return _storage_listing
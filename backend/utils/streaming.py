@@ -0,0 +1,116 @@
+"""
+Streaming JSON / NDJSON responses for large lists.
+
+``stream_list`` turns an iterator of already-serialized items into a
+response that is written out while the iterator is still producing, so a
+route can pair it with a server-side cursor (``Query.yield_per``) and keep
+peak memory flat however many rows the export has.
+
+- JSON (default): ``{"<key>": [item, item, ...], "<extra>": ...}``, the
+  same document the buffered endpoint would return
+- NDJSON (``?format=ndjson`` or ``Accept: application/x-ndjson``): one item
+  per line
+
+Items are encoded with the app's JSON provider and written in chunks of
+about ``STREAM_CHUNK_SIZE`` bytes. The first ``STREAM_BATCH_SIZE`` items
+(one cursor batch) are produced before the response starts, so a failing
+query, and any failure in a list that small, still surfaces as an error
+status. A failure after that point happens once the 200 has been sent:
+NDJSON ends with an ``{"error": ...}`` line, while a JSON document is cut
+off unterminated (and the chunked body is aborted), so it cannot be mistaken
+for a complete list.
+
+``event_stream`` sends server-sent events (``sse_event``) unbuffered, for
+replies produced incrementally such as streamed chat answers.
+"""
+
+import itertools
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Rows fetched per round trip by the server-side cursor of an export
+STREAM_BATCH_SIZE = 200
+
+
+def wants_ndjson() -> bool:
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _chunked(parts: Iterable[str], size: int) -> Iterator[str]:
+    buffer, buffered = [], 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _json_parts(key: str, items: Iterator[Any], dumps: Callable[[Any], str],
+                extra: Optional[Callable[[], Dict[str, Any]]]) -> Iterator[str]:
+    yield '{' + dumps(key) + ':['
+    for index, item in enumerate(items):
+        yield dumps(item) if index == 0 else ',' + dumps(item)
+    yield ']'
+    for name, value in (extra() if extra else {}).items():
+        yield ',' + dumps(name) + ':' + dumps(value)
+    yield '}\n'
+
+
+def _ndjson_parts(items: Iterator[Any], dumps: Callable[[Any], str]) -> Iterator[str]:
+    try:
+        for item in items:
+            yield dumps(item) + '\n'
+    except Exception as e:
+        print(f"Streaming error: {e}")
+        yield dumps({'error': 'Internal server error; the list is incomplete'}) + '\n'
+
+
+def stream_list(key: str, items: Iterable[Any], extra: Optional[Callable[[], Dict[str, Any]]] = None,
+                status: int = 200) -> Response:
+    """Stream ``items`` as ``{key: [...]}`` (or NDJSON lines when the client asks for them).
+
+    ``extra`` is called once the items are exhausted and its keys are added
+    after the list, e.g. a total counted while streaming. NDJSON omits them.
+    """
+    provider = current_app.json
+
+    def dumps(value):
+        return provider.dumps(value, separators=(',', ':'))
+
+    iterator = iter(items)
+    # Run the query and read its first batch now, inside the route's error handling
+    head = list(itertools.islice(iterator, STREAM_BATCH_SIZE))
+    iterator = itertools.chain(head, iterator)
+
+    if wants_ndjson():
+        parts, mimetype = _ndjson_parts(iterator, dumps), NDJSON_MIMETYPE
+    else:
+        parts, mimetype = _json_parts(key, iterator, dumps, extra), 'application/json'
+    body = stream_with_context(_chunked(parts, STREAM_CHUNK_SIZE))
+    return Response(body, status=status, mimetype=mimetype)
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {current_app.json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def event_stream(events: Iterable[str], on_close: Optional[Callable[[], None]] = None) -> Response:
+    """Send ``events`` (``sse_event`` strings) as they are produced; ``on_close`` runs when the client is done"""
+    response = Response(stream_with_context(events), mimetype=SSE_MIMETYPE)
+    response.headers['Cache-Control'] = 'no-cache'
+    # Reverse proxies (nginx, Render) must not buffer the events
+    response.headers['X-Accel-Buffering'] = 'no'
+    if on_close is not None:
+        response.call_on_close(on_close)
+    return response
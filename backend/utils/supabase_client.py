@@ -1,7 +1,9 @@
 import os
 import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from config import Config
+from utils import http_session
+from utils.upload_stream import HashingReader
 
 class SupabaseClient:
     def __init__(self):
@@ -31,53 +33,93 @@ class SupabaseClient:
         """Check if Supabase is properly configured"""
         return self.client is not None
     
+    def latency_stats(self):
+        """Per-operation latency of REST calls made by this process"""
+        return http_session.latency.snapshot()
+    
     def get_supabase(self):
         """Return the Supabase client"""
         return self.client
     
-    def upload_file(self, file_path: str, file_name: str, content_type: str = None):
+    def public_url(self, file_name: str) -> str:
+        """Public URL of an object in the storage bucket (no network call)"""
+        return f"{self.url}/storage/v1/object/public/{self.storage_bucket}/{file_name}"
+    
+    def _storage_headers(self, content_type: str = None):
+        key = self.service_key or self.key
+        headers = {
+            'apikey': key,
+            'Authorization': f'Bearer {key}',
+            'x-upsert': 'true'
+        }
+        if content_type:
+            headers['Content-Type'] = content_type
+        return headers
+    
+    def upload_stream(self, stream, file_name: str, content_type: str = None):
         """
-        Upload a file to Supabase Storage
+        Stream a file-like object to Supabase Storage
+        
+        The body is sent in chunks straight from ``stream``; a HashingReader
+        additionally reports the SHA-256 and size of what was sent.
         
         Args:
-            file_path: Local path to the file
+            stream: Readable file-like object (ideally a HashingReader)
             file_name: Name to store the file as
             content_type: MIME type of the file
         
         Returns:
-            dict: Response with file URL or error
+            dict: Response with file URL, size and sha256, or error
         """
         if not self.is_configured():
             return {"error": "Supabase not configured"}
         
         try:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Upload to Supabase Storage
-            response = self.client.storage.from_(self.storage_bucket).upload(
-                path=file_name,
-                file=file_data,
-                file_options={
-                    "content-type": content_type or "application/octet-stream"
-                }
+            response = http_session.request(
+                'POST',
+                f"{self.url}/storage/v1/object/{self.storage_bucket}/{file_name}",
+                operation='storage.upload',
+                headers=self._storage_headers(content_type or "application/octet-stream"),
+                data=stream
             )
             
-            if response.get('error'):
-                return {"error": response['error']}
-            
-            # Get public URL
-            public_url = self.client.storage.from_(self.storage_bucket).get_public_url(file_name)
+            if response.status_code not in [200, 201]:
+                return {"error": f"Storage upload failed: {response.status_code} - {response.text}"}
             
-            return {
+            result = {
                 "success": True,
-                "url": public_url,
+                "url": self.public_url(file_name),
                 "path": file_name
             }
+            if hasattr(stream, 'sha256'):
+                result["size"] = stream.size
+                result["sha256"] = stream.sha256
+            return result
             
         except Exception as e:
             return {"error": str(e)}
     
+    def upload_file(self, file_path: str, file_name: str, content_type: str = None):
+        """
+        Upload a file to Supabase Storage
+        
+        Args:
+            file_path: Local path to the file
+            file_name: Name to store the file as
+            content_type: MIME type of the file
+        
+        Returns:
+            dict: Response with file URL or error
+        """
+        if not self.is_configured():
+            return {"error": "Supabase not configured"}
+        
+        try:
+            with open(file_path, 'rb') as f:
+                return self.upload_stream(HashingReader(f), file_name, content_type)
+        except Exception as e:
+            return {"error": str(e)}
+    
     def delete_file(self, file_name: str):
         """
         Delete a file from Supabase Storage
@@ -92,10 +134,16 @@ class SupabaseClient:
             return {"error": "Supabase not configured"}
         
         try:
-            response = self.client.storage.from_(self.storage_bucket).remove([file_name])
+            response = http_session.request(
+                'DELETE',
+                f"{self.url}/storage/v1/object/{self.storage_bucket}",
+                operation='storage.delete',
+                headers=self._storage_headers('application/json'),
+                json={'prefixes': [file_name]}
+            )
             
-            if response.get('error'):
-                return {"error": response['error']}
+            if response.status_code != 200:
+                return {"error": f"Storage delete failed: {response.status_code} - {response.text}"}
             
             return {"success": True}
             
@@ -115,8 +163,39 @@ class SupabaseClient:
         if not self.is_configured():
             return None
         
+        return self.public_url(file_name)
+    
+    def create_signed_urls(self, file_names: List[str], expires_in: int = 3600) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Create signed URLs for many files in one request
+        
+        Args:
+            file_names: Object paths inside the bucket
+            expires_in: Lifetime of the URLs in seconds
+        
+        Returns:
+            dict: Mapping of path to signed URL (None where signing failed),
+            or None if the request failed
+        """
+        if not self.is_configured() or not file_names:
+            return {}
+        
         try:
-            return self.client.storage.from_(self.storage_bucket).get_public_url(file_name)
+            response = http_session.request(
+                'POST',
+                f"{self.url}/storage/v1/object/sign/{self.storage_bucket}",
+                operation='storage.sign',
+                headers=self._storage_headers('application/json'),
+                json={'expiresIn': expires_in, 'paths': file_names}
+            )
+            if response.status_code != 200:
+                return None
+            
+            signed = {}
+            for item in response.json():
+                url = item.get('signedURL')
+                signed[item.get('path')] = f"{self.url}/storage/v1{url}" if url else None
+            return signed
         except Exception:
             return None
     
@@ -128,16 +207,25 @@ class SupabaseClient:
             folder: Folder path to list files from
         
         Returns:
-            list: List of file objects or empty list if error
+            list: List of file objects, or None if the listing failed
         """
         if not self.is_configured():
             return []
         
         try:
-            response = self.client.storage.from_(self.storage_bucket).list(folder)
-            return response or []
+            response = http_session.request(
+                'POST',
+                f"{self.url}/storage/v1/object/list/{self.storage_bucket}",
+                operation='storage.list',
+                headers=self._storage_headers('application/json'),
+                json={'prefix': folder, 'limit': 1000, 'offset': 0,
+                      'sortBy': {'column': 'created_at', 'order': 'desc'}}
+            )
+            if response.status_code != 200:
+                return None
+            return response.json() or []
         except Exception:
-            return []
+            return None
 
 class SimpleSupabaseClient:
     def __init__(self, base_url: str, headers: Dict[str, str]):
@@ -156,52 +244,140 @@ class SimpleTable:
         self._select_fields = "*"
         self._filters = []
         self._limit_value = None
+        self._offset_value = None
         self._order_by = None
+        self._count = None
+        self._head = False
+        self._operation = None
+        self._payload = None
+        self._on_conflict = None
     
-    def select(self, fields: str = "*"):
+    def select(self, fields: str = "*", count: Optional[str] = None, head: bool = False):
+        """Project ``fields`` server-side.
+
+        ``count`` ('exact', 'planned' or 'estimated') asks PostgREST for the
+        total number of matching rows, returned as ``SimpleResponse.count``;
+        with ``head=True`` only that count is fetched, no rows.
+        """
         self._select_fields = fields
+        self._count = count
+        self._head = head
         return self
     
     def eq(self, column: str, value: Any):
-        self._filters.append(f"{column}=eq.{value}")
+        self._filters.append((column, f"eq.{_format_value(value)}"))
+        return self
+    
+    def neq(self, column: str, value: Any):
+        self._filters.append((column, f"neq.{_format_value(value)}"))
+        return self
+    
+    def gt(self, column: str, value: Any):
+        self._filters.append((column, f"gt.{_format_value(value)}"))
+        return self
+    
+    def gte(self, column: str, value: Any):
+        self._filters.append((column, f"gte.{_format_value(value)}"))
+        return self
+    
+    def lt(self, column: str, value: Any):
+        self._filters.append((column, f"lt.{_format_value(value)}"))
+        return self
+    
+    def lte(self, column: str, value: Any):
+        self._filters.append((column, f"lte.{_format_value(value)}"))
         return self
     
     def ilike(self, column: str, value: str):
-        self._filters.append(f"{column}=ilike.{value}")
+        self._filters.append((column, f"ilike.{value}"))
+        return self
+    
+    def in_(self, column: str, values: List[Any]):
+        quoted = ','.join(_quote_list_item(value) for value in values)
+        self._filters.append((column, f"in.({quoted})"))
         return self
     
     def limit(self, count: int):
         self._limit_value = count
         return self
     
+    def offset(self, count: int):
+        self._offset_value = count
+        return self
+    
+    def range(self, start: int, end: int):
+        """Rows ``start`` through ``end`` inclusive, like supabase-py"""
+        self._offset_value = start
+        self._limit_value = end - start + 1
+        return self
+    
     def order(self, column: str, desc: bool = False):
         direction = "desc" if desc else "asc"
         self._order_by = f"{column}.{direction}"
         return self
     
+    def insert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        """Insert one row, or a list of rows in a single request"""
+        self._operation = 'insert'
+        self._payload = data
+        return self
+    
+    def upsert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], on_conflict: Optional[str] = None):
+        """Insert rows, merging into existing ones that collide on ``on_conflict`` (default: primary key)"""
+        self._operation = 'upsert'
+        self._payload = data
+        self._on_conflict = on_conflict
+        return self
+    
+    def update(self, data: Dict[str, Any]):
+        self._operation = 'update'
+        self._payload = data
+        return self
+    
     def execute(self):
-        # Build query parameters
-        params = {}
+        if self._operation == 'insert':
+            return self._execute_insert(self._payload)
+        if self._operation == 'upsert':
+            return self._execute_insert(self._payload, upsert=True)
+        if self._operation == 'update':
+            return self._execute_update(self._payload)
+        return self._execute_select()
+    
+    def _headers(self, *preferences: str) -> Dict[str, str]:
+        headers = dict(self.headers)
+        prefer = [value for value in [headers.get('Prefer'), *preferences] if value]
+        if prefer:
+            headers['Prefer'] = ','.join(prefer)
+        return headers
+    
+    def _execute_select(self):
+        # Build query parameters; a list keeps repeated columns (e.g. gt + lt)
+        params = list(self._filters)
         
         if self._select_fields != "*":
-            params['select'] = self._select_fields
-            
-        if self._filters:
-            for filter_str in self._filters:
-                key, value = filter_str.split('=', 1)
-                params[key] = value
+            params.append(('select', self._select_fields))
+        
+        if self._limit_value is not None:
+            params.append(('limit', str(self._limit_value)))
         
-        if self._limit_value:
-            params['limit'] = str(self._limit_value)
+        if self._offset_value:
+            params.append(('offset', str(self._offset_value)))
         
         if self._order_by:
-            params['order'] = self._order_by
+            params.append(('order', self._order_by))
+        
+        headers = self._headers(f"count={self._count}" if self._count else None)
+        method = 'HEAD' if self._head else 'GET'
         
         try:
-            response = requests.get(self.url, headers=self.headers, params=params)
+            response = http_session.request(
+                method, self.url, operation=f'{self.table_name}.select',
+                headers=headers, params=params
+            )
             
-            if response.status_code == 200:
-                return SimpleResponse(response.json(), None)
+            if response.status_code in [200, 206]:
+                data = [] if self._head else response.json()
+                return SimpleResponse(data, None, _parse_count(response.headers.get('Content-Range')))
             else:
                 error_msg = f"Supabase request failed: {response.status_code} - {response.text}"
                 return SimpleResponse(None, error_msg)
@@ -209,30 +385,39 @@ class SimpleTable:
         except requests.RequestException as e:
             return SimpleResponse(None, str(e))
     
-    def insert(self, data: Dict[str, Any]):
+    def _execute_insert(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], upsert: bool = False):
+        params = {}
+        preferences = []
+        if upsert:
+            preferences.append('resolution=merge-duplicates')
+            if self._on_conflict:
+                params['on_conflict'] = self._on_conflict
+        operation = 'upsert' if upsert else 'insert'
+        
         try:
-            response = requests.post(self.url, headers=self.headers, json=data)
+            response = http_session.request(
+                'POST', self.url, operation=f'{self.table_name}.{operation}',
+                headers=self._headers(*preferences), params=params, json=data
+            )
             
             if response.status_code in [200, 201]:
-                return SimpleResponse(response.json(), None)
+                return SimpleResponse(response.json() if response.content else [], None)
             else:
-                error_msg = f"Supabase insert failed: {response.status_code} - {response.text}"
+                error_msg = f"Supabase {operation} failed: {response.status_code} - {response.text}"
                 return SimpleResponse(None, error_msg)
                 
         except requests.RequestException as e:
             return SimpleResponse(None, str(e))
     
-    
-    
-    def update(self, data: Dict[str, Any]):
+    def _execute_update(self, data: Dict[str, Any]):
         # Build query for update
-        params = {}
-        for filter_str in self._filters:
-            key, value = filter_str.split('=', 1)
-            params[key] = value
+        params = list(self._filters)
         
         try:
-            response = requests.patch(self.url, headers=self.headers, params=params, json=data)
+            response = http_session.request(
+                'PATCH', self.url, operation=f'{self.table_name}.update',
+                headers=self.headers, params=params, json=data
+            )
             
             if response.status_code == 200:
                 return SimpleResponse(response.json(), None)
@@ -243,10 +428,33 @@ class SimpleTable:
         except requests.RequestException as e:
             return SimpleResponse(None, str(e))
 
+def _format_value(value: Any) -> str:
+    """Render a filter operand the way PostgREST expects (true/false/null)"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+def _quote_list_item(value: Any) -> str:
+    """Quote an ``in.(...)`` item so commas and parentheses inside it are safe"""
+    text = _format_value(value)
+    if any(char in text for char in ',()"\\ '):
+        text = '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+def _parse_count(content_range: Optional[str]) -> Optional[int]:
+    """Total from a ``Content-Range: 0-9/42`` header (``*`` when not counted)"""
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
 class SimpleResponse:
-    def __init__(self, data: Optional[List[Dict[str, Any]]], error: Optional[str]):
+    def __init__(self, data: Optional[List[Dict[str, Any]]], error: Optional[str], count: Optional[int] = None):
         self.data = data
         self.error = error
+        self.count = count
 
 # Global Supabase client instance
 supabase_client = SupabaseClient()
@@ -0,0 +1,93 @@
+"""
+Streaming upload helpers.
+
+Uploaded files are kept in memory instead of werkzeug's spooled temp files
+(``InMemoryUploadRequest``); the total is already capped by
+``MAX_CONTENT_LENGTH``. ``HashingReader`` then feeds that buffer to storage in
+fixed-size chunks, computing the SHA-256 and byte count as the bytes go out,
+so nothing is written to disk or copied whole along the way.
+"""
+
+import hashlib
+import io
+import os
+from typing import Optional
+
+from flask import Request
+
+CHUNK_SIZE = 64 * 1024
+
+
+class InMemoryUploadRequest(Request):
+    """Request class that buffers multipart file parts in memory, never on disk"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
+
+
+class HashingReader:
+    """File-like wrapper that hashes and counts bytes as they are read.
+
+    ``requests`` streams any object with ``read`` and ``__len__`` as a
+    fixed-length body, pulling it block by block.
+    """
+
+    def __init__(self, stream, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._length = self._remaining_length(stream)
+
+    @staticmethod
+    def _remaining_length(stream):
+        try:
+            position = stream.tell()
+            stream.seek(0, os.SEEK_END)
+            end = stream.tell()
+            stream.seek(position)
+            return end - position
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is not None and size >= 0:
+            return self._read_chunk(size)
+        # Rest of the stream, as the file-object contract requires
+        chunks = []
+        while True:
+            chunk = self._read_chunk(self.chunk_size)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+
+    def _read_chunk(self, size: int) -> bytes:
+        chunk = self.stream.read(size)
+        if chunk:
+            self._sha256.update(chunk)
+            self.size += len(chunk)
+        return chunk
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __len__(self):
+        return self._length or 0
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
+def open_upload(file_storage) -> HashingReader:
+    """Rewind an uploaded FileStorage and wrap it for streaming to storage"""
+    stream = file_storage.stream
+    try:
+        stream.seek(0)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    return HashingReader(stream)
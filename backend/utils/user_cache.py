@@ -0,0 +1,114 @@
+"""
+Read-through cache for rows of the Supabase ``users`` table.
+
+``/api/auth/me``, login, profile updates and resume parsing all look a user
+up by id or email. Records are cached by id for ``USER_CACHE_TTL`` seconds
+with an email -> id index next to them; inserts and updates made through the
+cache are written through, so this process never serves its own stale data.
+Emails that matched no user are remembered for ``USER_CACHE_NEGATIVE_TTL``
+seconds, so a burst of logins for an unknown email costs one query. The TTL
+is kept short because a signup handled by another worker is only seen here
+once the entry expires; signups through this cache replace it at once.
+
+The cache is per process: a change made by another worker becomes visible
+here once the entry expires.
+"""
+
+from typing import Any, Dict, Optional
+
+from config import Config
+from utils.cache import TTLCache
+
+_NOT_FOUND = object()
+
+
+class UserCache:
+    def __init__(self, ttl: int = 60, negative_ttl: int = 10, maxsize: int = 4096):
+        self.negative_ttl = negative_ttl
+        self.by_id = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.email_index = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _store(self, user: Dict[str, Any]):
+        self.by_id.set(user['id'], dict(user))
+        if user.get('email'):
+            self.email_index.set(user['email'], user['id'])
+
+    def _fetch(self, supabase, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        result = supabase.table('users').select('*').eq(column, value).limit(1).execute()
+        if result.error:
+            # Never cache a failed lookup as "no such user"
+            raise RuntimeError(result.error)
+        return result.data[0] if result.data else None
+
+    def get_by_id(self, supabase, user_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        user = None if refresh else self.by_id.get(user_id)
+        if user is None:
+            user = self._fetch(supabase, 'id', user_id)
+            if user is None:
+                return None
+            self._store(user)
+        return dict(user)
+
+    def get_by_email(self, supabase, email: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        if not refresh:
+            user_id = self.email_index.get(email)
+            if user_id is _NOT_FOUND:
+                return None
+            if user_id is not None:
+                user = self.by_id.get(user_id)
+                if user is not None and user.get('email') == email:
+                    return dict(user)
+
+        user = self._fetch(supabase, 'email', email)
+        if user is None:
+            self.email_index.set(email, _NOT_FOUND, ttl=self.negative_ttl)
+            return None
+        self._store(user)
+        return dict(user)
+
+    def insert(self, supabase, user_data: Dict[str, Any]):
+        """Insert a user and cache the stored row"""
+        result = supabase.table('users').insert(user_data).execute()
+        if not result.error and result.data:
+            self._store(result.data[0])
+        elif user_data.get('email'):
+            self.email_index.delete(user_data['email'])
+        return result
+
+    def update(self, supabase, user_id: str, update_data: Dict[str, Any]):
+        """Update a user and replace the cached row with the stored one"""
+        cached = self.by_id.get(user_id)
+        result = supabase.table('users').update(update_data).eq('id', user_id).execute()
+        if cached and cached.get('email'):
+            self.email_index.delete(cached['email'])
+        if not result.error and result.data:
+            self._store(result.data[0])
+        else:
+            self.by_id.delete(user_id)
+        return result
+
+    def invalidate(self, user_id: str, email: Optional[str] = None):
+        self.by_id.delete(user_id)
+        if email:
+            self.email_index.delete(email)
+
+    def clear(self):
+        self.by_id.clear()
+        self.email_index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'by_id': self.by_id.stats(), 'by_email': self.email_index.stats()}
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(
+            ttl=Config.USER_CACHE_TTL,
+            negative_ttl=Config.USER_CACHE_NEGATIVE_TTL,
+            maxsize=Config.USER_CACHE_SIZE
+        )
+    return _user_cache
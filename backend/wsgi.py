@@ -0,0 +1,28 @@
+"""
+WSGI entry point for production servers (see gunicorn.conf.py).
+"""
+
+import time
+
+from app import app
+from extensions import db
+
+
+def preload_models():
+    """Load the ML models before workers fork, so they share them copy-on-write"""
+    from routes.internship_recommendations import _get_embedding_model
+    from routes.resume_enhancer import _get_parser
+
+    for name, load in (('embedding model', _get_embedding_model), ('resume parser', _get_parser)):
+        started = time.perf_counter()
+        try:
+            load()
+            print(f"✅ Preloaded {name} in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            print(f"⚠️ Could not preload {name}: {e}")
+
+
+def reset_connections():
+    """Drop pooled DB connections inherited from the master process"""
+    with app.app_context():
+        db.engine.dispose(close=False)
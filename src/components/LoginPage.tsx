@@ -278,9 +278,8 @@ export function LoginPage({ onLogin }: LoginPageProps) {
 
   // Handle QR login
   const handleQRLogin = (token: string) => {
-    console.log('QR Login successful with token:', token);
-    // For simulation, we'll just call onLogin
-    // In a real implementation, you'd validate the token and get user data
+    // Keep the access token issued for the approved QR session
+    localStorage.setItem('access_token', token);
     setSuccess("QR Login successful!");
     setTimeout(() => {
       onLogin();
@@ -1,9 +1,10 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import QRCode from 'qrcode';
 import { Button } from './ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/card';
 import { QrCode, Smartphone, CheckCircle, XCircle, RefreshCw } from 'lucide-react';
 import { useLanguage } from './LanguageProvider';
+import { apiCall, API_BASE_URL } from '../config/api';
 
 interface QRLoginProps {
   onQRLogin: (token: string) => void;
@@ -54,13 +55,31 @@ export function QRLogin({ onQRLogin, onClose }: QRLoginProps) {
 
   const t = translations[language];
 
+  const eventSourceRef = useRef<EventSource | null>(null);
+
+  const stopListening = () => {
+    eventSourceRef.current?.close();
+    eventSourceRef.current = null;
+  };
+
+  const completeLogin = (accessToken: string) => {
+    stopListening();
+    localStorage.setItem('access_token', accessToken);
+    setStatus('success');
+    setTimeout(() => {
+      onQRLogin(accessToken);
+    }, 1000);
+  };
+
   // Generate QR code
   const generateQRCode = async () => {
     try {
+      stopListening();
       setStatus('generating');
       
-      // Generate a unique token for this QR session
-      const token = Math.random().toString(36).substring(2, 15) + Math.random().toString(36).substring(2, 15);
+      // Ask the backend for a login session token
+      const session = await apiCall('/api/auth/qr/new', { method: 'POST' });
+      const token: string = session.token;
       setQrToken(token);
       
       // Create QR code data
@@ -83,10 +102,10 @@ export function QRLogin({ onQRLogin, onClose }: QRLoginProps) {
       
       setQrCodeDataURL(qrCodeURL);
       setStatus('waiting');
-      setTimeLeft(300); // Reset timer
+      setTimeLeft(session.expires_in || 300); // Reset timer
       
-      // Start polling for QR code scan
-      startPolling(token);
+      // Wait for the QR code to be scanned
+      listenForScan(token);
       
     } catch (error) {
       console.error('Error generating QR code:', error);
@@ -94,48 +113,60 @@ export function QRLogin({ onQRLogin, onClose }: QRLoginProps) {
     }
   };
 
-  // Poll for QR code scan
-  const startPolling = (token: string) => {
-    const pollInterval = setInterval(async () => {
-      try {
-        // Simulate checking if QR code was scanned
-        // In a real implementation, this would check a backend endpoint
-        const response = await fetch(`/api/qr/status/${token}`);
-        
-        if (response.ok) {
-          const data = await response.json();
-          if (data.scanned) {
-            setStatus('success');
-            clearInterval(pollInterval);
-            
-            // Simulate getting login token
-            setTimeout(() => {
-              onQRLogin(data.loginToken || 'simulated_qr_login_token');
-            }, 1000);
-          }
-        }
-      } catch (error) {
-        // For simulation, randomly simulate a successful scan after 10-30 seconds
-        if (Math.random() < 0.1) { // 10% chance every 2 seconds
-          setStatus('success');
-          clearInterval(pollInterval);
-          
-          setTimeout(() => {
-            onQRLogin('simulated_qr_login_token');
-          }, 1000);
-        }
+  // The server pushes the session status, so there is no polling loop
+  const listenForScan = (token: string) => {
+    if (typeof EventSource === 'undefined') {
+      longPoll(token);
+      return;
+    }
+
+    const source = new EventSource(`${API_BASE_URL}/api/auth/qr/events/${token}`);
+    eventSourceRef.current = source;
+
+    source.addEventListener('consumed', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      if (data.access_token) {
+        completeLogin(data.access_token);
+      } else {
+        stopListening();
+        setStatus('error');
+      }
+    });
+    source.addEventListener('expired', () => {
+      stopListening();
+      setStatus('expired');
+    });
+    source.onerror = () => {
+      // Fall back to long-polling if the stream cannot be kept open
+      if (eventSourceRef.current === source) {
+        stopListening();
+        longPoll(token);
       }
-    }, 2000);
+    };
+  };
 
-    // Clear interval after 5 minutes
-    setTimeout(() => {
-      clearInterval(pollInterval);
-      if (status === 'waiting') {
+  // Each request is held open by the server until the code is scanned or expires
+  const longPoll = async (token: string) => {
+    try {
+      const data = await apiCall(`/api/auth/qr/status/${token}?wait=25`);
+      if (data.access_token) {
+        completeLogin(data.access_token);
+      } else if (data.status === 'expired') {
         setStatus('expired');
+      } else if (data.status === 'pending') {
+        longPoll(token);
+      } else {
+        setStatus('error');
       }
-    }, 300000);
+    } catch (error) {
+      console.error('Error checking QR code status:', error);
+      setStatus('error');
+    }
   };
 
+  // Close the stream when the dialog is closed
+  useEffect(() => stopListening, []);
+
   // Timer countdown
   useEffect(() => {
     if (timeLeft > 0 && status === 'waiting') {